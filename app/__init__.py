@@ -4,26 +4,41 @@
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request
+from flask import Flask, current_app, has_app_context, jsonify, request
 from flask_cors import CORS
-from werkzeug.exceptions import HTTPException
+from werkzeug.exceptions import HTTPException, NotFound
 
 from app.core.data_processors.fault_report_processor import load_fault_report_data
 from app.core.data_processors.r_and_i_record_processor import load_r_and_i_data
 from app.core.error_handler import AppError, InternalError
+from app.core.search import configure_search_engine, get_search_index, invalidate_search_index
+from app.core.search.query_cache import QueryCache
+from app.core.search.refinement import RefinementStore
+from app.core.search.result_store import ResultSetStore
 from app.services import WordService
 from app.services.error_service import ErrorService
 from app.services.temp_file_manager import TempFileManager
 from app.types import CaseFlask
+from app.utils.compression import PrecompressedAssets, compress, compress_stream, negotiate
 
 # 数据缓存
 data_frames = {}
 
 
+def clear_data_source_cache(source):
+    """清除数据源的数据缓存、搜索索引、查询缓存与会话中间结果，下次访问时重新加载"""
+    data_frames.pop(source, None)
+    invalidate_search_index(source)
+    if has_app_context():
+        current_app.query_cache.discard_source(source)  # type: ignore[attr-defined]
+        current_app.search_refinements.discard_source(source)  # type: ignore[attr-defined]
+
+
 def create_app(config_name: str = "development") -> CaseFlask:
     """
     应用工厂函数
@@ -82,6 +97,31 @@ def create_app(config_name: str = "development") -> CaseFlask:
     # 初始化敏感词管理器
     app.word_manager = WordService(app.config["SENSITIVE_WORDS_FILE"])
 
+    # 初始化搜索结果集缓存（分页搜索按句柄翻页）
+    app.search_results = ResultSetStore(
+        maxsize=app.config["SEARCH_RESULT_CACHE_SIZE"], ttl=app.config["SEARCH_RESULT_TTL"]
+    )
+
+    # 设置关键字匹配引擎（搜索索引按此设置构建）
+    configure_search_engine(
+        app.config["SEARCH_ENGINE"],
+        workers=app.config["SEARCH_ENGINE_WORKERS"],
+        chunk_size=app.config["SEARCH_ENGINE_CHUNK_SIZE"],
+    )
+
+    # 初始化搜索查询缓存（相同请求复用结果行号，数据源变更时失效）
+    app.query_cache = QueryCache(maxsize=app.config["SEARCH_QUERY_CACHE_SIZE"])
+
+    # 跨数据源联合搜索的线程池（各数据源并发搜索）
+    app.federated_executor = ThreadPoolExecutor(
+        max_workers=app.config["SEARCH_FEDERATED_WORKERS"], thread_name_prefix="federated-search"
+    )
+
+    # 初始化搜索层级增量细化存储（按会话复用相同层级前缀的中间结果）
+    app.search_refinements = RefinementStore(
+        maxsize=app.config["SEARCH_REFINEMENT_SESSIONS"], ttl=app.config["SEARCH_REFINEMENT_TTL"]
+    )
+
     # 初始化数据服务
     from app.services import (
         CaseService,
@@ -118,6 +158,12 @@ def create_app(config_name: str = "development") -> CaseFlask:
                     data_frames[source] = pd.read_parquet(data_path)
                 else:
                     return None
+
+                # 首次加载时构建搜索索引；构建失败不影响数据加载，搜索时会退回整列扫描
+                try:
+                    get_search_index(source, data_frames[source])
+                except Exception as e:
+                    app.logger.warning(f"构建数据源 {source} 的搜索索引失败: {str(e)}")
             return data_frames[source]
         except Exception:
             return None
@@ -154,17 +200,44 @@ def create_app(config_name: str = "development") -> CaseFlask:
 
             anonymizer_service = AnonymizationService()
 
-            # 对指定字段进行脱敏
+            from app.api.data_source_routes import HIGHLIGHT_FIELD
+
+            # 对指定字段进行脱敏；文本改变后搜索时计算的命中位置不再对应，一并去掉
             for result in results:
+                highlights = result.get(HIGHLIGHT_FIELD)
                 for field in fields:
                     if field in result and result[field]:
                         result[field] = anonymizer_service.anonymize_text(result[field])
+                        if isinstance(highlights, dict):
+                            highlights.pop(field, None)
 
             return jsonify({"status": "success", "data": results})
 
         except Exception as e:
             return jsonify({"status": "error", "message": f"脱敏处理失败: {str(e)}"})
 
+    # 第三方静态资源首次请求时预压缩（进程内缓存），按 Accept-Encoding 返回对应版本
+    app.vendor_assets = PrecompressedAssets(
+        os.path.join(app.static_folder or "static", app.config["VENDOR_STATIC_DIR"])
+    )
+
+    @app.route(f"/static/{app.config['VENDOR_STATIC_DIR']}/<path:filename>")
+    def vendor_static(filename):
+        """返回预压缩的第三方静态资源（强 ETag，长缓存）"""
+        asset = app.vendor_assets.get(filename)
+        if asset is None:
+            raise NotFound()
+
+        encoding, body, etag = asset.variant(request.headers.get("Accept-Encoding"))
+        response = app.response_class(body, mimetype=asset.mimetype)
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config["VENDOR_CACHE_MAX_AGE"]
+        response.vary.add("Accept-Encoding")
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+        return response.make_conditional(request)
+
     # 注册路由
     from app.routes import bp
 
@@ -206,6 +279,35 @@ def create_app(config_name: str = "development") -> CaseFlask:
         response.headers["Content-Security-Policy"] = app.config["CONTENT_SECURITY_POLICY"]
         return response
 
+    @app.after_request
+    def compress_response(response):
+        """按 Accept-Encoding 压缩文本类响应；流式响应逐块压缩"""
+        if (
+            not app.config["COMPRESS_ENABLED"]
+            or response.mimetype not in app.config["COMPRESS_MIMETYPES"]
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = negotiate(request.headers.get("Accept-Encoding"))
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+                return response
+            response.set_data(compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
+
     # 在应用关闭时停止调度器
     @app.teardown_appcontext
     def shutdown_scheduler(exception=None):
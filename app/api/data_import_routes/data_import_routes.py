@@ -355,10 +355,9 @@ class BaseDataImportRoutes:
 
             if success:
                 # 清除数据缓存,强制重新加载
-                from app import data_frames
+                from app import clear_data_source_cache
 
-                if self.data_type in data_frames:
-                    del data_frames[self.data_type]
+                clear_data_source_cache(self.data_type)
 
                 # 从成功消息中提取新增数量（取不到时按 0 处理）
                 new_count_match = re.search(r"成功导入\s*(\d+)\s*条", message)
@@ -21,10 +21,9 @@ def confirm_r_and_i_record_import():
 
     # 额外清除故障报告数据缓存
     if response.status_code == 200:
-        from app import data_frames
+        from app import clear_data_source_cache
 
-        if "faults" in data_frames:
-            del data_frames["faults"]
+        clear_data_source_cache("faults")
 
     return response
 
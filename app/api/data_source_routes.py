@@ -1,13 +1,42 @@
 import logging
 import re
+import uuid
 from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
-from flask import current_app, jsonify, request
+from flask import current_app, jsonify, request, session
 
 from app.api import bp
 from app.core.data_processors.r_and_i_record_processor import load_r_and_i_data
+from app.core.search import (
+    KeywordMatcher,
+    get_search_index,
+    is_date_column,
+    normalize_series,
+    normalize_text,
+    split_keywords,
+)
+from app.core.search.ata import AtaIndex, ata_chapter
+from app.core.search.category_index import CategoryIndex, unpack_rows
+from app.core.search.date_index import DateIndex, date_bound, parse_dates, year_month
+from app.core.search.highlight import Highlighter
+from app.core.search.identifier_index import IDENTIFIER_COLUMNS, MSN_COLUMNS, IdentifierIndex
+from app.core.search.index import CATEGORY_COLUMNS
+from app.core.search.query_cache import canonical_levels
+from app.core.search.query_language import Term, evaluate, parse_query, query_fields
+from app.core.search.refinement import run_levels
+from app.core.search.sort_order import SortPermutation
+from app.services.api_response import ApiResponse
+from app.utils.fast_json import (
+    COLUMNAR,
+    RECORDS,
+    column_values,
+    frame_payload,
+    json_response,
+    ndjson_response,
+    parse_result_format,
+)
 
 if TYPE_CHECKING:
     pass
@@ -15,16 +44,83 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-def search_column(df, keywords, column_name, logic="and", negative_filtering=False):
-    """基础搜索功能"""
-    if not keywords:
-        return df
+def _keyword_pattern(keyword: str, date_column: bool) -> str:
+    """获取关键字实际匹配的子串：日期列中的年月关键字 (YYYY-M) 补零为 YYYY-MM"""
+    if date_column:
+        year_month_match = re.match(r"^(\d{4})-(\d{1,2})$", keyword)
+        if year_month_match:
+            year = year_month_match.group(1)
+            month = year_month_match.group(2).zfill(2)
+            return f"{year}-{month}"
+    return keyword
+
+
+def _level_mask(
+    df, column, matcher, require_all, search_index=None, positions=None, rows=None
+) -> np.ndarray:
+    """计算单列在一个搜索层级上的命中掩码（与 rows 或 df 行一一对应）。
+
+    列已物化到搜索视图时直接在视图上匹配（并用 n-gram 倒排表收敛候选行），
+    否则只取出该列的指定行，按同一规范化规则现场转换后扫描。
+    """
+    if search_index is not None and positions is not None and column in search_index.view:
+        return search_index.match_keywords(column, matcher, positions, require_all)
+    series = df[column] if rows is None else df[column].iloc[rows]
+    return matcher.match(normalize_series(series), require_all)
+
+
+def _rows_mask(row_ids: np.ndarray, positions: np.ndarray, size: int) -> np.ndarray:
+    """把命中的索引行号转换为与 positions 一一对应的布尔数组"""
+    hit = np.zeros(size, dtype=bool)
+    hit[row_ids] = True
+    return hit[positions]
+
+
+def search_column(
+    df, keywords, column_name, logic="and", negative_filtering=False, search_index=None
+):
+    """基础搜索功能
+
+    Args:
+        df: 待搜索的数据框
+        keywords: 关键字列表，或以逗号分隔的关键字字符串
+        column_name: 搜索列名或列名列表
+        logic: 同一层级内多个关键字的逻辑关系，"and" 或 "or"
+        negative_filtering: 为 True 时返回不匹配的行
+        search_index: 数据源搜索索引（可选），df 须为索引数据框的子集
+
+    Returns:
+        过滤后的数据框
+    """
+    return df[search_mask(df, keywords, column_name, logic, negative_filtering, search_index)]
+
+
+def search_mask(
+    df,
+    keywords,
+    column_name,
+    logic="and",
+    negative_filtering=False,
+    search_index=None,
+    rows=None,
+) -> np.ndarray:
+    """计算一个搜索层级保留哪些行，参数同 search_column。
+
+    指定 rows 时只判断 df 中这些位置的行，不物化子集数据框：多层级搜索
+    直接在共享的缓存数据框上按行号逐层收敛。
 
-    # 将所有关键字转换为小写
-    if isinstance(keywords, str):
-        keywords = keywords.replace("，", ",")
-        keywords = [k.strip() for k in keywords.split(",") if k.strip()]
-    keywords = [str(k).lower() for k in keywords]
+    Args:
+        rows: 待判断的行位置（可选），None 表示 df 的全部行
+
+    Returns:
+        与 rows（或 df 行）一一对应的布尔数组（已按 negative_filtering 取反）
+    """
+    size = len(df) if rows is None else len(rows)
+
+    # 将所有关键字按搜索视图的规则拆分并规范化（全角转半角、小写）
+    keywords = split_keywords(keywords) if keywords else []
+    if not keywords:
+        return np.ones(size, dtype=bool)
 
     # 确定要搜索的列
     if isinstance(column_name, str):
@@ -37,71 +133,53 @@ def search_column(df, keywords, column_name, logic="and", negative_filtering=Fal
     if not columns_to_search:
         raise ValueError("未指定有效的搜索列")
 
-    # 使用相同的搜索逻辑
-    if logic == "and":
-        final_mask = pd.Series(False, index=df.index)
-        for col in columns_to_search:
-            # 检查是否是日期列
-            is_date_column = col == "日期" or "时间" in col or "日期" in col
-
-            if is_date_column:
-                # 日期列特殊处理
-                col_values = df[col].fillna("")
-                # 检查该列中是否包含所有关键字
-                col_mask = pd.Series(True, index=df.index)
-                for keyword in keywords:
-                    # 检查是否是年月格式 (YYYY-MM)
-                    year_month_match = re.match(r"^(\d{4})-(\d{1,2})$", keyword)
-                    if year_month_match:
-                        year = year_month_match.group(1)
-                        month = year_month_match.group(2).zfill(2)
-                        # 匹配年月
-                        date_pattern = f"{year}-{month}"
-                        col_mask &= col_values.str.contains(date_pattern, na=False, regex=False)
-                    else:
-                        # 普通关键字匹配
-                        col_mask &= col_values.str.lower().str.contains(
-                            keyword, na=False, regex=False
-                        )
-            else:
-                # 非日期列正常处理
-                col_values = df[col].fillna("").astype(str).str.lower()
-                # 检查该列中是否包含所有关键字
-                col_mask = pd.Series(True, index=df.index)
-                for keyword in keywords:
-                    col_mask &= col_values.str.contains(keyword, na=False, regex=False)
-
-            final_mask |= col_mask
-    else:  # logic == 'or'
-        final_mask = pd.Series(False, index=df.index)
+    # 换算为索引中的行号：df 就是索引数据框时，行位置即索引行号
+    positions = None
+    if search_index is not None:
+        if search_index.df is df:
+            positions = np.arange(len(df)) if rows is None else np.asarray(rows)
+        else:
+            positions = search_index.positions_of(df)
+            if positions is not None and rows is not None:
+                positions = positions[rows]
+
+    # 每个层级构建一次多关键字匹配器，逐列扫描一遍即可得知包含哪些关键字：
+    # AND 要求同一列包含全部关键字，OR 要求任一列包含任一关键字。
+    # 日期列中的年月关键字需要补零，因此按实际匹配的子串分别构建匹配器；
+    # 日期列已建日期索引时，年月关键字改为按月份范围二分查找
+    require_all = logic == "and"
+    matchers: dict[tuple[str, ...], KeywordMatcher] = {}
+    final_mask = np.zeros(size, dtype=bool)
+    for col in columns_to_search:
+        date_column = is_date_column(col)
+        dates = search_index.dates.get(col) if positions is not None and date_column else None
+
+        masks = []
+        patterns: list[str] = []
         for keyword in keywords:
-            for col in columns_to_search:
-                # 检查是否是日期列
-                is_date_column = col == "日期" or "时间" in col or "日期" in col
-
-                if is_date_column:
-                    # 日期列特殊处理
-                    col_values = df[col].fillna("")
-                    # 检查是否是年月格式 (YYYY-MM)
-                    year_month_match = re.match(r"^(\d{4})-(\d{1,2})$", keyword)
-                    if year_month_match:
-                        year = year_month_match.group(1)
-                        month = year_month_match.group(2).zfill(2)
-                        # 匹配年月
-                        date_pattern = f"{year}-{month}"
-                        final_mask |= col_values.str.contains(date_pattern, na=False, regex=False)
-                    else:
-                        # 普通关键字匹配
-                        final_mask |= col_values.str.lower().str.contains(
-                            keyword, na=False, regex=False
-                        )
-                else:
-                    # 非日期列正常处理
-                    col_values = df[col].fillna("").astype(str).str.lower()
-                    final_mask |= col_values.str.contains(keyword, na=False, regex=False)
+            month = year_month(keyword) if dates is not None else None
+            if month is not None:
+                masks.append(
+                    _rows_mask(dates.month_rows(*month), positions, len(search_index))  # type: ignore[union-attr]
+                )
+            else:
+                patterns.append(_keyword_pattern(keyword, date_column))
+
+        if patterns:
+            key = tuple(patterns)
+            if key not in matchers:
+                matchers[key] = KeywordMatcher(key)
+            masks.append(
+                _level_mask(df, col, matchers[key], require_all, search_index, positions, rows)
+            )
+
+        if require_all:
+            final_mask |= np.logical_and.reduce(masks)
+        else:
+            final_mask |= np.logical_or.reduce(masks)
 
     # 根据negative_filtering参数决定是否反向过滤
-    return df[~final_mask] if negative_filtering else df[final_mask]
+    return ~final_mask if negative_filtering else final_mask
 
 
 @bp.route("/data_source_columns")
@@ -298,6 +376,18 @@ SORT_DATE_PRIORITY: dict[str, list[str]] = {
 }
 
 
+# 分页模式下未指定每页条数时的默认值
+DEFAULT_PAGE_SIZE = 100
+
+# 列投影时每条结果附带的行标识字段
+ROW_ID_FIELD = "_row_id"
+# 请求高亮时每行附带的命中位置字段：{列名: [起点, 终点, 关键字序号, ...]}
+HIGHLIGHT_FIELD = "_highlights"
+
+# 搜索模式：rows 返回结果行；count 只返回精确总数；estimate 按索引估计总数上界
+SEARCH_MODES = ("rows", "count", "estimate")
+
+
 def _apply_default_sort(df: pd.DataFrame, data_source: str) -> pd.DataFrame:
     """对搜索结果应用默认排序（倒序，最新在上）。
 
@@ -311,23 +401,815 @@ def _apply_default_sort(df: pd.DataFrame, data_source: str) -> pd.DataFrame:
     Returns:
         排序后的数据框（不含临时排序列）
     """
+    order = _default_sort_order(df, data_source)
+    return df if order is None else df.iloc[order]
+
+
+def _default_sort_order(
+    df: pd.DataFrame, data_source: str, rows: np.ndarray | None = None
+) -> np.ndarray | None:
+    """计算默认排序的顺序，只读取日期优先级列，不物化整行数据。
+
+    Args:
+        df: 数据框
+        data_source: 数据源名称
+        rows: 参与排序的行位置（可选），None 表示 df 的全部行
+
+    Returns:
+        排序后的下标（相对 rows 或 df 的行）；无需排序时返回 None
+    """
     priority = SORT_DATE_PRIORITY.get(data_source)
     if not priority:
-        return df
+        return None
 
     cols = [c for c in priority if c in df.columns]
     if not cols:
-        return df
+        return None
 
     # 逐列解析为 datetime，用 combine_first 实现「第一个有效值优先」的回退
     merged: pd.Series | None = None
     for col in cols:
-        parsed = pd.to_datetime(df[col], errors="coerce")
+        values = df[col] if rows is None else df[col].iloc[rows]
+        parsed = pd.to_datetime(values.reset_index(drop=True), errors="coerce")
         merged = parsed if merged is None else merged.combine_first(parsed)
 
-    sorted_df = df.assign(_sort_key=merged)
-    sorted_df = sorted_df.sort_values("_sort_key", ascending=False, na_position="last")
-    return sorted_df.drop(columns=["_sort_key"])
+    return merged.sort_values(ascending=False, na_position="last").index.to_numpy()  # type: ignore[union-attr]
+
+
+def _default_sorted_rows(df, data_source: str, row_ids: np.ndarray, search_index=None):
+    """按默认排序重排结果行号。
+
+    索引可用时使用每个数据版本预计算一次的排序排列（只做保序过滤），
+    否则现场解析日期列排序。
+    """
+    priority = SORT_DATE_PRIORITY.get(data_source)
+    if not priority:
+        return row_ids
+    if search_index is not None and search_index.df is df:
+        permutation = search_index.sort_order(priority)
+        return row_ids if permutation is None else permutation.sort(row_ids)
+    order = _default_sort_order(df, data_source, row_ids)
+    return row_ids if order is None else row_ids[order]
+
+
+def _to_records(
+    frame: pd.DataFrame, start: int = 1, result_format: str = RECORDS, extra_columns=None
+) -> list[dict] | dict:
+    """把结果数据框转换为 records（或 columnar 格式），并从 start 开始编号「序号」列。
+
+    按列转换，NaN 统一替换为 None：NaN 会被序列化为非法 JSON 字面量，
+    前端 JSON.parse 会直接抛异常。
+    """
+    extra = {"序号": range(start, start + len(frame)), **(extra_columns or {})}
+    return frame_payload(frame, result_format, extra)
+
+
+def _row_token(version: int | None, position: int) -> str:
+    """生成结果行的行标识「数据版本:行号」（索引不可用时只有行号）"""
+    return str(position) if version is None else f"{version}:{position}"
+
+
+def _parse_row_token(token: str) -> tuple[int | None, int]:
+    """解析行标识，返回 (数据版本, 行号)。
+
+    Raises:
+        ValueError: 行标识格式无效时
+    """
+    version, _, position = token.rpartition(":")
+    try:
+        return (int(version) if version else None), int(position)
+    except ValueError:
+        raise ValueError(f"无效的行标识: {token}")
+
+
+def _parse_columns(df, data_source: str, columns) -> list[str] | None:
+    """解析列投影参数 columns。
+
+    未指定时返回全部列（None）；true 表示数据源配置的表格可见列（数据源中不存在的
+    列跳过）；也可以传列名列表或逗号分隔的列名。
+
+    Raises:
+        ValueError: 参数格式无效或包含不存在的列时
+    """
+    if columns is None or columns is False:
+        return None
+    if columns is True:
+        visible = current_app.config["SEARCH_VISIBLE_COLUMNS"].get(data_source, [])
+        return [name for name in visible if name in df.columns]
+
+    if isinstance(columns, str):
+        columns = [name.strip() for name in columns.split(",") if name.strip()]
+    if not isinstance(columns, list):
+        raise ValueError("columns 参数须为 true 或列名列表")
+    for name in columns:
+        if name not in df.columns:
+            raise ValueError(f"无效的列: {name}")
+    return list(dict.fromkeys(columns))
+
+
+def _result_records(
+    df,
+    row_ids: np.ndarray,
+    start: int = 1,
+    columns: list[str] | None = None,
+    version=None,
+    result_format: str = RECORDS,
+    highlighter: Highlighter | None = None,
+) -> list[dict] | dict:
+    """按行号取出结果行并转换为 records（或 columnar 格式）。
+
+    指定 columns 时只取出这些列再序列化，并为每行附带行标识（ROW_ID_FIELD），
+    前端按行标识从详情接口获取完整记录。提供 highlighter 时每行附带关键字
+    命中位置（HIGHLIGHT_FIELD）。
+    """
+    extra_columns = {}
+    if highlighter is not None:
+        extra_columns[HIGHLIGHT_FIELD] = highlighter.rows(df, row_ids, columns)
+    if columns is None:
+        return _to_records(df.iloc[row_ids], start, result_format, extra_columns)
+
+    row_tokens = [_row_token(version, int(position)) for position in row_ids]
+    return _to_records(
+        df.iloc[row_ids, df.columns.get_indexer(columns)],
+        start,
+        result_format,
+        {ROW_ID_FIELD: row_tokens, **extra_columns},
+    )
+
+
+def _highlighter(df, search_levels) -> Highlighter:
+    """按搜索层级构建结果高亮器。
+
+    只高亮正向过滤层级的关键字（反向过滤的关键字不会出现在结果中）；
+    各列匹配的子串与 search_mask 一致（日期列中的年月关键字补零）。
+    关键字在各层级间去重，序号即在返回的关键字列表中的位置。
+    非字符串单元格与只按日期索引命中的年月关键字不返回命中位置（见 highlight 模块）。
+    """
+    keywords: list[str] = []
+    patterns: dict[str, list[tuple[str, int]]] = {}
+    for level in search_levels:
+        if level.get("negative_filtering", False) or not level.get("keywords"):
+            continue
+        column_name = level.get("column_name")
+        columns = [column_name] if isinstance(column_name, str) else list(column_name or [])
+        for keyword in split_keywords(level["keywords"]):
+            if not keyword:
+                continue
+            if keyword not in keywords:
+                keywords.append(keyword)
+            index = keywords.index(keyword)
+            for col in columns:
+                if col in df.columns:
+                    pattern = _keyword_pattern(keyword, is_date_column(col))
+                    patterns.setdefault(col, []).append((pattern, index))
+    return Highlighter(keywords, patterns)
+
+
+def _stream_response(
+    df,
+    row_ids: np.ndarray,
+    columns,
+    version,
+    result_format: str = RECORDS,
+    extra=None,
+    highlighter=None,
+):
+    """以 NDJSON 流式返回搜索结果。
+
+    第一行为头信息 {"status", "total", "columns", ...extra}，之后每行一条结果
+    （columnar 格式时为按 columns 排列的数组）。结果按块从行号数组生成，
+    每次只转换一块，内存占用与结果总数无关。
+    """
+    extra_names = ["序号"]
+    if columns is not None:
+        extra_names.append(ROW_ID_FIELD)
+    if highlighter is not None:
+        extra_names.append(HIGHLIGHT_FIELD)
+    # 与 frame_payload 的列顺序一致：附加列排在末尾，数据框中的同名列被其覆盖
+    result_columns = [
+        name for name in (df.columns if columns is None else columns) if name not in extra_names
+    ]
+    header = {
+        "status": "success",
+        "total": len(row_ids),
+        "columns": result_columns + extra_names,
+        **(extra or {}),
+    }
+    chunk_rows = current_app.config["SEARCH_STREAM_CHUNK_ROWS"]
+
+    def chunks():
+        for start in range(0, len(row_ids), chunk_rows):
+            payload = _result_records(
+                df,
+                row_ids[start : start + chunk_rows],
+                start + 1,
+                columns,
+                version,
+                result_format,
+                highlighter,
+            )
+            yield payload["rows"] if result_format == COLUMNAR else payload
+
+    return ndjson_response(header, chunks())
+
+
+def _parse_paging(params, default_page_size: bool = False) -> tuple[int, int] | None:
+    """解析分页参数 page / page_size（兼容 per_page）。
+
+    Args:
+        params: 请求 JSON 或查询参数
+        default_page_size: 未指定页大小时是否使用默认值；为 False 时返回 None（不分页）
+
+    Returns:
+        (页码, 每页条数)；未请求分页时返回 None
+
+    Raises:
+        ValueError: 分页参数无效时
+    """
+    page_size = params.get("page_size", params.get("per_page"))
+    if page_size is None:
+        if not default_page_size:
+            return None
+        page_size = DEFAULT_PAGE_SIZE
+
+    try:
+        page = int(params.get("page", 1))
+        page_size = int(page_size)
+    except (TypeError, ValueError):
+        raise ValueError("分页参数必须是整数")
+
+    max_page_size = current_app.config["SEARCH_MAX_PAGE_SIZE"]
+    if page < 1 or not 0 < page_size <= max_page_size:
+        raise ValueError(f"页码须大于0，每页条数须在 1 到 {max_page_size} 之间")
+    return page, page_size
+
+
+def _paginated_response(
+    df,
+    result_set,
+    page,
+    per_page,
+    sort_by=None,
+    ascending=False,
+    extra_meta=None,
+    result_format=RECORDS,
+):
+    """按结果集句柄返回一页结果，extra_meta 中的字段一并放入 meta。"""
+    page_ids = result_set.page(df, page, per_page, sort_by, ascending)
+    start = (page - 1) * per_page + 1
+    extra_meta = {"result_id": result_set.result_id, **(extra_meta or {})}
+    return ApiResponse.paginated(
+        _result_records(
+            df,
+            page_ids,
+            start,
+            result_set.columns,
+            result_set.version,
+            result_format,
+            result_set.highlighter,
+        ),
+        page,
+        per_page,
+        result_set.total,
+        message="搜索成功",
+        extra_meta=extra_meta,
+    )
+
+
+def _parse_date_filter(df, data_source: str, params) -> tuple | None:
+    """解析日期范围参数 date_from / date_to（可选 date_column）。
+
+    未指定 date_column 时使用数据源默认排序的首选日期列，没有则使用第一个日期列。
+
+    Returns:
+        (日期列, 起点, 终点)，起点 / 终点为 None 表示不限；未请求日期筛选时返回 None
+
+    Raises:
+        ValueError: 日期或日期列无效时
+    """
+    date_from = params.get("date_from") or None
+    date_to = params.get("date_to") or None
+    if date_from is None and date_to is None:
+        return None
+
+    column = params.get("date_column")
+    if column is None:
+        candidates = SORT_DATE_PRIORITY.get(data_source, []) + [
+            col for col in df.columns if isinstance(col, str) and is_date_column(col)
+        ]
+        column = next((col for col in candidates if col in df.columns), None)
+        if column is None:
+            raise ValueError("该数据源没有日期列，无法按日期筛选")
+    elif column not in df.columns or not is_date_column(column):
+        raise ValueError(f"无效的日期列: {column}")
+
+    start = date_bound(date_from) if date_from is not None else None
+    end = date_bound(date_to, end=True) if date_to is not None else None
+    if start is not None and end is not None and start > end:
+        raise ValueError("起始日期不能晚于结束日期")
+    return column, start, end
+
+
+def _date_range_rows(df, date_filter: tuple, search_index=None) -> np.ndarray:
+    """获取日期落在筛选范围内的行号（升序），优先使用搜索索引中的日期列索引"""
+    column, start, end = date_filter
+    dates = None
+    if search_index is not None and search_index.df is df:
+        dates = search_index.dates.get(column)
+    if dates is None:
+        dates = DateIndex(df[column])
+    return dates.range_rows(start, end)
+
+
+# ATA 章节分面的名称：取数据源中第一个存在的 ATA 列，按前两位数字统计
+ATA_CHAPTER_FACET = "ATA章节"
+
+
+def _ata_column(df) -> str | None:
+    """获取数据源中第一个存在的 ATA 列"""
+    return next((c for c in current_app.config["SEARCH_ATA_COLUMNS"] if c in df.columns), None)
+
+
+def _validate_levels(search_levels) -> None:
+    """校验搜索层级参数的类型（在构建查询缓存键之前）。
+
+    列名须为字符串或字符串列表，关键字须为字符串或标量列表；否则抛出与
+    search_mask 相同的 ValueError，而不是在哈希缓存键时出现 TypeError。
+    """
+    if not isinstance(search_levels, list) or not all(
+        isinstance(level, dict) for level in search_levels
+    ):
+        raise ValueError("无效的搜索层级参数")
+    for level in search_levels:
+        column_name = level.get("column_name")
+        if column_name is not None and not (
+            isinstance(column_name, str)
+            or (isinstance(column_name, list) and all(isinstance(c, str) for c in column_name))
+        ):
+            raise ValueError("无效的列名参数")
+        keywords = level.get("keywords")
+        if keywords is not None and not (
+            isinstance(keywords, str)
+            or (
+                isinstance(keywords, list)
+                and all(isinstance(k, (str, int, float)) for k in keywords)
+            )
+        ):
+            raise ValueError("无效的关键字参数")
+
+
+def _parse_facets(df, facets) -> list[str] | None:
+    """解析分面参数 facets。
+
+    true 表示使用配置的默认分面；也可以传列名列表或逗号分隔的列名，其中
+    「ATA章节」表示按 ATA 章节统计。数据源中不存在的列跳过，不报错（前端对
+    各数据源请求同一组分面）。
+
+    Returns:
+        分面名列表；未请求分面时返回 None
+
+    Raises:
+        ValueError: 分面参数无效时
+    """
+    if not facets:
+        return None
+    if facets is True:
+        facets = current_app.config["SEARCH_FACET_COLUMNS"]
+    elif isinstance(facets, str):
+        facets = [name.strip() for name in facets.split(",") if name.strip()]
+    if not isinstance(facets, list):
+        raise ValueError("facets 参数须为 true 或列名列表")
+    return [
+        name
+        for name in facets
+        if (_ata_column(df) if name == ATA_CHAPTER_FACET else name in df.columns)
+    ]
+
+
+def _facet_counts(df, row_ids: np.ndarray, facets: list[str], search_index=None) -> dict:
+    """统计结果行中各分面取值的行数（按分类代码 bincount）。
+
+    Returns:
+        {分面名: {取值: 行数}}，取值按行数从多到少排列，空值不计
+    """
+    use_index = search_index is not None and search_index.df is df
+    result = {}
+    for name in facets:
+        column = _ata_column(df) if name == ATA_CHAPTER_FACET else name
+        if use_index:
+            category = (
+                search_index.ata_chapters(column)
+                if name == ATA_CHAPTER_FACET
+                else search_index.category(column)
+            )
+            counts = category.counts(row_ids)
+        else:
+            values = df[column].iloc[row_ids]
+            if name == ATA_CHAPTER_FACET:
+                values = ata_chapter(values)
+            counts = CategoryIndex(values).counts()
+        result[name] = {str(value): count for value, count in counts.items()}
+    return result
+
+
+def _search_session_id() -> str:
+    """获取当前浏览器会话的搜索会话标识（首次搜索时分配，保存在会话 cookie 中）"""
+    session_id = session.get("search_session")
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        session["search_session"] = session_id
+    return session_id
+
+
+def _level_columns(column_name) -> list:
+    """获取搜索层级的搜索列列表"""
+    return [column_name] if isinstance(column_name, str) else list(column_name or [])
+
+
+def _estimate_level(level: dict, search_index) -> int:
+    """按 n-gram 倒排表长度估计层级保留的行数，用于决定层级执行顺序。
+
+    正向层级取各列命中行数上界之和；反向过滤保留的是不匹配的行，
+    无法从倒排表得到可靠上界，按总行数估计（排在正向层级之后执行）。
+    """
+    total = len(search_index)
+    if level.get("negative_filtering", False):
+        return total
+
+    keywords = split_keywords(level.get("keywords") or "")
+    require_all = level.get("logic", "and") == "and"
+    estimate = 0
+    for col in _level_columns(level.get("column_name")):
+        patterns = [_keyword_pattern(k, is_date_column(col)) for k in keywords]
+        estimate += search_index.estimate_matches(col, patterns, require_all)
+    return min(estimate, total)
+
+
+def _category_rows(df, filters: dict, search_index=None) -> np.ndarray:
+    """按分类列筛选（列内多选为「或」，列之间为「与」），返回行号（升序）。
+
+    索引可用时对预计算的分类位图做按位或 / 与，只在最后展开一次行号。
+    """
+    if not filters:
+        return np.arange(len(df))
+
+    bitmap = None
+    for column, values in filters.items():
+        category = None
+        if search_index is not None and search_index.df is df:
+            category = search_index.category(column)
+        if category is not None:
+            bits = category.bitmap(values)
+        else:
+            bits = np.packbits(df[column].isin(values).to_numpy())
+        bitmap = bits if bitmap is None else bitmap & bits
+    return unpack_rows(bitmap, len(df))
+
+
+def _category_filters(df, aircraft_types, data_types) -> dict:
+    """机型、数据类型筛选条件（数据源没有数据类型列时忽略数据类型筛选）"""
+    filters = {}
+    if aircraft_types:
+        filters["机型"] = aircraft_types
+    if data_types and "数据类型" in df.columns:
+        filters["数据类型"] = data_types
+    return filters
+
+
+def _parse_query(df, params) -> tuple | None:
+    """解析查询语言参数 query 与默认搜索列 query_columns。
+
+    字段名须为数据源中的列名，「ATA」（不区分大小写）表示数据源中第一个存在的
+    ATA 列；不指定字段的词在 query_columns 中匹配，未指定时为全部文本列。
+
+    Returns:
+        (查询语法树, 默认搜索列元组)；未提供查询时返回 None
+
+    Raises:
+        ValueError: 查询语法错误或字段、列名无效时
+    """
+    query = params.get("query")
+    if query is None or not str(query).strip():
+        return None
+    node = parse_query(str(query))
+
+    columns = params.get("query_columns")
+    if columns:
+        if isinstance(columns, str):
+            columns = [name.strip() for name in columns.split(",") if name.strip()]
+        invalid = [name for name in columns if name not in df.columns]
+        if invalid:
+            raise ValueError(f"无效的搜索列: {', '.join(invalid)}")
+    else:
+        columns = [name for name in df.columns if df[name].dtype == object]
+
+    for field in query_fields(node):
+        if field is not None and _query_field(df, field) is None:
+            raise ValueError(f"无效的查询字段: {field}")
+    return node, tuple(columns)
+
+
+def _query_field(df, field: str) -> str | None:
+    """把查询字段解析为列名，无效时返回 None"""
+    if field in df.columns:
+        return field
+    if field.upper() == "ATA":
+        return _ata_column(df)
+    return None
+
+
+def _match_query_term(df, term: Term, row_ids: np.ndarray, columns, search_index=None):
+    """在 row_ids 中求满足单个查询词的行号（升序），各列之间为「或」。
+
+    指定字段的 ATA 列按层级编码查询（「21」「21-5x」为前缀，「21..24」为范围），
+    走 ATA 有序索引；指定字段的标识符列（件号、序列号、机号等）按规范化后的
+    取值精确匹配（前缀词按前缀匹配），走标识符哈希索引；分类列（机型、数据类型、运营人）与 ATA 列
+    按分类代码判断，每个不同取值只比较一次；文本列的前缀词在搜索视图上判断
+    单元格开头，其余词按短语走 search_mask（n-gram 倒排表收敛后在搜索视图上校验）。
+    """
+    if term.field is not None:
+        columns = (_query_field(df, term.field),)
+    use_index = search_index is not None and search_index.df is df
+    coded = set(CATEGORY_COLUMNS) | set(current_app.config["SEARCH_ATA_COLUMNS"])
+    text = term.text
+
+    def predicate(value) -> bool:
+        value = normalize_text(value)
+        return value.startswith(text) if term.prefix else text in value
+
+    hits = []
+    phrase_columns = []
+    for column in columns:
+        ata_rows = None
+        if term.field is not None and column in current_app.config["SEARCH_ATA_COLUMNS"]:
+            ata_rows = _ata_rows(df, column, term, row_ids, search_index)
+        if ata_rows is not None:
+            hits.append(ata_rows)
+        elif term.field is not None and column in IDENTIFIER_COLUMNS:
+            hits.append(_identifier_rows(df, column, term, row_ids, search_index))
+        elif column in coded:
+            category = search_index.category(column) if use_index else None
+            if category is None:
+                category = CategoryIndex(df[column].iloc[row_ids])
+                hits.append(row_ids[category.select(predicate, np.arange(len(row_ids)))])
+            else:
+                hits.append(category.select(predicate, row_ids))
+        elif term.prefix:
+            if use_index and column in search_index.view:
+                values = search_index.view.values(column, row_ids)
+            else:
+                values = normalize_series(df[column].iloc[row_ids])
+            hits.append(row_ids[np.array([v.startswith(text) for v in values], dtype=bool)])
+        else:
+            phrase_columns.append(column)
+    if phrase_columns:
+        mask = search_mask(df, [text], phrase_columns, "and", False, search_index, rows=row_ids)
+        hits.append(row_ids[mask])
+
+    if not hits:
+        return row_ids[:0]
+    return hits[0] if len(hits) == 1 else np.unique(np.concatenate(hits))
+
+
+def _ata_rows(df, column: str, term: Term, row_ids: np.ndarray, search_index=None):
+    """按 ATA 有序索引求 row_ids 中编码满足查询词的行号（升序），无法识别的写法返回 None"""
+    ata = None
+    if search_index is not None and search_index.df is df:
+        ata = search_index.ata(column)
+    if ata is None:
+        ata = AtaIndex(df[column].iloc[row_ids])
+        found = ata.query(term.text)
+        return row_ids[found] if found is not None else None
+    found = ata.query(term.text)
+    return np.intersect1d(row_ids, found, assume_unique=True) if found is not None else None
+
+
+def _identifier_rows(df, column: str, term: Term, row_ids: np.ndarray, search_index=None):
+    """按标识符索引求 row_ids 中取值等于（前缀词为以之开头）查询词的行号（升序）"""
+    identifier = None
+    if search_index is not None and search_index.df is df:
+        identifier = search_index.identifier(column)
+    if identifier is None:
+        # 未建索引时只对 row_ids 中的行临时构建
+        identifier = IdentifierIndex(df[column].iloc[row_ids], msn=column in MSN_COLUMNS)
+        found = identifier.prefix(term.text) if term.prefix else identifier.lookup(term.text)
+        return row_ids[found]
+    found = identifier.prefix(term.text) if term.prefix else identifier.lookup(term.text)
+    return np.intersect1d(row_ids, found, assume_unique=True)
+
+
+def _estimate_query_term(df, term: Term, columns, search_index) -> int:
+    """估计查询词命中的行数，用于安排 AND 子句的求值顺序。
+
+    标识符字段直接取哈希索引的命中行数，其余按 n-gram 倒排表估计。
+    """
+    if term.field is not None:
+        columns = (_query_field(df, term.field),)
+        identifier = search_index.identifier(columns[0])
+        if identifier is not None:
+            found = identifier.prefix(term.text) if term.prefix else identifier.lookup(term.text)
+            return len(found)
+    if term.prefix:
+        return len(df)
+    estimate = sum(search_index.estimate_matches(col, [term.text], True) for col in columns)
+    return min(estimate, len(df))
+
+
+def _query_rows(df, query: tuple, row_ids: np.ndarray, search_index=None) -> np.ndarray:
+    """在 row_ids 中对查询语法树求值，返回满足查询的行号（升序）"""
+    node, columns = query
+
+    def match_term(term: Term, rows: np.ndarray) -> np.ndarray:
+        return _match_query_term(df, term, rows, columns, search_index)
+
+    estimate = None
+    if search_index is not None and search_index.df is df:
+
+        def estimate(term: Term) -> int:
+            return _estimate_query_term(df, term, columns, search_index)
+
+    return evaluate(node, row_ids, match_term, estimate)
+
+
+def _query_key(query: tuple | None) -> tuple | None:
+    """查询的规范化键（规范化的查询文本与默认搜索列），用于结果缓存"""
+    if query is None:
+        return None
+    node, columns = query
+    return node.canonical(), tuple(sorted(columns))
+
+
+def _base_rows(
+    df, category_filters: dict, date_filter=None, search_index=None, query=None
+) -> np.ndarray:
+    """应用分类筛选、日期范围筛选与查询语言，返回搜索层级的起始行号（升序）"""
+    row_ids = _category_rows(df, category_filters, search_index)
+    # 日期范围筛选（二分查找得到的行号与分类筛选结果求交集）
+    if date_filter is not None:
+        row_ids = np.intersect1d(
+            row_ids, _date_range_rows(df, date_filter, search_index), assume_unique=True
+        )
+    # 查询语言在筛选后的行号上按集合运算求值
+    if query is not None:
+        row_ids = _query_rows(df, query, row_ids, search_index)
+    return row_ids
+
+
+def _level_candidates(level: dict, search_index) -> np.ndarray | None:
+    """按索引求层级可能保留的候选行号（命中行的超集，不逐行校验）。
+
+    年月关键字按日期索引取精确行号，其余关键字取 n-gram 倒排表的候选行；
+    同一列内按层级逻辑求交集 / 并集，各列之间求并集。反向过滤、未建索引的列
+    或无法收敛的关键字无法给出候选范围，返回 None（不收敛）。
+    """
+    if level.get("negative_filtering", False):
+        return None
+    keywords = split_keywords(level.get("keywords") or "")
+    if not keywords:
+        return None
+
+    require_all = level.get("logic", "and") == "and"
+    rows = []
+    for col in _level_columns(level.get("column_name")):
+        if col not in search_index.df.columns:
+            continue
+        dates = search_index.dates.get(col) if is_date_column(col) else None
+
+        sets: list[np.ndarray | None] = []
+        patterns = []
+        for keyword in keywords:
+            month = year_month(keyword) if dates is not None else None
+            if month is not None:
+                sets.append(dates.month_rows(*month))
+            else:
+                patterns.append(_keyword_pattern(keyword, is_date_column(col)))
+        if patterns:
+            sets.append(
+                search_index.keyword_candidates(col, patterns, require_all)
+                if col in search_index.view
+                else None
+            )
+
+        known = [ids for ids in sets if ids is not None]
+        if require_all and known:
+            col_rows = known[0]
+            for ids in known[1:]:
+                col_rows = np.intersect1d(col_rows, ids, assume_unique=True)
+        elif not require_all and len(known) == len(sets):
+            col_rows = np.unique(np.concatenate(known))
+        else:
+            return None
+        rows.append(col_rows)
+
+    if not rows:
+        return None
+    return np.unique(np.concatenate(rows))
+
+
+def _estimate_search(
+    df,
+    search_levels,
+    aircraft_types,
+    search_index,
+    date_filter=None,
+    data_types=None,
+    query=None,
+) -> np.ndarray:
+    """估计搜索结果：分类、日期筛选与查询语言精确计算，各层级只用索引候选行求交集。
+
+    不逐行校验关键字，返回的行号是实际结果的超集（反向过滤层级不参与收敛）。
+    """
+    row_ids = _base_rows(
+        df, _category_filters(df, aircraft_types, data_types), date_filter, search_index, query
+    )
+    for level in search_levels:
+        if not len(row_ids):
+            break
+        candidates = _level_candidates(level, search_index)
+        if candidates is not None:
+            row_ids = np.intersect1d(row_ids, candidates, assume_unique=True)
+    return row_ids
+
+
+def _run_search(
+    df,
+    search_levels,
+    aircraft_types,
+    search_index=None,
+    session_id=None,
+    date_filter=None,
+    data_types=None,
+    query=None,
+) -> tuple[np.ndarray, list[dict]]:
+    """应用机型、数据类型、日期筛选、查询语言和各搜索层级，返回结果行号（按数据框原始顺序）与执行计划。
+
+    各层级都是逐行过滤条件，执行顺序不影响结果。索引可用时按估计保留行数
+    从少到多执行（最收敛的层级先执行），行号集合为空后跳过其余层级；
+    提供会话标识时，还会复用该会话上一次搜索中相同层级的中间结果。
+
+    Returns:
+        (结果行号, 执行步骤列表)，步骤中的 level 为层级在 search_levels 中的序号
+
+    Raises:
+        ValueError: 搜索层级参数无效时
+    """
+    # 只保留有关键字的层级，并记录其在请求中的序号与规范化键
+    levels = [
+        (index, level, key)
+        for index, level in enumerate(search_levels)
+        for key in canonical_levels([level])
+    ]
+
+    category_filters = _category_filters(df, aircraft_types, data_types)
+
+    def base_rows() -> np.ndarray:
+        return _base_rows(df, category_filters, date_filter, search_index, query)
+
+    def apply_level(i: int, row_ids: np.ndarray) -> np.ndarray:
+        level = levels[i][1]
+        mask = search_mask(
+            df,
+            level.get("keywords"),
+            level.get("column_name"),
+            level.get("logic", "and"),
+            level.get("negative_filtering", False),
+            search_index,
+            rows=row_ids,
+        )
+        return row_ids[mask]
+
+    estimates: dict[int, int] = {}
+
+    def plan(remaining: list[int]) -> list[int]:
+        if search_index is None:
+            return remaining
+        for i in remaining:
+            estimates[i] = _estimate_level(levels[i][1], search_index)
+        return sorted(remaining, key=lambda i: estimates[i])
+
+    if search_index is None or session_id is None:
+        row_ids = base_rows()
+        nodes, steps = run_levels(row_ids, plan(list(range(len(levels)))), apply_level)
+        row_ids = nodes[-1] if nodes else row_ids
+    else:
+        base = (
+            search_index.source,
+            search_index.version,
+            tuple(sorted(set(category_filters.get("机型", [])))),
+            tuple(sorted(set(category_filters.get("数据类型", [])))),
+            date_filter,
+            _query_key(query),
+        )
+        result = current_app.search_refinements.refine(  # type: ignore[attr-defined]
+            session_id, base, [key for _, _, key in levels], base_rows, apply_level, plan
+        )
+        row_ids, steps = result.row_ids, result.steps
+
+    for step in steps:
+        if step["level"] in estimates:
+            step["estimate"] = estimates[step["level"]]
+        step["level"] = levels[step["level"]][0]
+    return row_ids, steps
 
 
 @bp.route("/search", methods=["POST"])
@@ -338,6 +1220,22 @@ def search():
         data_source = data.get("data_source", "case")
         search_levels = data.get("search_levels", [])
         aircraft_types = data.get("aircraft_types", [])
+        data_types = data.get("data_types") or []
+        debug = bool(data.get("debug", False))
+        stream = bool(data.get("stream", False))
+        mode = data.get("mode") or "rows"
+        if mode not in SEARCH_MODES:
+            return (
+                jsonify({"status": "error", "message": f"无效的搜索模式: {mode}"}),
+                400,
+            )
+
+        try:
+            paging = _parse_paging(data)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if stream and paging is not None:
+            return jsonify({"status": "error", "message": "流式输出不能与分页参数同时使用"}), 400
 
         # 加载选定的数据源
         df = current_app.load_data_source(data_source)  # type: ignore[attr-defined]
@@ -352,49 +1250,606 @@ def search():
                 404,
             )
 
-        # 复制数据框以避免修改原始数据
-        result_df = df.copy()
-
-        # 添加机型筛选
-        if aircraft_types:
-            result_df = result_df[result_df["机型"].isin(aircraft_types)]
+        try:
+            _validate_levels(search_levels)
+            date_filter = _parse_date_filter(df, data_source, data)
+            query = _parse_query(df, data)
+            facets = _parse_facets(df, data.get("facets"))
+            columns = _parse_columns(df, data_source, data.get("columns"))
+            result_format = parse_result_format(data.get("format"))
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        # 获取（必要时构建）数据源搜索索引；索引不可用时退回整列扫描
+        try:
+            search_index = get_search_index(data_source, df)
+        except Exception as e:
+            logger.warning(f"构建数据源 {data_source} 的搜索索引失败: {str(e)}")
+            search_index = None
+
+        # 相同请求（规范化后）在同一数据版本上直接复用缓存的结果行号
+        query_cache = current_app.query_cache  # type: ignore[attr-defined]
+        cache_key = None
+        row_ids = None
+        if search_index is not None:
+            cache_key = query_cache.key(
+                data_source,
+                search_index.version,
+                search_levels,
+                aircraft_types,
+                date_filter=date_filter,
+                data_types=data_types if "数据类型" in df.columns else None,
+                query=_query_key(query),
+            )
+            row_ids = query_cache.get(cache_key)
 
-        # 处理每个搜索层级
-        for level in search_levels:
-            keywords = level.get("keywords", "").strip()
-            column_name = level.get("column_name")
-            logic = level.get("logic", "and")
-            negative = level.get("negative_filtering", False)
-
-            if not keywords:
-                continue
+        # 调试信息：查询缓存是否命中，以及实际采用的层级执行计划
+        debug_info: dict = {"query_cache": "hit" if row_ids is not None else "miss"}
+        if query is not None:
+            debug_info["query"] = query[0].canonical()
 
+        # 估计模式：查询缓存未命中时只用索引候选行求交集，不逐行校验，返回总数上界
+        if mode == "estimate" and row_ids is None and search_index is not None:
             try:
-                result_df = search_column(result_df, keywords, column_name, logic, negative)
+                estimate_ids = _estimate_search(
+                    df, search_levels, aircraft_types, search_index, date_filter, data_types, query
+                )
+            except ValueError as e:
+                return jsonify({"status": "error", "message": str(e)}), 400
+            response = {"status": "success", "total": len(estimate_ids), "estimated": True}
+            if facets is not None:
+                response["facets"] = _facet_counts(df, estimate_ids, facets, search_index)
+            if debug:
+                response["debug"] = debug_info
+            return json_response(response)
+
+        # 整个搜索过程只在共享的缓存数据框上操作行号，不复制、不物化中间结果；
+        # 仅在序列化时按行号取出需要返回的行
+        if row_ids is None:
+            try:
+                row_ids, plan = _run_search(
+                    df,
+                    search_levels,
+                    aircraft_types,
+                    search_index,
+                    _search_session_id(),
+                    date_filter=date_filter,
+                    data_types=data_types,
+                    query=query,
+                )
             except ValueError as e:
                 return jsonify({"status": "error", "message": str(e)}), 400
+            debug_info["plan"] = plan
 
-        # 应用默认排序（如 case：申请时间优先，回退故障发生日期，倒序）
-        result_df = _apply_default_sort(result_df, data_source)
+            # 应用默认排序（如 case：申请时间优先，回退故障发生日期，倒序）
+            row_ids = _default_sorted_rows(df, data_source, row_ids, search_index)
 
-        # 将 NaN 统一替换为 None：jsonify 会把 NaN 序列化为非法 JSON 字面量，
-        # 前端 JSON.parse 会直接抛异常
-        result_df = result_df.replace({np.nan: None})
+            if cache_key is not None:
+                query_cache.put(cache_key, row_ids)
 
-        # 在返回结果之前，格式化C919的飞机序列号
-        results = result_df.to_dict("records")
+        # 附加信息：分面统计（按请求）与调试信息
+        extra: dict = {}
+        if facets is not None:
+            extra["facets"] = _facet_counts(df, row_ids, facets, search_index)
+        if debug:
+            extra["debug"] = debug_info
 
-        # 添加序号列
-        for index, item in enumerate(results, 1):
-            item["序号"] = index
+        # 计数模式：只返回精确总数与分面统计，不取出结果行
+        if mode != "rows":
+            return json_response(
+                {"status": "success", "total": len(row_ids), "estimated": False, **extra}
+            )
+
+        # 高亮：用搜索时的同一匹配器计算返回行中关键字的命中位置，随结果行返回
+        highlighter = _highlighter(df, search_levels) if data.get("highlight") else None
+        if highlighter is not None:
+            extra["highlight"] = {"keywords": highlighter.keywords}
+
+        # 流式模式：先输出头信息（总数、列名、分面统计），再按块输出结果行
+        version = search_index.version if search_index else None
+        if stream:
+            return _stream_response(
+                df, row_ids, columns, version, result_format, extra, highlighter
+            )
 
-        return jsonify({"status": "success", "data": results, "total": len(results)})
+        # 分页模式：结果集以行号形式缓存在服务端，只返回第一页和结果集句柄
+        if paging is not None:
+            page, per_page = paging
+            result_set = current_app.search_results.put(  # type: ignore[attr-defined]
+                data_source, version, row_ids, columns, highlighter
+            )
+            return _paginated_response(
+                df, result_set, page, per_page, extra_meta=extra, result_format=result_format
+            )
+
+        response = {
+            "status": "success",
+            "data": _result_records(
+                df,
+                row_ids,
+                columns=columns,
+                version=version,
+                result_format=result_format,
+                highlighter=highlighter,
+            ),
+            "total": len(row_ids),
+            **extra,
+        }
+        return json_response(response)
 
     except Exception as e:
         logger.error(f"搜索时出错: {str(e)}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+@bp.route("/search/results/<result_id>", methods=["GET"])
+def get_search_results_page(result_id):
+    """按结果集句柄获取分页搜索结果，可指定排序列（sort_by）与方向（sort_order）"""
+    try:
+        result_set = current_app.search_results.get(result_id)  # type: ignore[attr-defined]
+        if result_set is None:
+            return jsonify({"status": "error", "message": "结果集不存在或已过期，请重新搜索"}), 404
+
+        try:
+            paging = _parse_paging(request.args, default_page_size=True)
+            result_format = parse_result_format(request.args.get("format"))
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        page, per_page = paging  # type: ignore[misc]
+
+        df = current_app.load_data_source(result_set.source)  # type: ignore[attr-defined]
+        if df is None or get_search_index(result_set.source, df).version != result_set.version:
+            return jsonify({"status": "error", "message": "数据源已更新，请重新搜索"}), 410
+
+        sort_by = request.args.get("sort_by") or None
+        if sort_by is not None and sort_by not in df.columns:
+            return jsonify({"status": "error", "message": f"无效的排序列: {sort_by}"}), 400
+        ascending = request.args.get("sort_order", "desc").lower() == "asc"
+
+        return _paginated_response(
+            df, result_set, page, per_page, sort_by, ascending, result_format=result_format
+        )
+
+    except Exception as e:
+        logger.error(f"获取分页搜索结果时出错: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@bp.route("/search/rows/<source>/<row_id>", methods=["GET"])
+def get_search_row(source, row_id):
+    """按行标识获取一条完整记录（搜索结果使用列投影时查看详情）"""
+    try:
+        if source not in current_app.config["DATA_SOURCES"]:
+            return jsonify({"status": "error", "message": "无效的数据源"}), 400
+
+        try:
+            version, position = _parse_row_token(row_id)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        df = current_app.load_data_source(source)  # type: ignore[attr-defined]
+        if df is None:
+            return (
+                jsonify(
+                    {
+                        "status": "error",
+                        "message": f"找不到数据源文件: {current_app.config['DATA_SOURCES'][source]}",
+                    }
+                ),
+                404,
+            )
+        if version is not None and get_search_index(source, df).version != version:
+            return jsonify({"status": "error", "message": "数据源已更新，请重新搜索"}), 410
+        if not 0 <= position < len(df):
+            return jsonify({"status": "error", "message": "记录不存在"}), 404
+
+        record = frame_payload(df.iloc[[position]], extra_columns={ROW_ID_FIELD: [row_id]})[0]
+        return json_response({"status": "success", "data": record})
+
+    except Exception as e:
+        logger.error(f"获取搜索结果详情时出错: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+def _parse_top(value) -> int:
+    """解析联合搜索每个数据源返回的条数 top（未指定时使用配置的默认值）。
+
+    Raises:
+        ValueError: 参数无效时
+    """
+    if value is None:
+        return current_app.config["SEARCH_FEDERATED_TOP"]
+    try:
+        top = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("top 参数必须是整数")
+    max_top = current_app.config["SEARCH_MAX_PAGE_SIZE"]
+    if not 0 <= top <= max_top:
+        raise ValueError(f"top 须在 0 到 {max_top} 之间")
+    return top
+
+
+def _federated_top(df, row_ids: np.ndarray, date_column, top: int, search_index=None):
+    """取按日期列倒序（无效日期排最后）的前 top 个结果行号"""
+    if not top or date_column not in df.columns:
+        return row_ids[:top]
+    permutation = None
+    if search_index is not None and search_index.df is df:
+        permutation = search_index.sort_order([date_column])
+    if permutation is None:
+        permutation = SortPermutation([parse_dates(df[date_column])])
+    return permutation.top(row_ids, top)
+
+
+def _federated_source(app, source: str, params: dict, top: int) -> tuple[dict, list, np.ndarray]:
+    """在单个数据源上执行联合搜索（在线程池中运行）。
+
+    与 /api/search 共用查询缓存：同一查询在单独搜索该数据源时可直接复用结果。
+    数据源缺失、查询字段在该数据源中不存在等错误只记录在该数据源的摘要中，
+    不影响其他数据源。
+
+    Returns:
+        (数据源摘要, 前 top 条统一结构的结果, 这些结果的日期)
+    """
+    no_dates = np.array([], dtype="datetime64[ns]")
+    with app.app_context():
+        try:
+            df = current_app.load_data_source(source)  # type: ignore[attr-defined]
+            if df is None:
+                message = f"找不到数据源文件: {current_app.config['DATA_SOURCES'][source]}"
+                return {"status": "error", "message": message}, [], no_dates
+            try:
+                query = _parse_query(df, {"query": params["query"]})
+                facets = _parse_facets(df, params.get("facets"))
+            except ValueError as e:
+                return {"status": "error", "message": str(e)}, [], no_dates
+
+            try:
+                search_index = get_search_index(source, df)
+            except Exception as e:
+                logger.warning(f"构建数据源 {source} 的搜索索引失败: {str(e)}")
+                search_index = None
+
+            aircraft_types = params.get("aircraft_types") or []
+            data_types = params.get("data_types") or []
+            query_cache = current_app.query_cache  # type: ignore[attr-defined]
+            cache_key = None
+            row_ids = None
+            if search_index is not None:
+                cache_key = query_cache.key(
+                    source,
+                    search_index.version,
+                    [],
+                    aircraft_types,
+                    data_types=data_types if "数据类型" in df.columns else None,
+                    query=_query_key(query),
+                )
+                row_ids = query_cache.get(cache_key)
+            if row_ids is None:
+                row_ids, _ = _run_search(
+                    df, [], aircraft_types, search_index, data_types=data_types, query=query
+                )
+                row_ids = _default_sorted_rows(df, source, row_ids, search_index)
+                if cache_key is not None:
+                    query_cache.put(cache_key, row_ids)
+
+            summary: dict = {"status": "success", "total": len(row_ids)}
+            if facets is not None:
+                summary["facets"] = _facet_counts(df, row_ids, facets, search_index)
+
+            # 前 top 条结果映射为统一结构（日期、描述、数据源），附带行标识以便查看完整记录
+            fields = current_app.config["SEARCH_FEDERATED_FIELDS"].get(source, {})
+            date_column = fields.get("date")
+            description_column = fields.get("description")
+            top_ids = _federated_top(df, row_ids, date_column, top, search_index)
+            version = search_index.version if search_index else None
+
+            def values(column):
+                if column not in df.columns:
+                    return [None] * len(top_ids)
+                return column_values(df[column].iloc[top_ids])
+
+            rows = [
+                {
+                    "source": source,
+                    "date": date,
+                    "description": description,
+                    ROW_ID_FIELD: _row_token(version, int(pos)),
+                }
+                for pos, date, description in zip(
+                    top_ids, values(date_column), values(description_column), strict=True
+                )
+            ]
+            dates = (
+                parse_dates(df[date_column].iloc[top_ids])
+                if date_column in df.columns
+                else np.full(len(top_ids), np.datetime64("NaT"), dtype="datetime64[ns]")
+            )
+            return summary, rows, dates
+
+        except Exception as e:
+            logger.error(f"联合搜索数据源 {source} 时出错: {str(e)}")
+            return {"status": "error", "message": str(e)}, [], no_dates
+
+
+@bp.route("/search/federated", methods=["POST"])
+def federated_search():
+    """跨数据源联合搜索
+
+    同一查询（查询语言，见 /api/search 的 query 参数）在各数据源上并发执行，
+    返回各数据源的总数、分面统计，以及各数据源前 top 条结果按统一结构
+    （source、date、description）合并、按日期倒序排列的列表。
+    """
+    try:
+        data = request.get_json() or {}
+        query = data.get("query")
+        if query is None or not str(query).strip():
+            return jsonify({"status": "error", "message": "请输入查询"}), 400
+
+        all_sources = current_app.config["DATA_SOURCES"]
+        sources = data.get("sources") or list(all_sources)
+        if isinstance(sources, str):
+            sources = [name.strip() for name in sources.split(",") if name.strip()]
+        invalid = [name for name in sources if name not in all_sources]
+        if invalid:
+            return (
+                jsonify({"status": "error", "message": f"无效的数据源: {', '.join(invalid)}"}),
+                400,
+            )
+
+        try:
+            # 查询语法在提交到线程池之前检查一次；字段是否存在按各数据源分别检查
+            parse_query(str(query))
+            top = _parse_top(data.get("top"))
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        # 各数据源在线程池中并发搜索（加载数据源、匹配时 pandas / numpy 大部分时间释放 GIL）
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        executor = current_app.federated_executor  # type: ignore[attr-defined]
+        futures = {
+            source: executor.submit(_federated_source, app, source, data, top)
+            for source in dict.fromkeys(sources)
+        }
+
+        summaries = {}
+        rows: list[dict] = []
+        dates = []
+        for source, future in futures.items():
+            summary, source_rows, source_dates = future.result()
+            summaries[source] = summary
+            rows.extend(source_rows)
+            dates.append(source_dates)
+
+        # 合并各数据源的前 top 条结果，按日期倒序（日期相同时保持数据源顺序）
+        if rows:
+            order = SortPermutation([np.concatenate(dates)]).order
+            rows = [rows[i] for i in order]
+
+        return json_response(
+            {
+                "status": "success",
+                "total": sum(s["total"] for s in summaries.values() if s["status"] == "success"),
+                "sources": summaries,
+                "data": rows,
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"联合搜索时出错: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+def _bulk_keys() -> tuple[list[str], dict]:
+    """读取批量查找的标识符列表与其他参数。
+
+    JSON 请求体取 values（列表，或按换行 / 逗号分隔的字符串）；上传文件
+    （CSV / Excel，字段名 file）时取表单字段 column 指定的列，未指定时取第一列。
+    标识符去除首尾空白后按原样去重，保持提交顺序。
+
+    Returns:
+        (标识符列表, 其余参数)
+
+    Raises:
+        ValueError: 参数或文件无效时
+    """
+    if "file" in request.files:
+        params = request.form.to_dict()
+        file = request.files["file"]
+        if not file.filename or not current_app.allowed_file(  # type: ignore[attr-defined]
+            file.filename, {"csv", "xlsx", "xls"}
+        ):
+            raise ValueError("仅支持 CSV 或 Excel 文件")
+        if file.filename.lower().endswith(".csv"):
+            table = pd.read_csv(file.stream, dtype=str, keep_default_na=False)
+        else:
+            table = pd.read_excel(file.stream, dtype=str, keep_default_na=False)
+        column = params.get("column")
+        if column:
+            if column not in table.columns:
+                raise ValueError(f"上传文件中没有列: {column}")
+        elif len(table.columns):
+            column = table.columns[0]
+        else:
+            raise ValueError("上传文件中没有数据")
+        values = table[column].tolist()
+        params["stream"] = params.get("stream", "").lower() in ("1", "true", "yes")
+    else:
+        params = request.get_json() or {}
+        values = params.get("values") or []
+        if isinstance(values, str):
+            values = re.split(r"[\r\n,，]+", values)
+        if not isinstance(values, list):
+            raise ValueError("values 参数须为列表")
+
+    keys = list(dict.fromkeys(str(v).strip() for v in values if v is not None and str(v).strip()))
+    if not keys:
+        raise ValueError("请提供要查找的标识符")
+    max_keys = current_app.config["SEARCH_BULK_MAX_KEYS"]
+    if len(keys) > max_keys:
+        raise ValueError(f"单次最多查找 {max_keys} 个标识符")
+    return keys, params
+
+
+def _bulk_lookup_source(source: str, keys: list[str], columns) -> dict:
+    """在单个数据源的标识符列上批量查找（每列一次哈希连接）。
+
+    Returns:
+        {"status", "columns": 参与查找的列, "counts": {列: 各键命中行数},
+         "codes": {列: 各键的取值代码}, "index": 标识符索引, "version": 数据版本}；
+        数据源不可用时为 {"status": "error", "message": ...}
+    """
+    df = current_app.load_data_source(source)  # type: ignore[attr-defined]
+    if df is None:
+        message = f"找不到数据源文件: {current_app.config['DATA_SOURCES'][source]}"
+        return {"status": "error", "message": message}
+    try:
+        search_index = get_search_index(source, df)
+    except Exception as e:
+        logger.warning(f"构建数据源 {source} 的搜索索引失败: {str(e)}")
+        search_index = None
+
+    result: dict = {
+        "status": "success",
+        "columns": [],
+        "counts": {},
+        "codes": {},
+        "index": {},
+        "version": search_index.version if search_index else None,
+    }
+    for column in columns or IDENTIFIER_COLUMNS:
+        if column not in df.columns:
+            continue
+        identifier = search_index.identifier(column) if search_index is not None else None
+        if identifier is None:
+            identifier = IdentifierIndex(df[column], msn=column in MSN_COLUMNS)
+        counts, codes = identifier.lookup_many(keys)
+        result["columns"].append(column)
+        result["counts"][column] = counts
+        result["codes"][column] = codes
+        result["index"][column] = identifier
+    return result
+
+
+def _bulk_key_results(keys: list[str], lookups: dict, start: int, stop: int) -> list[dict]:
+    """生成 keys[start:stop] 的查找结果：各数据源、各列的命中行数与命中行标识"""
+    results = []
+    for i in range(start, stop):
+        sources = {}
+        total = 0
+        for source, lookup in lookups.items():
+            if lookup["status"] != "success":
+                continue
+            counts = {
+                column: int(lookup["counts"][column][i])
+                for column in lookup["columns"]
+                if lookup["counts"][column][i]
+            }
+            if not counts:
+                continue
+            rows = [
+                lookup["index"][column].rows_of_codes([lookup["codes"][column][i]])[0]
+                for column in counts
+            ]
+            row_ids = rows[0] if len(rows) == 1 else np.unique(np.concatenate(rows))
+            sources[source] = {
+                "total": len(row_ids),
+                "columns": counts,
+                "row_ids": [_row_token(lookup["version"], int(pos)) for pos in row_ids],
+            }
+            total += len(row_ids)
+        results.append({"key": keys[i], "total": total, "sources": sources})
+    return results
+
+
+@bp.route("/search/identifiers", methods=["POST"])
+def bulk_identifier_lookup():
+    """批量标识符查找
+
+    提交一批件号、序列号、机号等标识符（JSON 列表或上传 CSV / Excel 的一列），
+    在各数据源标识符列的哈希索引上一次完成连接，返回每个标识符在各数据源、
+    各列的命中行数与命中行标识（可按 /api/search/rows/<source>/<row_id> 查看记录）。
+    stream=true 时以 NDJSON 流式返回：头信息之后每行一个标识符。
+    """
+    try:
+        try:
+            keys, params = _bulk_keys()
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        all_sources = current_app.config["DATA_SOURCES"]
+        sources = params.get("sources") or current_app.config["SEARCH_IDENTIFIER_SOURCES"]
+        columns = params.get("columns")
+        if isinstance(sources, str):
+            sources = [name.strip() for name in sources.split(",") if name.strip()]
+        if isinstance(columns, str):
+            columns = [name.strip() for name in columns.split(",") if name.strip()]
+        invalid = [name for name in sources if name not in all_sources]
+        if invalid:
+            return (
+                jsonify({"status": "error", "message": f"无效的数据源: {', '.join(invalid)}"}),
+                400,
+            )
+        if columns:
+            invalid = [name for name in columns if name not in IDENTIFIER_COLUMNS]
+            if invalid:
+                return (
+                    jsonify({"status": "error", "message": f"不是标识符列: {', '.join(invalid)}"}),
+                    400,
+                )
+
+        # 先在各数据源上完成哈希连接（只得到各键的命中行数与取值代码），
+        # 命中行标识按需逐块生成
+        lookups = {source: _bulk_lookup_source(source, keys, columns) for source in sources}
+        matched = np.zeros(len(keys), dtype=bool)
+        for lookup in lookups.values():
+            for counts in lookup.get("counts", {}).values():
+                matched |= counts > 0
+
+        summary = {
+            source: (
+                {"status": "success", "columns": lookup["columns"]}
+                if lookup["status"] == "success"
+                else lookup
+            )
+            for source, lookup in lookups.items()
+        }
+        header = {
+            "status": "success",
+            "total": len(keys),
+            "matched": int(matched.sum()),
+            "sources": summary,
+        }
+
+        if params.get("stream"):
+            chunk_rows = current_app.config["SEARCH_STREAM_CHUNK_ROWS"]
+
+            def chunks():
+                for start in range(0, len(keys), chunk_rows):
+                    stop = min(start + chunk_rows, len(keys))
+                    yield _bulk_key_results(keys, lookups, start, stop)
+
+            return ndjson_response(header, chunks())
+
+        return json_response({**header, "data": _bulk_key_results(keys, lookups, 0, len(keys))})
+
+    except Exception as e:
+        logger.error(f"批量查找标识符时出错: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@bp.route("/search/cache_stats", methods=["GET"])
+def get_search_cache_stats():
+    """获取搜索查询缓存与结果集缓存的命中统计"""
+    return jsonify(
+        {
+            "status": "success",
+            "query_cache": current_app.query_cache.stats(),  # type: ignore[attr-defined]
+            "result_cache": current_app.search_results.stats(),  # type: ignore[attr-defined]
+        }
+    )
+
+
 @bp.route("/data_columns", methods=["GET"])
 def get_data_columns():
     source = request.args.get("source")
@@ -459,19 +1914,21 @@ def reset_data_source(source):
                 logger.warning("重新加载部件拆换记录数据失败")
 
             # 清除数据缓存，强制重新加载
-            from app import data_frames
+            from app import clear_data_source_cache, data_frames
 
-            if source in data_frames:
-                del data_frames[source]
+            cached = source in data_frames
+            clear_data_source_cache(source)
+            if cached:
                 logger.info(f"已清除数据源 {source} 的缓存")
 
             return jsonify({"status": "success", "message": "数据源已重置并重新加载"})
         else:
             # 对于其他数据源，仅清除缓存
-            from app import data_frames
+            from app import clear_data_source_cache, data_frames
 
-            if source in data_frames:
-                del data_frames[source]
+            cached = source in data_frames
+            clear_data_source_cache(source)
+            if cached:
                 logger.info(f"已清除数据源 {source} 的缓存")
 
             return jsonify({"status": "success", "message": "数据源缓存已清除"})
@@ -1,11 +1,12 @@
 import logging
 
-from flask import request
+from flask import current_app, request
 
 from app.api import bp
 from app.core.error_handler import BadRequestError, InternalError, ValidationError
 from app.services import SimilarityService
 from app.services.api_response import ApiResponse
+from app.utils.fast_json import COLUMNAR, ndjson_response, parse_result_format, records_payload
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,22 @@ logger = logging.getLogger(__name__)
 similarity_service = SimilarityService()
 
 
+def _stream_results(results, result_format, extra=None):
+    """以 NDJSON 流式返回相似度结果：头信息一行，之后每行一条结果"""
+    columns = list(dict.fromkeys(name for record in results for name in record))
+    header = {"status": "success", "total": len(results), "columns": columns, **(extra or {})}
+    chunk_rows = current_app.config["SEARCH_STREAM_CHUNK_ROWS"]
+
+    def chunks():
+        for start in range(0, len(results), chunk_rows):
+            chunk = results[start : start + chunk_rows]
+            if result_format == COLUMNAR:
+                chunk = [[record.get(name) for name in columns] for record in chunk]
+            yield chunk
+
+    return ndjson_response(header, chunks())
+
+
 @bp.route("/similarity", methods=["POST"])
 def calculate_text_similarity():
     try:
@@ -31,6 +48,13 @@ def calculate_text_similarity():
                 details={"missing_fields": missing_fields},
             )
 
+        try:
+            result_format = parse_result_format(data.get("format"))
+            # 可选的 limit：只返回相似度最高的前 limit 条
+            limit = int(data["limit"]) if data.get("limit") is not None else None
+        except ValueError as e:
+            raise ValidationError(str(e))
+
         # 记录请求信息
         logger.info(
             f"相似度计算请求: 搜索文本长度={len(data['text'])}, 搜索列={data['columns']}, 结果数量={len(data['results'])}"
@@ -39,7 +63,7 @@ def calculate_text_similarity():
         # 使用SimilarityService计算相似度
         logger.info("开始调用SimilarityService.calculate_similarity")
         sorted_results = similarity_service.calculate_batch_similarity(
-            data["text"], data["results"], data["columns"]
+            data["text"], data["results"], data["columns"], limit
         )
         logger.info(f"相似度计算完成，结果数量: {len(sorted_results)}")
 
@@ -51,7 +75,9 @@ def calculate_text_similarity():
         if sorted_results and "相似度" in sorted_results[0]:
             logger.info(f"结果包含相似度列，第一条结果相似度: {sorted_results[0]['相似度']}")
 
-        return ApiResponse.success(data=sorted_results, message="相似度计算成功")
+        return ApiResponse.success(
+            data=records_payload(sorted_results, result_format), message="相似度计算成功"
+        )
 
     except (BadRequestError, ValidationError):
         # 这些错误会被全局错误处理器捕获
@@ -82,6 +108,10 @@ def similarity_search():
         data_source = data["dataSource"]
         columns = data["columns"]
         limit = int(data["limit"])
+        try:
+            result_format = parse_result_format(data.get("format"))
+        except ValueError as e:
+            raise ValidationError(str(e))
 
         # 记录请求信息
         logger.info(
@@ -97,8 +127,11 @@ def similarity_search():
         for index, item in enumerate(results, 1):
             item["序号"] = index
 
+        if data.get("stream"):
+            return _stream_results(results, result_format, {"data_source": data_source})
+
         return ApiResponse.success(
-            data=results,
+            data=records_payload(results, result_format),
             message="相似度搜索成功",
             meta={"total": len(results), "data_source": data_source},
         )
@@ -45,6 +45,73 @@ class DefaultConfig:
         "r_and_i_record": os.path.join("raw", "r_and_i_record.parquet"),
     }
 
+    # 搜索分页配置：分页模式下结果集以行号形式缓存在服务端，按句柄翻页
+    SEARCH_RESULT_CACHE_SIZE = 64  # 最多缓存的结果集个数（LRU 淘汰）
+    SEARCH_RESULT_TTL = 30 * 60  # 结果集存活秒数
+    SEARCH_MAX_PAGE_SIZE = 2000  # 单页最大条数
+    SEARCH_STREAM_CHUNK_ROWS = 1000  # 流式输出（stream=true）时每块转换的行数
+
+    # 搜索结果列投影：请求 columns=true 时各数据源返回的列（与前端表格默认可见列一致），
+    # 完整记录按行标识从 /api/search/rows/<source>/<row_id> 获取
+    SEARCH_VISIBLE_COLUMNS = {
+        "case": ["申请时间", "问题描述", "答复详情", "机号/MSN", "运营人", "数据类型"],
+        "engineering": ["发布时间", "文件名称", "原因和说明", "数据类型", "MSN有效性"],
+        "manual": ["申请时间", "问题描述", "答复详情", "飞机序列号/注册号/运营人", "数据类型"],
+        "faults": ["日期", "问题描述", "排故措施", "运营人", "飞机序列号", "机号", "数据类型"],
+        "r_and_i_record": ["日期", "机号", "运营人", "故障描述", "处理结果", "数据类型"],
+    }
+
+    # 搜索查询缓存：按规范化请求与数据版本缓存结果行号
+    SEARCH_QUERY_CACHE_SIZE = 256
+
+    # 搜索层级增量细化：按会话保存各层级的中间结果行号
+    SEARCH_REFINEMENT_SESSIONS = 64  # 最多保留的会话个数（LRU 淘汰）
+    SEARCH_REFINEMENT_TTL = 30 * 60  # 会话中间结果存活秒数
+
+    # 搜索结果分面统计：请求 facets=true 时统计的列，「ATA章节」按 ATA 前两位数字统计
+    SEARCH_FACET_COLUMNS = ["数据类型", "机型", "运营人", "ATA章节"]
+    # ATA 列：章节分面与查询语言的「ATA」字段取数据源中第一个存在的列，
+    # 查询语言中这些列按层级编码查询（ATA:21、ATA:21-5x、ATA:21..24）
+    SEARCH_ATA_COLUMNS = ["ATA", "维修ATA", "故障ATA", "故障ATA章节"]
+
+    # 跨数据源联合搜索（/api/search/federated）：各数据源在线程池中并发搜索，
+    # 每个数据源返回前 N 条结果，按统一结构（日期、描述、数据源）合并
+    SEARCH_FEDERATED_WORKERS = 4  # 并发搜索的线程数
+    SEARCH_FEDERATED_TOP = 20  # 未指定 top 时每个数据源返回的条数
+    SEARCH_FEDERATED_FIELDS = {
+        "case": {"date": "申请时间", "description": "问题描述"},
+        "engineering": {"date": "发布时间", "description": "原因和说明"},
+        "manual": {"date": "申请时间", "description": "问题描述"},
+        "faults": {"date": "日期", "description": "问题描述"},
+        "r_and_i_record": {"date": "日期", "description": "故障描述"},
+    }
+
+    # 批量标识符查找（/api/search/identifiers）：默认查找的数据源与单次最多的标识符个数
+    SEARCH_IDENTIFIER_SOURCES = ["faults", "r_and_i_record", "case"]
+    SEARCH_BULK_MAX_KEYS = 10000
+
+    # 关键字匹配引擎："pandas"（单线程）或 "arrow"（pyarrow.compute 多线程分块匹配）
+    SEARCH_ENGINE = os.environ.get("SEARCH_ENGINE", "pandas")
+    SEARCH_ENGINE_WORKERS = 4  # Arrow 引擎并行匹配的线程数
+    SEARCH_ENGINE_CHUNK_SIZE = 64 * 1024  # Arrow 引擎每个分块的行数
+
+    # HTTP 响应压缩：按 Accept-Encoding 协商 br / zstd / gzip（br、zstd 需安装 brotli、zstandard）
+    COMPRESS_ENABLED = True
+    COMPRESS_MIN_SIZE = 1024  # 小于该字节数的响应不压缩（流式响应总是压缩）
+    COMPRESS_MIMETYPES = [
+        "application/json",
+        "application/x-ndjson",
+        "application/javascript",
+        "text/javascript",
+        "text/html",
+        "text/css",
+        "text/plain",
+        "text/csv",
+    ]
+    # 第三方静态资源：启动时预压缩，带强 ETag 和长缓存时间
+    VENDOR_STATIC_DIR = "vendor"
+    VENDOR_CACHE_MAX_AGE = 365 * 24 * 3600
+
     # 允许的文件类型
     ALLOWED_EXTENSIONS = {"xlsx", "xls", "csv", "parquet"}
 
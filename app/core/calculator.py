@@ -2,10 +2,13 @@ import logging
 from typing import Any, cast
 
 import jieba
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from app.utils.top_k import top_k
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
@@ -20,7 +23,11 @@ class TextSimilarityCalculator:
 
     @classmethod
     def calculate_similarity(
-        cls, search_text: str, results: list[dict[str, Any]], columns: list[str]
+        cls,
+        search_text: str,
+        results: list[dict[str, Any]],
+        columns: list[str],
+        limit: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         计算文本相似度并排序结果
@@ -29,6 +36,7 @@ class TextSimilarityCalculator:
             search_text (str): 搜索文本
             results (list): 结果列表
             columns (list): 要搜索的列名列表
+            limit (int, optional): 只返回相似度最高的前 limit 条，None 或非正数表示全部
 
         Returns:
             list: 按相似度排序的结果列表
@@ -104,12 +112,6 @@ class TextSimilarityCalculator:
                 f"余弦相似度计算完成，最大值: {similarities.max() if len(similarities) > 0 else '无数据'}, 最小值: {similarities.min() if len(similarities) > 0 else '无数据'}"
             )
 
-            # 添加相似度列，格式化为百分比字符串
-            df["相似度"] = [f"{x:.2f}%" for x in (similarities * 100)]
-
-            # 为了保持正确的排序，添加一个数值列
-            df["相似度_排序"] = similarities * 100
-
             # 根据数据源选择对应的时间列
             time_column = None
             if "申请时间" in df.columns:  # 快响信息
@@ -121,33 +123,39 @@ class TextSimilarityCalculator:
 
             logger.info(f"选择的时间列: {time_column}")
 
+            times = None
             try:
-                # 按相似度降序排序，如果有时间列则按时间升序二次排序
+                # 按相似度降序排序，如果有时间列则按时间升序二次排序（无效时间排最后）；
+                # 指定 limit 时只选出前 limit 条再排序，不对全部结果排序
+                sort_keys = [-similarities]
                 if time_column:
                     # 确保时间列为datetime类型
-                    df[time_column] = pd.to_datetime(df[time_column], errors="coerce")
-                    df_sorted = df.sort_values(
-                        by=["相似度_排序", time_column], ascending=[False, True]
+                    times = pd.to_datetime(df[time_column], errors="coerce")
+                    ordinals = times.to_numpy(dtype="datetime64[ns]").view(np.int64)
+                    sort_keys.append(
+                        np.where(times.isna().to_numpy(), np.iinfo(np.int64).max, ordinals)
                     )
-                    # 统一时间格式为 YYYY-MM-DD
-                    df_sorted[time_column] = df_sorted[time_column].dt.strftime("%Y-%m-%d")
-                else:
-                    # 如果没有时间列，只按相似度排序
-                    df_sorted = df.sort_values(by="相似度_排序", ascending=False)
-
-                logger.info(f"排序完成，结果数量: {len(df_sorted)}")
+                order = top_k(sort_keys, limit if limit and limit > 0 else None)
+                logger.info(f"排序完成，结果数量: {len(order)}")
             except Exception as e:
                 logger.error(f"排序过程出错: {str(e)}", exc_info=True)
-                # 如果排序失败，使用未排序的数据框
-                df_sorted = df
+                # 如果排序失败，使用未排序的数据
+                order = np.arange(len(df))[: limit if limit and limit > 0 else None]
+                times = None
                 logger.warning("排序失败，使用未排序的结果")
 
+            # 只对返回的行格式化
+            df_sorted = df.iloc[order].drop(columns=["合并文本", "搜索列分词_cut"])
+            if times is not None and time_column:
+                # 统一时间格式为 YYYY-MM-DD
+                df_sorted[time_column] = times.iloc[order].dt.strftime("%Y-%m-%d")
+            # 添加相似度列，格式化为百分比字符串
+            df_sorted["相似度"] = [f"{x:.2f}%" for x in (similarities[order] * 100)]
+
             # 转换回字典列表时处理 NaN 值
             try:
-                result_dicts = (
-                    df_sorted.drop(columns=["合并文本", "搜索列分词_cut", "相似度_排序"])
-                    .replace({pd.NA: None, float("nan"): None})
-                    .to_dict("records")
+                result_dicts = df_sorted.replace({pd.NA: None, float("nan"): None}).to_dict(
+                    "records"
                 )
                 logger.info(f"转换为字典列表完成，结果数量: {len(result_dicts)}")
                 return cast("list[dict[str, Any]]", result_dicts)
@@ -0,0 +1,29 @@
+"""
+搜索索引模块，为关键字搜索提供按数据源缓存的索引结构
+"""
+
+from .date_index import DateIndex, is_date_column
+from .index import (
+    SearchIndex,
+    configure_search_engine,
+    get_search_index,
+    invalidate_search_index,
+)
+from .matcher import KeywordMatcher
+from .ngram_index import NgramIndex
+from .search_view import SearchView, normalize_series, normalize_text, split_keywords
+
+__all__ = [
+    "DateIndex",
+    "KeywordMatcher",
+    "NgramIndex",
+    "SearchIndex",
+    "SearchView",
+    "configure_search_engine",
+    "get_search_index",
+    "invalidate_search_index",
+    "is_date_column",
+    "normalize_series",
+    "normalize_text",
+    "split_keywords",
+]
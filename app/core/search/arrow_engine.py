@@ -0,0 +1,116 @@
+"""
+PyArrow 关键字匹配引擎
+
+pandas 路径在 object 数组上逐个做 Python 子串判断，单线程且全程持有 GIL，
+同一进程内的并发搜索会相互排队。本引擎把搜索视图中已规范化的文本列转成
+Arrow 字符串数组（按固定行数分块），用 pyarrow.compute.match_substring 在
+线程池中并行匹配各分块；Arrow 计算内核在 C++ 层执行、不持有 GIL。
+
+Arrow 数组直接由搜索视图的规范化字符串构建（规范化只在建索引时做一次），
+因此匹配结果与 pandas 路径逐位一致。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .search_view import SearchView
+
+# 每个分块的行数
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_executor: ThreadPoolExecutor | None = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """获取共享线程池（线程数变化时重建）。"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="arrow-search"
+            )
+            _executor_workers = max_workers
+        return _executor
+
+
+def _match_chunk(chunk: pa.Array, patterns: Sequence[str], require_all: bool) -> np.ndarray:
+    """在单个分块上计算多关键字命中掩码。"""
+    combine = pc.and_ if require_all else pc.or_
+    mask = None
+    for pattern in patterns:
+        hit = pc.match_substring(chunk, pattern)
+        mask = hit if mask is None else combine(mask, hit)
+    if mask is None:
+        return np.full(len(chunk), require_all, dtype=bool)
+    return mask.to_numpy(zero_copy_only=False)
+
+
+class ArrowTextColumns:
+    """搜索视图文本列的 Arrow 副本，按分块并行做子串匹配"""
+
+    def __init__(
+        self, view: SearchView, chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = 4
+    ) -> None:
+        """
+        构建 Arrow 文本列
+
+        Args:
+            view: 已物化的搜索视图
+            chunk_size: 每个分块的行数
+            max_workers: 并行匹配的线程数
+        """
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.columns: dict[str, pa.Array] = {
+            col: pa.array(values, type=pa.large_string()) for col, values in view.columns.items()
+        }
+
+    def __contains__(self, column: object) -> bool:
+        return column in self.columns
+
+    def match(
+        self,
+        column: str,
+        patterns: Sequence[str],
+        rows: np.ndarray | None = None,
+        require_all: bool = True,
+    ) -> np.ndarray:
+        """判断某列（可选部分行）是否包含全部 / 任一子串。
+
+        Args:
+            column: 列名
+            patterns: 已规范化的子串
+            rows: 待判断的行号，None 表示全部行
+            require_all: True 表示所有子串都须出现（AND）
+
+        Returns:
+            与行一一对应的布尔数组
+        """
+        values = self.columns[column]
+        if rows is not None:
+            values = values.take(pa.array(rows, type=pa.int64()))
+
+        chunks = [
+            values.slice(start, self.chunk_size) for start in range(0, len(values), self.chunk_size)
+        ]
+        if not chunks:
+            return np.zeros(0, dtype=bool)
+        if len(chunks) == 1 or self.max_workers <= 1:
+            masks = [_match_chunk(chunk, patterns, require_all) for chunk in chunks]
+        else:
+            executor = _get_executor(self.max_workers)
+            masks = list(
+                executor.map(lambda chunk: _match_chunk(chunk, patterns, require_all), chunks)
+            )
+        return np.concatenate(masks)
@@ -0,0 +1,150 @@
+"""
+ATA 章节
+
+各数据源的 ATA 列（ATA、维修ATA、故障ATA、故障ATA章节）写法不一：「21-51-00」
+「2151-00」「21.51」「ATA 21」，以及 Excel 数值经 astype(str) 变成的「21.0」。
+这里统一规范化为「章-节-题」的层级编码（如 21-51-00），只写到章或节时相应截短
+（「21」「21-51」）。规范化只用于搜索时构建的有序数组索引，数据中的原值不改写；
+超过三级、含多个取值（「21/22」「21 22」）等无法识别的写法不进入索引：
+
+- 规范化编码按字典序排列后，同一章 / 节下的编码连续，「ATA 21」「21-5x」这类
+  层级前缀查询与「21..24」范围查询都只需两次二分查找
+- 章节分面统计取编码的前两位数字
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# 最多保留的层级数：章、节、题
+MAX_LEVELS = 3
+
+_PREFIX = re.compile(r"^ata\s*[:：]?\s*", re.IGNORECASE)
+_FLOAT_SUFFIX = re.compile(r"^(\d+)\.0$")
+_WILDCARD = re.compile(r"[xX*?]+$")
+_RANGE = re.compile(r"^(.+?)\s*(?:\.\.|~)\s*(.+)$")
+_SEPARATOR_SPACES = re.compile(r"\s*([-.])\s*")
+# 规范化时接受的写法：以「-」「.」分隔的数字组（「/」与空格分隔的是多个取值）
+_ATA_TEXT = re.compile(r"^\d+(?:[-.]\d+)*$")
+
+
+def _ata_digits(text: str, partial: bool = False) -> str | None:
+    """把 ATA 写法转换为两位一组的数字串，无法识别时返回 None。
+
+    各组数字中一位数的组补零（「21-5-00」即 21-05-00）；partial 为 True 时
+    最后一组不补零，用于前缀查询（「21-5」表示 21-50 到 21-59）。超过三级的
+    写法（如「21-51-00-01」）不截短，视为无法识别。
+    """
+    text = _PREFIX.sub("", unicodedata.normalize("NFKC", text).strip())
+    text = _SEPARATOR_SPACES.sub(r"\1", _FLOAT_SUFFIX.sub(r"\1", text))
+    if not text or not _ATA_TEXT.match(text):
+        return None
+    groups = re.findall(r"\d+", text)
+    digits = ""
+    for i, group in enumerate(groups):
+        last = i == len(groups) - 1
+        if len(group) == 1 and not (partial and last):
+            group = group.zfill(2)
+        elif len(group) % 2 and not (partial and last):
+            return None
+        digits += group
+    return digits if len(digits) <= MAX_LEVELS * 2 else None
+
+
+def _join_levels(digits: str) -> str:
+    return "-".join(digits[i : i + 2] for i in range(0, len(digits), 2))
+
+
+def normalize_ata(value: Any) -> str | None:
+    """把单个 ATA 值规范化为层级编码（如 21-51-00），无法识别的值返回 None。"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    digits = _ata_digits(str(value))
+    return _join_levels(digits) if digits else None
+
+
+def ata_codes(series: pd.Series) -> np.ndarray:
+    """把一列规范化为层级编码数组（每个不同取值只解析一次），无法识别的值为 None。"""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapped = np.array([normalize_ata(value) for value in uniques] + [None], dtype=object)
+    return mapped[codes]
+
+
+def ata_chapter(series: pd.Series) -> pd.Series:
+    """提取 ATA 章节（两位数字），无法识别的值为空。"""
+    codes = ata_codes(series)
+    return pd.Series(
+        [code[:2] if code is not None else None for code in codes], index=series.index, dtype=object
+    )
+
+
+def ata_prefix(text: str) -> str | None:
+    """把查询写法转换为层级编码前缀：「21」「ATA 21」「21-5x」「2151*」等，无法识别返回 None。"""
+    stripped = _WILDCARD.sub("", text.strip())
+    partial = stripped != text.strip()
+    digits = _ata_digits(stripped.rstrip("-./ "), partial=partial)
+    return _join_levels(digits) if digits else None
+
+
+class AtaIndex:
+    """ATA 列的有序数组索引：层级编码按字典序排列，前缀与范围查询均为二分查找"""
+
+    def __init__(self, series: pd.Series) -> None:
+        """
+        构建 ATA 索引
+
+        Args:
+            series: ATA 列，无法识别的值不进入索引
+        """
+        self.size = len(series)
+        self.codes = ata_codes(series)
+        valid = np.flatnonzero(pd.notna(self.codes))
+        keys = self.codes[valid].astype(str)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.rows = valid[order]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _between(self, low: str, high: str) -> np.ndarray:
+        """编码在 [low, high 及其下级] 之间的行号（升序）"""
+        start = np.searchsorted(self.keys, low, side="left")
+        stop = np.searchsorted(self.keys, high + "\U0010ffff", side="left")
+        return np.sort(self.rows[start:stop]) if stop > start else self.rows[:0]
+
+    def prefix(self, prefix: str) -> np.ndarray:
+        """层级前缀查询：编码以 prefix 开头（含全部下级）的行号（升序）。"""
+        return self._between(prefix, prefix)
+
+    def range(self, start: str, end: str) -> np.ndarray:
+        """范围查询：编码在 start 到 end（含 end 的全部下级）之间的行号（升序）。"""
+        if start > end:
+            return self.rows[:0]
+        return self._between(start, end)
+
+    def query(self, text: str) -> np.ndarray | None:
+        """按查询写法查找：「21」「21-5x」为层级前缀，「21..24」「21~24」为范围。
+
+        Returns:
+            行号（升序）；无法识别的写法返回 None
+        """
+        match = _RANGE.match(text.strip())
+        if match:
+            start, end = ata_prefix(match.group(1)), ata_prefix(match.group(2))
+            if start is None or end is None:
+                return None
+            return self.range(start, end)
+        prefix = ata_prefix(text)
+        return self.prefix(prefix) if prefix is not None else None
+
+    def chapters(self) -> pd.Series:
+        """各行的 ATA 章节（两位数字），无法识别的值为空。"""
+        return pd.Series([code[:2] if code is not None else None for code in self.codes])
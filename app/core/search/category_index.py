@@ -0,0 +1,102 @@
+"""
+低基数列的分类位图索引
+
+机型、数据类型、运营人这类列只有少量不同取值。构建索引时把列编码为分类
+代码（pandas.factorize），并为每个取值预先计算一份按位压缩的行位图：
+多选筛选（如机型 ARJ21 或「无」）只需对几个位图做按位或，多个筛选之间按位与，
+在任何文本匹配之前就把候选行收敛下来。
+
+分类代码同时用于按 bincount 统计搜索结果中各取值的行数（分面统计），
+以及查询语言中按取值（包含 / 前缀）筛选：每个不同取值只判断一次。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# 取值个数超过该值时不预计算位图，筛选退回按分类代码比较
+MAX_BITMAP_CATEGORIES = 1024
+
+
+class CategoryIndex:
+    """单列的分类代码与每个取值的压缩位图"""
+
+    def __init__(self, series: pd.Series) -> None:
+        """
+        构建分类索引
+
+        Args:
+            series: 待编码的列，空值的分类代码为 -1
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        self.codes = codes.astype(np.int32)
+        self.categories = pd.Index(uniques)
+        self.size = len(series)
+
+        self.bitmaps: np.ndarray | None = None
+        if len(self.categories) <= MAX_BITMAP_CATEGORIES:
+            self.bitmaps = np.zeros((len(self.categories), (self.size + 7) // 8), dtype=np.uint8)
+            mask = np.zeros(self.size, dtype=bool)
+            for code in range(len(self.categories)):
+                np.equal(self.codes, code, out=mask)
+                self.bitmaps[code] = np.packbits(mask)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def lookup(self, values: Iterable[Any]) -> np.ndarray:
+        """获取取值对应的分类代码，不存在的取值忽略。"""
+        codes = self.categories.get_indexer(pd.Index(list(values), dtype=object))
+        return np.unique(codes[codes >= 0])
+
+    def bitmap(self, values: Iterable[Any]) -> np.ndarray:
+        """获取取值为 values 之一的行的压缩位图。"""
+        codes = self.lookup(values)
+        if self.bitmaps is not None:
+            if not len(codes):
+                return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+            return np.bitwise_or.reduce(self.bitmaps[codes], axis=0)
+        return np.packbits(np.isin(self.codes, codes))
+
+    def rows(self, values: Iterable[Any]) -> np.ndarray:
+        """获取取值为 values 之一的行号（升序）。"""
+        return unpack_rows(self.bitmap(values), self.size)
+
+    def select(self, predicate: Callable[[Any], bool], row_ids: np.ndarray) -> np.ndarray:
+        """从 row_ids 中选出取值满足 predicate 的行（每个不同取值只判断一次）。
+
+        Args:
+            predicate: 对取值的判断函数
+            row_ids: 待筛选的行号
+
+        Returns:
+            满足条件的行号，保持 row_ids 中的顺序；空值行不会被选中
+        """
+        # 末尾多留一个 False，空值的分类代码 -1 恰好落在这一格
+        selected = np.zeros(len(self.categories) + 1, dtype=bool)
+        selected[:-1] = [bool(predicate(value)) for value in self.categories]
+        return row_ids[selected[self.codes[row_ids]]]
+
+    def counts(self, row_ids: np.ndarray | None = None) -> dict[Any, int]:
+        """统计各取值的行数（只含出现过的取值，空值不计）。
+
+        Args:
+            row_ids: 参与统计的行号，None 表示全部行
+
+        Returns:
+            {取值: 行数}，按行数从多到少排列
+        """
+        codes = self.codes if row_ids is None else self.codes[row_ids]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.categories))
+        present = np.flatnonzero(counts)
+        present = present[np.argsort(-counts[present], kind="stable")]
+        return {self.categories[code]: int(counts[code]) for code in present}
+
+
+def unpack_rows(bitmap: np.ndarray, size: int) -> np.ndarray:
+    """把压缩位图展开为行号（升序）。"""
+    return np.flatnonzero(np.unpackbits(bitmap, count=size))
@@ -0,0 +1,130 @@
+"""
+日期列索引
+
+各数据源的日期列（日期、申请时间、发布时间、故障发生日期等）以字符串存储。
+这里在构建搜索索引时把每个日期列解析一次为 datetime64 数组，并保存有效日期
+按时间升序的行号排列，日期范围查询用二分查找（searchsorted）直接得到行号，
+不再逐行做正则和子串匹配。
+
+无法解析为日期但有内容的单元格单独记录，年月关键字对这些行仍按子串匹配，
+保证不会漏掉原先能搜到的记录。
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_YEAR_MONTH = re.compile(r"^(\d{4})-(\d{1,2})$")
+
+
+def is_date_column(column: str) -> bool:
+    """判断是否是日期列（列名为「日期」或包含「时间」/「日期」）"""
+    return column == "日期" or "时间" in column or "日期" in column
+
+
+def year_month(keyword: str) -> tuple[int, int] | None:
+    """解析年月关键字（YYYY-M 或 YYYY-MM），不是年月时返回 None。"""
+    match = _YEAR_MONTH.match(keyword)
+    if not match:
+        return None
+    year, month = int(match.group(1)), int(match.group(2))
+    return (year, month) if 1 <= month <= 12 else None
+
+
+def parse_dates(series: pd.Series) -> np.ndarray:
+    """把一列解析为 datetime64[ns] 数组，无法解析的值为 NaT。
+
+    先按推断出的统一格式整列解析；格式不一致导致失败的行再逐个按混合格式重试。
+    """
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        parsed = pd.to_datetime(series)
+    else:
+        parsed = pd.to_datetime(series, errors="coerce")
+        retry = parsed.isna() & series.notna()
+        if retry.any():
+            parsed[retry] = pd.to_datetime(
+                series[retry].astype(str), errors="coerce", format="mixed"
+            )
+    if getattr(parsed.dt, "tz", None) is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.to_numpy(dtype="datetime64[ns]")
+
+
+def date_bound(value: Any, end: bool = False) -> np.datetime64:
+    """把日期范围参数解析为时间点。
+
+    按参数精度取区间边界：「2024-03」作为起点是 3 月 1 日 0 点，作为终点是
+    3 月最后一刻；「2024-03-15」作为终点包含当天全天。
+
+    Raises:
+        ValueError: 无法解析的日期
+    """
+    try:
+        period = pd.Period(str(value).strip())
+    except (TypeError, ValueError):
+        raise ValueError(f"无效的日期: {value}")
+    bound = period.end_time if end else period.start_time
+    return np.datetime64(bound.to_datetime64(), "ns")
+
+
+class DateIndex:
+    """单个日期列的解析结果与按时间排序的行号排列"""
+
+    def __init__(self, series: pd.Series, text: np.ndarray | None = None) -> None:
+        """
+        构建日期列索引
+
+        Args:
+            series: 日期列
+            text: 该列在搜索视图中的规范化字符串（文本列才有），用于匹配无法解析的行
+        """
+        self.values = parse_dates(series)
+        valid = ~np.isnat(self.values)
+        valid_rows = np.flatnonzero(valid)
+        self.order = valid_rows[np.argsort(self.values[valid_rows], kind="stable")]
+        self.sorted_values = self.values[self.order]
+
+        # 有内容但无法解析为日期的行
+        if text is not None:
+            self.unparsed_rows = np.flatnonzero(~valid & (text != ""))
+            self.unparsed_text = text[self.unparsed_rows]
+        else:
+            self.unparsed_rows = np.empty(0, dtype=np.int64)
+            self.unparsed_text = np.empty(0, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def range_rows(
+        self, start: np.datetime64 | None = None, end: np.datetime64 | None = None
+    ) -> np.ndarray:
+        """获取日期落在 [start, end] 内的行号（升序），边界为 None 表示不限。"""
+        lo = 0 if start is None else int(np.searchsorted(self.sorted_values, start, "left"))
+        hi = (
+            len(self.sorted_values)
+            if end is None
+            else int(np.searchsorted(self.sorted_values, end, "right"))
+        )
+        return np.sort(self.order[lo:hi])
+
+    def month_rows(self, year: int, month: int) -> np.ndarray:
+        """获取某年某月的行号（升序）。
+
+        可解析的行按日期范围查找；无法解析的行仍按「YYYY-MM」子串匹配。
+        """
+        period = pd.Period(year=year, month=month, freq="M")
+        rows = self.range_rows(
+            np.datetime64(period.start_time.to_datetime64(), "ns"),
+            np.datetime64(period.end_time.to_datetime64(), "ns"),
+        )
+        if not len(self.unparsed_rows):
+            return rows
+        pattern = f"{year}-{month:02d}"
+        hit = np.fromiter(
+            (pattern in v for v in self.unparsed_text), dtype=bool, count=len(self.unparsed_text)
+        )
+        return np.union1d(rows, self.unparsed_rows[hit])
@@ -0,0 +1,159 @@
+"""
+结果高亮
+
+搜索时服务端已经用 KeywordMatcher 判断了每行命中哪些关键字，这里用同一个
+匹配器（同样的规范化规则）计算返回行中各单元格的命中位置，前端只需按给定
+区间包裹 <mark>，不必在浏览器里对每个单元格逐关键字重新扫描。
+
+命中位置按紧凑格式返回：每行一个 {列名: [起点, 终点, 关键字序号, ...]}，
+没有命中的行为 None。匹配在规范化文本（NFKC、小写）上进行，位置换算回原文；
+原文按 JavaScript 字符串的 UTF-16 码元计数，前端可直接用于 slice。
+
+以下命中不返回位置：非字符串单元格（数值、已解析为日期类型的列等）；日期列
+中按日期索引以月份范围命中、但文本里不含补零后「YYYY-MM」子串的年月关键字
+（如单元格为「2024/3/5」、关键字为「2024-3」）。
+"""
+
+from __future__ import annotations
+
+import functools
+import unicodedata
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.core.search.matcher import KeywordMatcher
+from app.core.search.search_view import normalize_text
+
+
+@functools.lru_cache(maxsize=65536)
+def _normalize_piece(text: str) -> str:
+    """规范化一个字符（或字符及其后的组合字符），结果按字符缓存"""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+@functools.lru_cache(maxsize=65536)
+def _is_combining(ch: str) -> bool:
+    """字符规范化后是否以组合字符开头（会与前一个字符合成，如半角浊点「ﾞ」）"""
+    piece = _normalize_piece(ch)
+    return bool(piece) and unicodedata.combining(piece[0]) != 0
+
+
+def _offset_maps(text: str, normalized: str) -> tuple[list[int], list[int]] | None:
+    """规范化文本位置到原文 UTF-16 偏移的映射 (起点映射, 终点映射)。
+
+    原文按「基字符及其后的组合字符」分组规范化：一组规范化后变为多个字符时
+    （如「㎏」→「kg」），落在其中间的起点取该组的起点、终点取该组的终点；
+    组合字符与前一字符合成时（如「ｶﾞ」→「ガ」）整组对应一个字符。分组规范化
+    的结果与整体规范化不一致时（极少数跨组合成的情况）无法换算，返回 None。
+    """
+    groups = list(text)
+    pieces = list(map(_normalize_piece, groups))
+    if "".join(pieces) != normalized:
+        # 组合字符与前一字符合成时逐字符规范化的结果不同，改为按组规范化
+        groups = []
+        for ch in text:
+            if groups and _is_combining(ch):
+                groups[-1] += ch
+            else:
+                groups.append(ch)
+        pieces = [_normalize_piece(group) for group in groups]
+        if "".join(pieces) != normalized:
+            return None
+
+    if (
+        len(pieces) == len(text) == len(normalized)
+        and "" not in pieces
+        and len(text.encode("utf-16-le")) == 2 * len(text)
+    ):
+        # 常见情况：每个字符规范化为恰好一个字符且没有基本平面以外的字符，逐字符一一对应
+        positions = list(range(len(text) + 1))
+        return positions, positions
+
+    starts: list[int] = []
+    ends: list[int] = []
+    offset = 0
+    for group, piece in zip(groups, pieces, strict=True):
+        width = len(group.encode("utf-16-le")) // 2
+        for i in range(len(piece)):
+            starts.append(offset)
+            ends.append(offset if i == 0 else offset + width)
+        offset += width
+    starts.append(offset)
+    ends.append(offset)
+    return starts, ends
+
+
+class Highlighter:
+    """按搜索关键字计算结果单元格的命中位置"""
+
+    def __init__(self, keywords: Sequence[str], patterns: dict[str, list[tuple[str, int]]]) -> None:
+        """
+        构建高亮器
+
+        Args:
+            keywords: 已规范化的关键字（返回的关键字序号即在此列表中的位置）
+            patterns: 各列实际匹配的子串及其对应的关键字序号
+        """
+        self.keywords = list(keywords)
+        self._columns: dict[str, tuple[KeywordMatcher, list[int]]] = {}
+        for column, column_patterns in patterns.items():
+            unique = list(dict.fromkeys(column_patterns))
+            self._columns[column] = (
+                KeywordMatcher([pattern for pattern, _ in unique]),
+                [keyword for _, keyword in unique],
+            )
+
+    def cell(self, column: str, value: Any) -> list[int] | None:
+        """计算单元格的命中位置，编码为 [起点, 终点, 关键字序号, ...]；无命中返回 None。"""
+        if not isinstance(value, str) or column not in self._columns:
+            return None
+        matcher, keyword_ids = self._columns[column]
+        normalized = normalize_text(value)
+        spans = matcher.spans(normalized)
+        if not spans:
+            return None
+
+        # ASCII 文本规范化前后逐字符对应，位置无需换算
+        maps = None
+        if not value.isascii():
+            maps = _offset_maps(value, normalized)
+            if maps is None:
+                return None
+        encoded: list[int] = []
+        for start, end, index in spans:
+            if maps is not None:
+                start, end = maps[0][start], maps[1][end]
+            encoded.extend((start, end, keyword_ids[index]))
+        return encoded
+
+    def rows(
+        self, df: pd.DataFrame, row_ids: np.ndarray, columns: Sequence[str] | None = None
+    ) -> list[dict[str, list[int]] | None]:
+        """计算结果行的命中位置。
+
+        Args:
+            df: 数据源数据框
+            row_ids: 结果行号
+            columns: 返回的列，None 表示全部列
+
+        Returns:
+            与 row_ids 一一对应的 {列名: [起点, 终点, 关键字序号, ...]}，无命中的行为 None
+        """
+        targets = [
+            column
+            for column in self._columns
+            if column in df.columns and (columns is None or column in columns)
+        ]
+        values = [df[column].iloc[row_ids].tolist() for column in targets]
+        result: list[dict[str, list[int]] | None] = []
+        for i in range(len(row_ids)):
+            row = {}
+            for column, column_values in zip(targets, values, strict=True):
+                spans = self.cell(column, column_values[i])
+                if spans:
+                    row[column] = spans
+            result.append(row or None)
+        return result
@@ -0,0 +1,144 @@
+"""
+标识符列的哈希索引
+
+件号、序列号、飞机序列号、机号这类标识符查询的是「等于某个编号」，而不是
+「包含某个子串」。通用搜索对它们按子串逐行扫描，既慢又会误命中（查 123 命中
+A1234）。这里为标识符列构建规范化的精确匹配索引：
+
+- 规范化：全角转半角、大小写折叠，去掉空白与连字符（"ab-12 3" 与 "AB123" 相同）；
+  飞机序列号与导入时 FaultReportProcessor 的处理一致，只保留数字并补零到 5 位
+  （带字母的取值不是序列号，不参与匹配）；
+  空值与「无」不进入索引
+- 精确查找：取值 → 行号的哈希表，单个键 O(1)；批量查找用 pandas.Index.get_indexer
+  一次完成哈希连接
+- 前缀查找：不同取值按字典序排列，二分查找得到前缀对应的取值区间；行号按取值
+  分组存放，同一区间的行号在数组中连续
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# 构建标识符索引的列（列存在时首次查询构建）
+IDENTIFIER_COLUMNS = (
+    "拆卸部件件号",
+    "拆卸部件序列号",
+    "装上部件件号",
+    "装上部件序列号",
+    "故障件件号",
+    "故障件序号",
+    "飞机序列号",
+    "机号",
+    "注册号",
+    "机号/MSN",
+    "服务请求单编号",
+)
+# 按飞机序列号（MSN）规则规范化的列：只保留数字，补零到 5 位
+MSN_COLUMNS = ("飞机序列号",)
+MSN_WIDTH = 5
+
+# 规范化时去掉的分隔符：空白与各种连字符
+_SEPARATORS = re.compile(r"[\s\-‐‑‒–—―_]+")
+# 表示空值的取值（数据导入时空值统一清洗为「无」）
+_EMPTY_VALUES = {"", "无", "nan", "none", "null"}
+
+
+def normalize_identifier(value: Any, msn: bool = False, pad: bool = True) -> str:
+    """规范化单个标识符，空值返回空串。
+
+    Args:
+        value: 原始取值
+        msn: 是否按飞机序列号规则规范化（只保留数字并补零）
+        pad: msn 为 True 时是否补零；前缀查找不补零
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    text = unicodedata.normalize("NFKC", str(value)).strip()
+    if text.casefold() in _EMPTY_VALUES:
+        return ""
+    if msn:
+        # 带字母的取值（件号等）不是飞机序列号，不能只取其中的数字去匹配
+        text = re.sub(r"^msn", "", text, flags=re.IGNORECASE)
+        if re.search(r"[^\W\d_]", text):
+            return ""
+        digits = re.sub(r"\D", "", text)
+        return digits.zfill(MSN_WIDTH) if digits and pad else digits
+    return _SEPARATORS.sub("", text).casefold()
+
+
+class IdentifierIndex:
+    """单个标识符列的精确匹配哈希索引与前缀查找用的有序取值"""
+
+    def __init__(self, series: pd.Series, msn: bool = False) -> None:
+        """
+        构建标识符索引
+
+        Args:
+            series: 标识符列
+            msn: 是否按飞机序列号规则规范化
+        """
+        self.msn = msn
+        self.size = len(series)
+        keys = np.array(
+            [normalize_identifier(value, msn) or None for value in series.tolist()], dtype=object
+        )
+
+        # sort=True：分类代码即取值的字典序名次，前缀区间对应连续的代码
+        codes, uniques = pd.factorize(keys, sort=True, use_na_sentinel=True)
+        self.keys = pd.Index(uniques, dtype=object)
+
+        # 行号按取值分组（组内行号升序），第 i 个取值的行号为 rows[offsets[i]:offsets[i + 1]]
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        start = np.searchsorted(sorted_codes, 0)
+        self.rows = order[start:]
+        self.offsets = np.searchsorted(sorted_codes[start:], np.arange(len(uniques) + 1))
+        self._sorted_keys = np.asarray(uniques, dtype=object)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def normalize(self, value: Any, pad: bool = True) -> str:
+        """按该列的规则规范化查询值。"""
+        return normalize_identifier(value, self.msn, pad)
+
+    def _rows_of(self, code: int) -> np.ndarray:
+        return self.rows[self.offsets[code] : self.offsets[code + 1]]
+
+    def lookup(self, value: Any) -> np.ndarray:
+        """精确查找，返回取值（规范化后）等于 value 的行号（升序）。"""
+        key = self.normalize(value)
+        code = self.keys.get_indexer([key])[0] if key else -1
+        if code < 0:
+            return self.rows[:0]
+        return self._rows_of(code)
+
+    def lookup_many(self, values: Iterable[Any]) -> tuple[np.ndarray, np.ndarray]:
+        """批量精确查找（一次哈希连接）。
+
+        Returns:
+            (每个值的命中行数, 每个值对应的取值代码)；未命中的代码为 -1
+        """
+        keys = [self.normalize(value) for value in values]
+        codes = self.keys.get_indexer(pd.Index(keys, dtype=object))
+        counts = np.where(codes >= 0, self.offsets[codes + 1] - self.offsets[codes], 0)
+        return counts, codes
+
+    def rows_of_codes(self, codes: np.ndarray) -> list[np.ndarray]:
+        """获取各取值代码对应的行号（代码 -1 对应空数组）。"""
+        return [self._rows_of(code) if code >= 0 else self.rows[:0] for code in codes]
+
+    def prefix(self, value: Any) -> np.ndarray:
+        """前缀查找，返回取值（规范化后）以 value 开头的行号（升序）。"""
+        key = self.normalize(value, pad=False)
+        if not key:
+            return self.rows[:0]
+        low = np.searchsorted(self._sorted_keys, key, side="left")
+        high = np.searchsorted(self._sorted_keys, key + "\U0010ffff", side="left")
+        return np.sort(self.rows[self.offsets[low] : self.offsets[high]])
@@ -0,0 +1,373 @@
+"""
+数据源搜索索引
+
+每个数据源在首次加载时构建一份 SearchIndex（规范化搜索视图 + n-gram 倒排索引
++ 日期列索引 + 低基数列分类位图，标识符列的哈希索引在首次查询时构建），
+与缓存的 DataFrame 绑定：
+- 数据框对象发生变化（导入覆盖 parquet、重置缓存后重新加载）时自动重建
+- 每次重建递增数据版本号，供依赖索引的结构判断是否过期
+
+关键字匹配引擎可通过 configure_search_engine 选择：
+- "pandas"：在搜索视图的 Python 字符串上匹配（默认）
+- "arrow"：在 Arrow 字符串数组上多线程匹配，见 arrow_engine
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from .arrow_engine import DEFAULT_CHUNK_SIZE, ArrowTextColumns
+from .ata import AtaIndex
+from .category_index import CategoryIndex
+from .date_index import DateIndex, is_date_column, parse_dates
+from .identifier_index import IDENTIFIER_COLUMNS, MSN_COLUMNS, IdentifierIndex
+from .matcher import KeywordMatcher
+from .ngram_index import NgramIndex
+from .search_view import SearchView
+from .sort_order import SortPermutation
+
+logger = logging.getLogger(__name__)
+
+# 构建索引时即编码为分类位图的低基数列
+CATEGORY_COLUMNS = ("机型", "数据类型", "运营人")
+
+
+class SearchIndex:
+    """单个数据源的搜索索引，按列持有规范化视图与 n-gram 倒排索引"""
+
+    def __init__(
+        self, source: str, df: pd.DataFrame, version: int, engine: str | None = None
+    ) -> None:
+        """
+        构建数据源搜索索引
+
+        Args:
+            source: 数据源名称
+            df: 数据源缓存的完整数据框
+            version: 数据版本号
+            engine: 关键字匹配引擎，None 表示使用 configure_search_engine 的设置
+        """
+        self.source = source
+        self.df = df
+        self.version = version
+        self.engine = engine or _engine_settings["engine"]
+        self.view = SearchView(df)
+        self.ngrams: dict[str, NgramIndex] = {
+            col: NgramIndex.build(values.tolist()) for col, values in self.view.columns.items()
+        }
+        # 日期列解析一次为 datetime64，并按时间排序，供日期范围与年月关键字查询
+        self.dates: dict[str, DateIndex] = {
+            col: DateIndex(df[col], self.view.columns.get(col))
+            for col in df.columns
+            if isinstance(col, str) and is_date_column(col)
+        }
+        # 低基数列的分类位图索引（其他列首次使用时构建）
+        self.categories: dict[str, CategoryIndex] = {
+            col: CategoryIndex(df[col]) for col in CATEGORY_COLUMNS if col in df.columns
+        }
+        # ATA 列的层级编码有序索引（首次使用时构建）
+        self.ata_indexes: dict[str, AtaIndex] = {}
+        # 标识符列（件号、序列号、机号等）的精确匹配索引（首次使用时构建）
+        self.identifiers: dict[str, IdentifierIndex] = {}
+        # 按日期列优先级缓存的默认排序排列（首次使用时计算）
+        self._sort_orders: dict[tuple[str, ...], SortPermutation | None] = {}
+        self.arrow: ArrowTextColumns | None = None
+        if self.engine == "arrow":
+            self.arrow = ArrowTextColumns(
+                self.view,
+                chunk_size=_engine_settings["chunk_size"],
+                max_workers=_engine_settings["workers"],
+            )
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def positions_of(self, frame: pd.DataFrame) -> np.ndarray | None:
+        """把数据框的行映射为索引中的行号。
+
+        Args:
+            frame: 由索引数据框筛选得到的子集（保留原行标签）
+
+        Returns:
+            行号数组；无法映射（不是索引数据框的子集）时返回 None
+        """
+        if frame is self.df:
+            return np.arange(len(self.df))
+        if not self.df.index.is_unique or list(frame.columns) != list(self.df.columns):
+            return None
+        positions = self.df.index.get_indexer(frame.index)
+        if (positions < 0).any():
+            return None
+        return positions
+
+    def candidates(self, column: str, keyword: str) -> np.ndarray | None:
+        """获取某列中可能包含关键字的候选行号。
+
+        Args:
+            column: 列名
+            keyword: 已规范化的关键字
+
+        Returns:
+            升序候选行号；该列未建索引或关键字无法收敛时返回 None
+        """
+        ngram = self.ngrams.get(column)
+        if ngram is None:
+            return None
+        return ngram.candidates(keyword)
+
+    def category(self, column: str) -> CategoryIndex | None:
+        """获取某列的分类索引，列不存在时返回 None。"""
+        if column not in self.df.columns:
+            return None
+        if column not in self.categories:
+            self.categories[column] = CategoryIndex(self.df[column])
+        return self.categories[column]
+
+    def ata(self, column: str) -> AtaIndex | None:
+        """获取 ATA 列的层级编码有序索引（首次使用时构建），列不存在时返回 None。"""
+        if column not in self.df.columns:
+            return None
+        if column not in self.ata_indexes:
+            self.ata_indexes[column] = AtaIndex(self.df[column])
+        return self.ata_indexes[column]
+
+    def ata_chapters(self, column: str) -> CategoryIndex | None:
+        """获取某个 ATA 列按章节（两位数字）编码的分类索引，列不存在时返回 None。"""
+        ata = self.ata(column)
+        if ata is None:
+            return None
+        key = f"{column}@章节"
+        if key not in self.categories:
+            self.categories[key] = CategoryIndex(ata.chapters())
+        return self.categories[key]
+
+    def identifier(self, column: str) -> IdentifierIndex | None:
+        """获取标识符列的精确匹配索引（首次使用时构建），不是标识符列或列不存在时返回 None。"""
+        if column not in IDENTIFIER_COLUMNS or column not in self.df.columns:
+            return None
+        if column not in self.identifiers:
+            self.identifiers[column] = IdentifierIndex(self.df[column], msn=column in MSN_COLUMNS)
+        return self.identifiers[column]
+
+    def sort_order(self, priority: Sequence[str]) -> SortPermutation | None:
+        """获取按日期列优先级倒序的默认排序排列。
+
+        Args:
+            priority: 日期列优先级，不存在的列忽略
+
+        Returns:
+            SortPermutation；没有可用的日期列时返回 None
+        """
+        key = tuple(priority)
+        if key not in self._sort_orders:
+            columns = [col for col in priority if col in self.df.columns]
+            self._sort_orders[key] = (
+                SortPermutation([self._date_values(col) for col in columns]) if columns else None
+            )
+        return self._sort_orders[key]
+
+    def _date_values(self, column: str) -> np.ndarray:
+        """获取某列解析后的 datetime64 数组（日期列直接取日期索引）"""
+        dates = self.dates.get(column)
+        return dates.values if dates is not None else parse_dates(self.df[column])
+
+    def estimate_matches(self, column: str, patterns: Sequence[str], require_all: bool) -> int:
+        """按 n-gram 倒排表长度估计某列包含全部 / 任一子串的行数上界。
+
+        Args:
+            column: 列名
+            patterns: 已规范化的子串
+            require_all: True 表示所有子串都须出现（AND）
+
+        Returns:
+            估计行数；无法估计时返回总行数
+        """
+        ngram = self.ngrams.get(column)
+        if ngram is None:
+            return len(self.df)
+        counts = [ngram.estimate(pattern) for pattern in patterns]
+        known = [count for count in counts if count is not None]
+        if require_all:
+            return min(known, default=len(self.df))
+        if len(known) < len(counts):
+            return len(self.df)
+        return min(sum(known), len(self.df))
+
+    def match(self, column: str, pattern: str, positions: np.ndarray) -> np.ndarray:
+        """判断指定行的某列是否包含子串。
+
+        先用 n-gram 倒排表收敛候选行，只对候选行在搜索视图上做精确校验；
+        关键字无法收敛时直接扫描视图中的指定行。
+
+        Args:
+            column: 已物化到搜索视图的列名
+            pattern: 已规范化的子串
+            positions: 待判断的行号
+
+        Returns:
+            与 positions 一一对应的布尔数组
+        """
+        candidates = self.candidates(column, pattern)
+        if candidates is None:
+            return self.view.contains(column, pattern, positions)
+
+        # 只校验同时落在 positions 中的候选行
+        in_rows = np.zeros(len(self.df), dtype=bool)
+        in_rows[positions] = True
+        candidates = candidates[in_rows[candidates]]
+
+        hit = np.zeros(len(self.df), dtype=bool)
+        if len(candidates):
+            hit[candidates[self.view.contains(column, pattern, candidates)]] = True
+        return hit[positions]
+
+    def keyword_candidates(
+        self, column: str, patterns: Sequence[str], require_all: bool
+    ) -> np.ndarray | None:
+        """按 n-gram 倒排表求某列可能包含全部（require_all）或任一子串的候选行号。
+
+        AND 逻辑对能收敛的子串的候选行求交集；OR 逻辑求并集，任一子串无法收敛
+        时无法给出候选范围。结果是命中行的超集，尚未逐行校验。
+
+        Args:
+            column: 列名
+            patterns: 已规范化的子串
+            require_all: True 表示所有子串都须出现（AND）
+
+        Returns:
+            升序候选行号；无法收敛时返回 None
+        """
+        rows = None
+        for pattern in patterns:
+            candidates = self.candidates(column, pattern)
+            if candidates is None:
+                if require_all:
+                    continue
+                return None
+            if rows is None:
+                rows = candidates
+            elif require_all:
+                rows = np.intersect1d(rows, candidates, assume_unique=True)
+            else:
+                rows = np.union1d(rows, candidates)
+        return rows
+
+    def match_keywords(
+        self, column: str, matcher: KeywordMatcher, positions: np.ndarray, require_all: bool
+    ) -> np.ndarray:
+        """判断指定行的某列是否包含全部（require_all）或任一关键字。
+
+        各关键字的候选行先按逻辑求交集（AND）或并集（OR），再由匹配器对剩余
+        单元格一次性扫描；任一关键字无法收敛时，OR 逻辑退化为扫描全部指定行。
+
+        Args:
+            column: 已物化到搜索视图的列名
+            matcher: 该层级的多关键字匹配器
+            positions: 待判断的行号
+            require_all: True 表示所有关键字都须出现（AND）
+
+        Returns:
+            与 positions 一一对应的布尔数组
+        """
+        rows = self.keyword_candidates(column, matcher.keywords, require_all)
+        if rows is None:
+            # 无法收敛时要扫描全部指定行，Arrow 引擎在此处并行匹配
+            if self.arrow is not None and column in self.arrow:
+                if len(positions) == len(self.df):
+                    mask = self.arrow.match(column, matcher.keywords, None, require_all)
+                    return mask[positions]
+                return self.arrow.match(column, matcher.keywords, positions, require_all)
+            return matcher.match(self.view.values(column, positions), require_all)
+
+        in_rows = np.zeros(len(self.df), dtype=bool)
+        in_rows[positions] = True
+        rows = rows[in_rows[rows]]
+
+        hit = np.zeros(len(self.df), dtype=bool)
+        if len(rows):
+            hit[rows[matcher.match(self.view.values(column, rows), require_all)]] = True
+        return hit[positions]
+
+
+# 各数据源当前的索引与版本计数
+_indexes: dict[str, SearchIndex] = {}
+_versions: dict[str, int] = {}
+_lock = threading.Lock()
+# 各数据源的索引构建锁
+_build_locks: dict[str, threading.Lock] = {}
+
+SEARCH_ENGINES = ("pandas", "arrow")
+_engine_settings = {"engine": "pandas", "workers": 4, "chunk_size": DEFAULT_CHUNK_SIZE}
+
+
+def configure_search_engine(
+    engine: str = "pandas", workers: int = 4, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> None:
+    """设置关键字匹配引擎，已构建的索引在引擎变化时会按新设置重建。
+
+    Args:
+        engine: "pandas" 或 "arrow"
+        workers: Arrow 引擎并行匹配的线程数
+        chunk_size: Arrow 引擎每个分块的行数
+
+    Raises:
+        ValueError: 引擎名称无效
+    """
+    if engine not in SEARCH_ENGINES:
+        raise ValueError(f"无效的搜索引擎: {engine}，可选值: {', '.join(SEARCH_ENGINES)}")
+    with _lock:
+        _engine_settings.update(engine=engine, workers=workers, chunk_size=chunk_size)
+
+
+def _current_index(source: str, df: pd.DataFrame) -> SearchIndex | None:
+    """已构建且仍与 df 绑定的索引（调用方持有 _lock）"""
+    index = _indexes.get(source)
+    if index is not None and index.df is df and index.engine == _engine_settings["engine"]:
+        return index
+    return None
+
+
+def get_search_index(source: str, df: pd.DataFrame) -> SearchIndex:
+    """获取与数据框绑定的搜索索引，不存在或已过期时重建。
+
+    构建在 _lock 之外进行：每个数据源一把构建锁，同一数据源的并发请求只构建
+    一次（双重检查），不同数据源的构建与其他数据源的索引查找互不阻塞。
+
+    Args:
+        source: 数据源名称
+        df: 当前缓存的数据框
+
+    Returns:
+        SearchIndex 实例
+    """
+    with _lock:
+        index = _current_index(source, df)
+        if index is not None:
+            return index
+        build_lock = _build_locks.setdefault(source, threading.Lock())
+
+    with build_lock:
+        with _lock:
+            index = _current_index(source, df)
+            if index is not None:
+                return index
+            version = _versions.get(source, 0) + 1
+            _versions[source] = version
+
+        index = SearchIndex(source, df, version)
+        with _lock:
+            _indexes[source] = index
+        logger.info(f"已构建数据源 {source} 的搜索索引，版本 {version}，行数 {len(df)}")
+        return index
+
+
+def invalidate_search_index(source: str) -> None:
+    """丢弃数据源的搜索索引，下次搜索时按新数据重建。"""
+    with _lock:
+        if _indexes.pop(source, None) is not None:
+            logger.info(f"已清除数据源 {source} 的搜索索引")
@@ -0,0 +1,173 @@
+"""
+字符 n-gram 倒排索引
+
+把一列文本拆成字符 n-gram 建立倒排表，用于把「子串包含」查询先收敛成
+一小批候选行，再由调用方对候选行做精确的子串校验。
+
+切分规则（按 gram 起始字符决定长度）：
+- CJK 等宽字符（码点 >= U+2E80）起始：二元组（bigram）
+- 其他字符（拉丁字母、数字、符号）起始：三元组（trigram）
+
+关键字出现在某单元格中时，关键字内部每个完整 gram 必然也出现在该单元格的
+同一位置，因此候选集 = 关键字各 gram 倒排表的交集，是精确结果的超集。
+关键字过短、不含任何完整 gram 时无法收敛，返回 None 交由调用方全量扫描。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+# 以该码点为界区分 CJK（含假名、谚文、全角符号）与拉丁字符
+CJK_CODEPOINT_START = 0x2E80
+
+# 各类字符起始的 gram 长度
+CJK_GRAM_SIZE = 2
+LATIN_GRAM_SIZE = 3
+
+# 每个码点占用的位数（Unicode 最大码点 0x10FFFF < 2**21）
+_CODEPOINT_BITS = 21
+
+
+def _to_codepoints(text: str) -> np.ndarray:
+    """把字符串转换为码点数组（int64，便于后续移位拼接 gram 键）。"""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+
+def _gram_keys(codepoints: np.ndarray, row_of: np.ndarray | None = None) -> np.ndarray:
+    """计算每个起始位置的 gram 键，只保留不越过字符串（行）边界的完整 gram。
+
+    bigram 键 < 2**42，trigram 键（首字符码点 >= 1）>= 2**42，两类键互不冲突。
+
+    Args:
+        codepoints: 码点数组
+        row_of: 每个码点所属的行号；为 None 时视为单个字符串
+
+    Returns:
+        二元组 (gram 键数组, 对应的起始位置数组)
+    """
+    n = len(codepoints)
+    if n == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    c1 = np.zeros(n, dtype=np.int64)
+    c2 = np.zeros(n, dtype=np.int64)
+    c1[:-1] = codepoints[1:]
+    c2[:-2] = codepoints[2:]
+
+    is_cjk = codepoints >= CJK_CODEPOINT_START
+    bigram = (codepoints << _CODEPOINT_BITS) | c1
+    trigram = (codepoints << (2 * _CODEPOINT_BITS)) | (c1 << _CODEPOINT_BITS) | c2
+    keys = np.where(is_cjk, bigram, trigram)
+
+    positions = np.arange(n, dtype=np.int64)
+    ends = positions + np.where(is_cjk, CJK_GRAM_SIZE, LATIN_GRAM_SIZE) - 1
+    valid = ends < n
+    if row_of is not None:
+        valid[valid] = row_of[ends[valid]] == row_of[valid]
+
+    return keys[valid], positions[valid]
+
+
+def keyword_gram_keys(keyword: str) -> np.ndarray:
+    """计算关键字内部所有完整 gram 的键（去重、升序）。"""
+    keys, _ = _gram_keys(_to_codepoints(keyword))
+    return np.unique(keys)
+
+
+class NgramIndex:
+    """单列文本的 n-gram 倒排索引
+
+    倒排表以 CSR 形式存放：``keys`` 为升序的 gram 键，第 i 个键的行号列表为
+    ``rows[offsets[i]:offsets[i + 1]]``（升序、去重）。
+    """
+
+    def __init__(
+        self, keys: np.ndarray, offsets: np.ndarray, rows: np.ndarray, row_count: int
+    ) -> None:
+        self.keys = keys
+        self.offsets = offsets
+        self.rows = rows
+        self.row_count = row_count
+
+    @classmethod
+    def build(cls, values: Sequence[str]) -> NgramIndex:
+        """由一列已规范化（小写、无空值）的字符串构建索引。
+
+        Args:
+            values: 字符串序列，第 i 个元素对应第 i 行
+
+        Returns:
+            NgramIndex 实例
+        """
+        row_count = len(values)
+        lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=row_count)
+        codepoints = _to_codepoints("".join(values))
+        row_of = np.repeat(np.arange(row_count, dtype=np.int32), lengths)
+
+        keys, positions = _gram_keys(codepoints, row_of)
+        rows = row_of[positions]
+
+        # 按 (键, 行号) 排序并去掉同一行内重复出现的 gram
+        order = np.lexsort((rows, keys))
+        keys = keys[order]
+        rows = rows[order]
+        if len(keys):
+            keep = np.ones(len(keys), dtype=bool)
+            keep[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+            keys = keys[keep]
+            rows = rows[keep]
+
+        # 压缩为 CSR：每个不同键的起始偏移
+        if len(keys):
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        else:
+            starts = np.empty(0, dtype=np.int64)
+        offsets = np.append(starts, len(keys)).astype(np.int64)
+
+        return cls(keys[starts], offsets, rows, row_count)
+
+    def posting(self, key: int) -> np.ndarray:
+        """获取单个 gram 键的行号列表（不存在时返回空数组）。"""
+        i = int(np.searchsorted(self.keys, key))
+        if i >= len(self.keys) or self.keys[i] != key:
+            return np.empty(0, dtype=np.int32)
+        return self.rows[self.offsets[i] : self.offsets[i + 1]]
+
+    def candidates(self, keyword: str) -> np.ndarray | None:
+        """获取可能包含关键字的候选行号。
+
+        Args:
+            keyword: 已规范化（小写）的关键字
+
+        Returns:
+            升序的候选行号数组；关键字无完整 gram、无法收敛时返回 None
+        """
+        keys = keyword_gram_keys(keyword)
+        if not len(keys):
+            return None
+
+        # 从最短的倒排表开始求交集，尽早收敛
+        postings = sorted((self.posting(int(k)) for k in keys), key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, posting, assume_unique=True)
+        return result
+
+    def estimate(self, keyword: str) -> int | None:
+        """估计包含关键字的行数上界（最短倒排表的长度），不做集合运算。
+
+        Args:
+            keyword: 已规范化（小写）的关键字
+
+        Returns:
+            行数上界；关键字无完整 gram 时返回 None
+        """
+        keys = keyword_gram_keys(keyword)
+        if not len(keys):
+            return None
+        return min(len(self.posting(int(k))) for k in keys)
@@ -0,0 +1,107 @@
+"""
+搜索查询结果缓存
+
+工程师每天会反复执行相同的搜索。这里按「规范化后的请求 + 数据版本号」缓存
+最终命中的行号数组（已按默认排序），重复搜索直接取行号，不再扫描数据框。
+
+规范化规则：
+- 关键字与 search_column 使用同一拆分 / 规范化规则，去重后排序
+  （层级内 AND / OR 都满足交换律；单个关键字时逻辑无意义，统一为 and）
+- 搜索列、机型、数据类型去重后排序
+- 日期范围按解析后的时间点比较（「2024-3」与「2024-03」等价）
+- 层级顺序保留
+- 查询语言按语法树的规范化文本比较（字段、短语、运算符与括号层次）
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import numpy as np
+
+from app.utils.lru_cache import LRUCache
+
+from .search_view import split_keywords
+
+
+def canonical_levels(search_levels: Iterable[dict[str, Any]]) -> tuple:
+    """把搜索层级列表规范化为可哈希的元组，忽略没有关键字的层级。"""
+    levels = []
+    for level in search_levels:
+        keywords = sorted(set(split_keywords(level.get("keywords") or "")))
+        if not keywords:
+            continue
+
+        column_name = level.get("column_name")
+        if isinstance(column_name, list):
+            columns: Hashable = tuple(sorted(set(column_name)))
+        else:
+            columns = column_name
+
+        logic = level.get("logic", "and") if len(keywords) > 1 else "and"
+        negative = bool(level.get("negative_filtering", False))
+        levels.append((tuple(keywords), columns, logic, negative))
+    return tuple(levels)
+
+
+class QueryCache:
+    """按规范化请求与数据版本缓存搜索结果行号"""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """
+        初始化查询缓存
+
+        Args:
+            maxsize: 最多缓存的查询个数（LRU 淘汰）
+        """
+        self._cache = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def key(
+        source: str,
+        version: int,
+        search_levels: Iterable[dict[str, Any]],
+        aircraft_types: Iterable[str] | None = None,
+        date_filter: tuple | None = None,
+        data_types: Iterable[str] | None = None,
+        query: Hashable | None = None,
+    ) -> tuple:
+        """生成缓存键。
+
+        Args:
+            source: 数据源名称
+            version: 数据版本号
+            search_levels: 搜索层级列表
+            aircraft_types: 机型筛选
+            date_filter: 日期范围筛选 (日期列, 起点, 终点)
+            data_types: 数据类型筛选
+            query: 查询语言的规范化键（规范化的查询文本与默认搜索列）
+        """
+        return (
+            source,
+            version,
+            tuple(sorted(set(aircraft_types or []))),
+            canonical_levels(search_levels),
+            date_filter,
+            tuple(sorted(set(data_types or []))),
+            query,
+        )
+
+    def get(self, key: tuple) -> np.ndarray | None:
+        """读取缓存的行号数组，未命中时返回 None。"""
+        return self._cache.get(key)
+
+    def put(self, key: tuple, row_ids: np.ndarray) -> None:
+        """缓存行号数组（只读，防止调用方误改缓存内容）。"""
+        row_ids = np.array(row_ids)
+        row_ids.setflags(write=False)
+        self._cache.set(key, row_ids)
+
+    def discard_source(self, source: str) -> int:
+        """丢弃某个数据源的全部缓存，返回丢弃的个数。"""
+        return self._cache.discard_where(lambda key, _: key[0] == source)
+
+    def stats(self) -> dict[str, int]:
+        """获取命中 / 未命中统计。"""
+        return self._cache.stats()
@@ -0,0 +1,292 @@
+"""
+布尔查询语言
+
+在层级搜索之外提供一个查询字符串语法，一次表达复杂的工程查询：
+
+    问题描述:"发动机 喘振" AND (机型:ARJ21 OR 机型:C919) AND NOT 泄漏 AND ATA:21*
+
+- 词：不含空白、括号、引号的连续字符；"带空格的短语" 用双引号（也支持中文引号）
+- 字段：字段:值 / 字段:"短语"，只在该列匹配；不指定字段时在默认搜索列中匹配。
+  件号、序列号、机号等标识符字段按规范化后的取值精确匹配，而不是包含
+- 前缀：值以 * 结尾时按前缀匹配（单元格以该值开头），如 ATA:21*
+- 运算符：AND、OR、NOT（大写），相邻的词之间默认为 AND；优先级 NOT > AND > OR，
+  可用括号（也支持全角括号）改变优先级
+
+查询解析为语法树，求值时在行号集合上做集合运算：AND 依次在上一步的结果中
+求值（先求估计命中最少的子句），结果为空即停止；OR 只在尚未命中的行中
+求值其余子句，全部命中即停止；NOT 从当前行号中减去子句的结果。词的匹配
+由调用方提供（使用倒排表、分类位图等索引），这里不涉及具体的列和数据。
+"""
+
+from __future__ import annotations
+
+import abc
+from collections.abc import Callable
+
+import numpy as np
+
+from .search_view import normalize_text
+
+# 运算符关键字（须大写，避免与英文搜索词冲突）
+_OPERATORS = {"AND", "OR", "NOT"}
+# 全角 / 中文标点到半角的映射
+_PUNCTUATION = str.maketrans({"（": "(", "）": ")", "：": ":", "“": '"', "”": '"'})
+
+
+class QueryNode(abc.ABC):
+    """查询语法树节点"""
+
+    @abc.abstractmethod
+    def canonical(self) -> str:
+        """规范化的查询文本，可用作缓存键。"""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.canonical()})"
+
+
+class Term(QueryNode):
+    """单个匹配条件：在指定字段（或默认搜索列）中包含某个词，或以某个前缀开头"""
+
+    def __init__(self, text: str, field: str | None = None, prefix: bool = False) -> None:
+        """
+        Args:
+            text: 已按搜索规则规范化的词或短语
+            field: 字段名，None 表示默认搜索列
+            prefix: True 表示前缀匹配
+        """
+        self.text = text
+        self.field = field
+        self.prefix = prefix
+
+    def canonical(self) -> str:
+        value = '"' + self.text.replace('"', '\\"') + '"' + ("*" if self.prefix else "")
+        return f"{self.field}:{value}" if self.field is not None else value
+
+
+class Not(QueryNode):
+    """取反"""
+
+    def __init__(self, child: QueryNode) -> None:
+        self.child = child
+
+    def canonical(self) -> str:
+        return f"NOT {self.child.canonical()}"
+
+
+class And(QueryNode):
+    """全部子句都满足"""
+
+    def __init__(self, children: list[QueryNode]) -> None:
+        self.children = children
+
+    def canonical(self) -> str:
+        return "(" + " AND ".join(child.canonical() for child in self.children) + ")"
+
+
+class Or(QueryNode):
+    """任一子句满足"""
+
+    def __init__(self, children: list[QueryNode]) -> None:
+        self.children = children
+
+    def canonical(self) -> str:
+        return "(" + " OR ".join(child.canonical() for child in self.children) + ")"
+
+
+def tokenize(query: str) -> list[tuple[str, str | None, str | None]]:
+    """把查询字符串拆分为记号。
+
+    Returns:
+        记号列表，每项为 (类型, 字段, 值)：类型为 "(" / ")" / "AND" / "OR" / "NOT" / "TERM"
+
+    Raises:
+        ValueError: 引号不成对时
+    """
+    text = query.translate(_PUNCTUATION)
+    tokens: list[tuple[str, str | None, str | None]] = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char.isspace():
+            i += 1
+            continue
+        if char in "()":
+            tokens.append((char, None, None))
+            i += 1
+            continue
+
+        # 读取一个词（可能带字段前缀），字段值可以是带引号的短语
+        field = None
+        if char != '"':
+            start = i
+            while i < len(text) and not text[i].isspace() and text[i] not in '()"':
+                i += 1
+            word = text[start:i]
+            name, colon, value = word.partition(":")
+            if colon and name:
+                field = name
+                if value or i >= len(text) or text[i] != '"':
+                    tokens.append(("TERM", field, value))
+                    continue
+            elif word in _OPERATORS:
+                tokens.append((word, None, None))
+                continue
+            else:
+                tokens.append(("TERM", None, word))
+                continue
+
+        # 带引号的短语
+        end = text.find('"', i + 1)
+        if end < 0:
+            raise ValueError("查询语法错误: 引号不成对")
+        value = text[i + 1 : end]
+        i = end + 1
+        if i < len(text) and text[i] == "*":
+            value += "*"
+            i += 1
+        tokens.append(("PHRASE", field, value))
+    return tokens
+
+
+class _Parser:
+    """递归下降解析器：or := and (OR and)*；and := not ([AND] not)*；not := NOT not | primary"""
+
+    def __init__(self, tokens: list[tuple[str, str | None, str | None]]) -> None:
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def parse(self) -> QueryNode:
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"查询语法错误: 多余的「{self.peek()}」")
+        return node
+
+    def parse_or(self) -> QueryNode:
+        children = [self.parse_and()]
+        while self.peek() == "OR":
+            self.pos += 1
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self) -> QueryNode:
+        children = [self.parse_not()]
+        while self.peek() in ("AND", "NOT", "(", "TERM", "PHRASE"):
+            if self.peek() == "AND":
+                self.pos += 1
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self) -> QueryNode:
+        if self.peek() == "NOT":
+            self.pos += 1
+            return Not(self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self) -> QueryNode:
+        kind = self.peek()
+        if kind is None:
+            raise ValueError("查询语法错误: 查询不完整")
+        if kind == "(":
+            self.pos += 1
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise ValueError("查询语法错误: 括号不成对")
+            self.pos += 1
+            return node
+        if kind not in ("TERM", "PHRASE"):
+            raise ValueError(f"查询语法错误: 「{kind}」位置不正确")
+
+        _, field, value = self.tokens[self.pos]
+        self.pos += 1
+        prefix = bool(value) and value.endswith("*")  # type: ignore[union-attr]
+        text = normalize_text(value[:-1] if prefix else value)  # type: ignore[index]
+        if kind == "TERM":
+            text = text.strip()
+        if not text:
+            raise ValueError("查询语法错误: 空的查询词")
+        return Term(text, field, prefix)
+
+
+def parse_query(query: str) -> QueryNode:
+    """解析查询字符串为语法树。
+
+    Raises:
+        ValueError: 查询语法错误
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        raise ValueError("查询语法错误: 查询为空")
+    return _Parser(tokens).parse()
+
+
+def query_fields(node: QueryNode) -> set[str | None]:
+    """获取查询中用到的全部字段（None 表示默认搜索列）。"""
+    if isinstance(node, Term):
+        return {node.field}
+    if isinstance(node, Not):
+        return query_fields(node.child)
+    return set().union(*(query_fields(child) for child in node.children))  # type: ignore[attr-defined]
+
+
+def evaluate(
+    node: QueryNode,
+    rows: np.ndarray,
+    match_term: Callable[[Term, np.ndarray], np.ndarray],
+    estimate: Callable[[Term], int] | None = None,
+) -> np.ndarray:
+    """在行号集合上对查询求值，返回满足查询的行号（升序）。
+
+    Args:
+        node: 查询语法树
+        rows: 候选行号（升序）
+        match_term: 在给定行号中求满足某个词条件的行号（升序）
+        estimate: 估计某个词命中行数的函数，用于安排 AND 子句的求值顺序
+
+    Returns:
+        满足查询的行号（升序）
+    """
+    if not len(rows):
+        return rows
+    if isinstance(node, Term):
+        return match_term(node, rows)
+    if isinstance(node, Not):
+        return np.setdiff1d(rows, evaluate(node.child, rows, match_term, estimate), True)
+    if isinstance(node, And):
+        for child in _by_estimate(node.children, estimate):
+            rows = evaluate(child, rows, match_term, estimate)
+            if not len(rows):
+                break
+        return rows
+    if isinstance(node, Or):
+        matched = rows[:0]
+        remaining = rows
+        for child in node.children:
+            hit = evaluate(child, remaining, match_term, estimate)
+            if len(hit):
+                matched = np.union1d(matched, hit)
+                remaining = np.setdiff1d(remaining, hit, True)
+                if not len(remaining):
+                    break
+        return matched
+    raise TypeError(f"未知的查询节点: {node!r}")
+
+
+def _by_estimate(
+    children: list[QueryNode], estimate: Callable[[Term], int] | None
+) -> list[QueryNode]:
+    """按估计命中行数从少到多排列 AND 子句（反向子句最后求值）。"""
+    if estimate is None:
+        return children
+
+    def size(node: QueryNode) -> float:
+        if isinstance(node, Term):
+            return estimate(node)
+        if isinstance(node, Not):
+            return float("inf")
+        sizes = [size(child) for child in node.children]  # type: ignore[attr-defined]
+        return min(sizes) if isinstance(node, And) else sum(sizes)
+
+    return sorted(children, key=size)
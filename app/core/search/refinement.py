@@ -0,0 +1,171 @@
+"""
+搜索层级增量细化与执行计划
+
+用户在搜索页逐层添加条件：加一层、点搜索，再加一层、再点搜索。每次请求
+都从完整数据框重新跑所有层级，其实前面的层级结果与上一次完全相同。
+
+这里为每个会话保存一条「层级 -> 中间结果行号」的链：
+- 链首是机型筛选后的行号（与数据源、数据版本、机型绑定）
+- 第 i 个节点是依次应用链上前 i 个层级后的行号（按数据框原始顺序）
+
+每个层级都是逐行判断的过滤条件（反向过滤也是），应用顺序不影响最终结果。
+因此新请求只要包含链上某个前缀的全部层级，就可以从该前缀的节点继续，
+只计算其余层级：追加层级只算新层，修改或删除某一层从它之前的节点继续。
+
+其余层级的执行顺序由调用方的执行计划决定（例如先执行最收敛的层级），
+行号集合为空后不再计算后续层级。
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any
+
+import numpy as np
+
+from app.utils.lru_cache import LRUCache
+
+
+def run_levels(
+    row_ids: np.ndarray,
+    order: Sequence[int],
+    apply_level: Callable[[int, np.ndarray], np.ndarray],
+) -> tuple[list[np.ndarray], list[dict[str, Any]]]:
+    """按给定顺序依次应用层级，行号集合为空后跳过其余层级。
+
+    Args:
+        row_ids: 起始行号
+        order: 层级序号的执行顺序
+        apply_level: 在行号子集上应用第 i 个层级，返回剩余行号
+
+    Returns:
+        (各层级应用后的行号列表, 执行步骤说明)
+    """
+    nodes = []
+    steps = []
+    for i in order:
+        skipped = not len(row_ids)
+        if not skipped:
+            row_ids = np.asarray(apply_level(i, row_ids))
+        nodes.append(row_ids)
+        steps.append({"level": i, "rows": len(row_ids), "reused": False, "skipped": skipped})
+    return nodes, steps
+
+
+class RefinementChain:
+    """单个会话的层级结果链"""
+
+    def __init__(self, base: Hashable, levels: Sequence[Hashable], row_ids: list[np.ndarray]):
+        """
+        Args:
+            base: 链首键（数据源、数据版本、机型）
+            levels: 按应用顺序排列的层级规范化键
+            row_ids: row_ids[i] 为应用前 i 个层级后的行号，长度为 len(levels) + 1
+        """
+        self.base = base
+        self.levels = tuple(levels)
+        self.row_ids = row_ids
+
+    def reusable(self, base: Hashable, levels: Sequence[Hashable]) -> list[int] | None:
+        """找出可复用的最长前缀。
+
+        Args:
+            base: 请求的链首键
+            levels: 请求的层级规范化键
+
+        Returns:
+            前缀各节点对应的请求层级序号；链首不同时返回 None
+        """
+        if self.base != base:
+            return None
+        pending = Counter(levels)
+        matched: list[int] = []
+        for key in self.levels:
+            if not pending[key]:
+                break
+            pending[key] -= 1
+            matched.append(next(i for i, k in enumerate(levels) if k == key and i not in matched))
+        return matched
+
+
+class RefinementResult:
+    """一次细化搜索的结果与执行过程"""
+
+    def __init__(self, row_ids: np.ndarray, reused: int, steps: list[dict[str, Any]]):
+        """
+        Args:
+            row_ids: 最终行号（按数据框原始顺序）
+            reused: 复用的层级数，链首不能复用时为 -1
+            steps: 按执行顺序排列的步骤说明
+        """
+        self.row_ids = row_ids
+        self.reused = reused
+        self.steps = steps
+
+
+class RefinementStore:
+    """按会话保存层级结果链，按 TTL 过期并按 LRU 淘汰"""
+
+    def __init__(self, maxsize: int = 64, ttl: float | None = 30 * 60) -> None:
+        """
+        初始化存储
+
+        Args:
+            maxsize: 最多保留的会话个数
+            ttl: 会话链存活秒数
+        """
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def refine(
+        self,
+        session_id: str,
+        base: Hashable,
+        levels: Sequence[Hashable],
+        base_rows: Callable[[], np.ndarray],
+        apply_level: Callable[[int, np.ndarray], np.ndarray],
+        plan: Callable[[list[int]], list[int]] | None = None,
+    ) -> RefinementResult:
+        """计算请求的结果行号，复用会话链中可复用前缀的中间结果。
+
+        Args:
+            session_id: 会话标识
+            base: 链首键
+            levels: 各层级的规范化键
+            base_rows: 计算链首行号的函数
+            apply_level: 在行号子集上应用第 i 个层级，返回剩余行号
+            plan: 决定其余层级执行顺序的函数，None 表示按请求顺序
+
+        Returns:
+            RefinementResult
+        """
+        chain: RefinementChain | None = self._cache.get(session_id)
+        matched = chain.reusable(base, levels) if chain is not None else None
+        reused = -1 if matched is None else len(matched)
+
+        if matched is None:
+            row_ids = [np.asarray(base_rows())]
+            matched = []
+        else:
+            row_ids = chain.row_ids[: len(matched) + 1]  # type: ignore[union-attr]
+
+        remaining = [i for i in range(len(levels)) if i not in matched]
+        order = plan(remaining) if plan is not None else remaining
+        nodes, steps = run_levels(row_ids[-1], order, apply_level)
+
+        reused_steps = [
+            {"level": i, "rows": len(ids), "reused": True, "skipped": False}
+            for i, ids in zip(matched, row_ids[1:], strict=True)
+        ]
+        applied = [levels[i] for i in matched + list(order)]
+        self._cache.set(session_id, RefinementChain(base, applied, row_ids + nodes))
+
+        return RefinementResult((row_ids + nodes)[-1], reused, reused_steps + steps)
+
+    def discard_source(self, source: str) -> int:
+        """丢弃链首属于某个数据源的会话链，返回丢弃的个数。"""
+        return self._cache.discard_where(lambda _, chain: chain.base[0] == source)
+
+    def stats(self) -> dict[str, int]:
+        """获取缓存统计信息。"""
+        return self._cache.stats()
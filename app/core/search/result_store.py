@@ -0,0 +1,147 @@
+"""
+搜索结果集缓存
+
+/api/search 的分页模式只返回第一页和一个结果集句柄（result_id），结果集
+本身以行号数组的形式保存在服务端。后续翻页、换排序方式都按句柄从这里读取，
+不必重新搜索，也不必把全部结果一次性发给浏览器。
+
+结果集记录生成时的数据版本号，数据源重新加载后旧句柄自动失效；搜索时指定
+的返回列（列投影）与高亮设置也随结果集保存，翻页时保持一致。
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from app.core.search.highlight import Highlighter
+from app.utils.lru_cache import LRUCache
+from app.utils.top_k import top_k
+
+# 请求的页靠前（截止位置不超过结果数的 1/4）且该排序方式尚未缓存时，
+# 只部分选择到该页为止的行，不对整个结果集排序
+PARTIAL_SORT_RATIO = 4
+
+
+class ResultSet:
+    """一次搜索的结果集（按默认排序的行号）"""
+
+    def __init__(
+        self,
+        result_id: str,
+        source: str,
+        version: int | None,
+        row_ids: np.ndarray,
+        columns: list[str] | None = None,
+        highlighter: Highlighter | None = None,
+    ):
+        self.result_id = result_id
+        self.source = source
+        self.version = version
+        self.row_ids = row_ids
+        # 返回的列，None 表示全部列
+        self.columns = columns
+        # 搜索时请求了高亮则保存高亮器，翻页时同样返回关键字命中位置
+        self.highlighter = highlighter
+        # 按 (排序列, 升降序) 缓存的排序结果
+        self._sorted: dict[tuple[str, bool], np.ndarray] = {}
+
+    @property
+    def total(self) -> int:
+        return len(self.row_ids)
+
+    def ordered(
+        self, df: pd.DataFrame, sort_by: str | None = None, ascending: bool = False
+    ) -> np.ndarray:
+        """获取指定排序方式下的行号。
+
+        Args:
+            df: 生成结果集时的数据源数据框
+            sort_by: 排序列，None 表示保持搜索时的默认排序
+            ascending: 是否升序
+
+        Returns:
+            排序后的行号数组
+        """
+        if not sort_by:
+            return self.row_ids
+
+        key = (sort_by, ascending)
+        if key not in self._sorted:
+            values = df[sort_by].iloc[self.row_ids].reset_index(drop=True)
+            # 稳定排序：排序键相同的行保持默认排序中的先后顺序
+            order = values.sort_values(
+                ascending=ascending, kind="mergesort", na_position="last"
+            ).index.to_numpy()
+            self._sorted[key] = self.row_ids[order]
+        return self._sorted[key]
+
+    def page(
+        self,
+        df: pd.DataFrame,
+        page: int,
+        per_page: int,
+        sort_by: str | None = None,
+        ascending: bool = False,
+    ) -> np.ndarray:
+        """获取某一页的行号（页码从 1 开始）。"""
+        start = (page - 1) * per_page
+        stop = start + per_page
+        if (
+            sort_by
+            and (sort_by, ascending) not in self._sorted
+            and stop * PARTIAL_SORT_RATIO <= self.total
+        ):
+            order = top_k(self._sort_key(df, sort_by, ascending), stop)
+            return self.row_ids[order[start:]]
+        return self.ordered(df, sort_by, ascending)[start:stop]
+
+    def _sort_key(self, df: pd.DataFrame, sort_by: str, ascending: bool) -> np.ndarray:
+        """把排序列转换为数值排序键（取值的名次），空值排在最后，与 ordered() 的顺序一致。"""
+        values = df[sort_by].iloc[self.row_ids]
+        codes, uniques = pd.factorize(values, sort=True, use_na_sentinel=True)
+        missing = len(uniques)
+        if not ascending:
+            codes = np.where(codes >= 0, missing - 1 - codes, codes)
+        return np.where(codes >= 0, codes, missing)
+
+
+class ResultSetStore:
+    """结果集缓存，按 TTL 过期并按 LRU 淘汰"""
+
+    def __init__(self, maxsize: int = 64, ttl: float | None = 30 * 60) -> None:
+        """
+        初始化结果集缓存
+
+        Args:
+            maxsize: 最多保留的结果集个数
+            ttl: 结果集存活秒数
+        """
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def put(
+        self,
+        source: str,
+        version: int | None,
+        row_ids: np.ndarray,
+        columns: list[str] | None = None,
+        highlighter: Highlighter | None = None,
+    ) -> ResultSet:
+        """保存结果集并分配句柄。"""
+        result = ResultSet(uuid.uuid4().hex, source, version, row_ids, columns, highlighter)
+        self._cache.set(result.result_id, result)
+        return result
+
+    def get(self, result_id: str) -> ResultSet | None:
+        """按句柄读取结果集，不存在或已过期时返回 None。"""
+        return self._cache.get(result_id)
+
+    def discard_source(self, source: str) -> int:
+        """丢弃某个数据源的全部结果集，返回丢弃的个数。"""
+        return self._cache.discard_where(lambda _, result: result.source == source)
+
+    def stats(self) -> dict[str, int]:
+        """获取缓存统计信息。"""
+        return self._cache.stats()
@@ -0,0 +1,81 @@
+"""
+搜索视图
+
+为数据源的文本列物化一份规范化副本，供关键字匹配直接使用，避免每次请求
+都对整列重复执行 fillna / astype(str) / lower 产生大量临时字符串。
+
+规范化规则（关键字与列值使用同一规则）：
+- 空值转为空字符串
+- NFKC 规范化（全角字母、数字、标点转为半角）
+- 转为小写
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_text(value: Any) -> str:
+    """按搜索规则规范化单个值（关键字或单元格）。"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return unicodedata.normalize("NFKC", str(value)).lower()
+
+
+def split_keywords(keywords: Any) -> list[str]:
+    """把关键字输入拆分并规范化为关键字列表。
+
+    字符串按中英文逗号拆分（空白不是分隔符，「发动机 故障」是一个关键字），
+    去除首尾空白与空项；列表则逐项规范化。
+    """
+    if isinstance(keywords, str):
+        keywords = keywords.replace("，", ",")
+        keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+    return [normalize_text(k) for k in keywords]
+
+
+def normalize_series(series: pd.Series) -> np.ndarray:
+    """按搜索规则规范化整列，返回字符串对象数组。"""
+    values = series.fillna("").astype(str).str.normalize("NFKC").str.lower()
+    return values.to_numpy(dtype=object)
+
+
+def contains(values: np.ndarray, pattern: str) -> np.ndarray:
+    """逐个判断规范化后的字符串是否包含子串，返回布尔数组。"""
+    return np.fromiter((pattern in v for v in values), dtype=bool, count=len(values))
+
+
+class SearchView:
+    """数据源文本列的规范化视图，随数据版本构建一次"""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        """
+        构建搜索视图
+
+        Args:
+            df: 数据源完整数据框，只物化其中的文本列
+        """
+        self.columns: dict[str, np.ndarray] = {
+            col: normalize_series(df[col]) for col in df.columns if is_text_column(df[col])
+        }
+
+    def __contains__(self, column: object) -> bool:
+        return column in self.columns
+
+    def values(self, column: str, rows: np.ndarray | None = None) -> np.ndarray:
+        """获取某列（可选部分行）的规范化字符串。"""
+        values = self.columns[column]
+        return values if rows is None else values[rows]
+
+    def contains(self, column: str, pattern: str, rows: np.ndarray | None = None) -> np.ndarray:
+        """判断某列（可选部分行）是否包含子串，返回与行一一对应的布尔数组。"""
+        return contains(self.values(column, rows), pattern)
+
+
+def is_text_column(series: pd.Series) -> bool:
+    """判断列是否为文本列（object 或 string 类型）。"""
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
@@ -0,0 +1,60 @@
+"""
+预计算的默认排序
+
+默认排序按日期列优先级倒序（最新在上）：优先用第一个日期列，该列无效时回退
+到下一个日期列，所有日期都无效的行排在最后。每个数据版本只计算一次合并后的
+排序键和全表行号排列，之后任意结果集的排序都只是对该排列做保序过滤，不再
+解析日期，也不再对结果排序。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from app.utils.top_k import top_k
+
+
+class SortPermutation:
+    """全表行号按默认排序的排列，以及每行在排列中的名次"""
+
+    def __init__(self, keys: Sequence[np.ndarray]) -> None:
+        """
+        计算排序排列
+
+        Args:
+            keys: 按优先级排列的各日期列（datetime64），前一列为 NaT 时回退到后一列
+        """
+        merged = np.array(keys[0], dtype="datetime64[ns]", copy=True)
+        for key in keys[1:]:
+            missing = np.isnat(merged)
+            merged[missing] = key[missing]
+
+        valid = ~np.isnat(merged)
+        valid_rows = np.flatnonzero(valid)
+        # 倒序；日期相同的行保持原始行序，无效日期的行按原始行序排在最后
+        descending = np.argsort(-merged[valid_rows].view(np.int64), kind="stable")
+        self.order = np.concatenate([valid_rows[descending], np.flatnonzero(~valid)])
+        self.rank = np.empty(len(merged), dtype=np.int64)
+        self.rank[self.order] = np.arange(len(merged))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def sort(self, row_ids: np.ndarray) -> np.ndarray:
+        """把结果行号按默认排序重排。
+
+        结果较大时对全表排列做保序过滤（O(n)），较小时按名次排序（O(k log k)）。
+        """
+        row_ids = np.asarray(row_ids)
+        if len(row_ids) * max(int(np.log2(len(row_ids) + 1)), 1) < len(self.order):
+            return row_ids[np.argsort(self.rank[row_ids], kind="stable")]
+        selected = np.zeros(len(self.order), dtype=bool)
+        selected[row_ids] = True
+        return self.order[selected[self.order]]
+
+    def top(self, row_ids: np.ndarray, k: int) -> np.ndarray:
+        """取默认排序下的前 k 个结果行号，只选出前 k 名再排序，不重排全部结果。"""
+        row_ids = np.asarray(row_ids)
+        return row_ids[top_k(self.rank[row_ids], k)]
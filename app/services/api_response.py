@@ -5,7 +5,7 @@ API响应服务
 
 from typing import Any
 
-from flask import jsonify
+from app.utils.fast_json import json_response
 
 
 class ApiResponse:
@@ -32,7 +32,7 @@ class ApiResponse:
         if meta is not None:
             response["meta"] = meta
 
-        return jsonify(response)
+        return json_response(response)
 
     @staticmethod
     def error(message: str = "操作失败", code: int = 400, details: Any = None):
@@ -54,10 +54,10 @@ class ApiResponse:
 
         response: dict[str, Any] = {"status": "error", "error": error_dict}
 
-        return jsonify(response), code
+        return json_response(response, code), code
 
     @staticmethod
-    def paginated(data, page, per_page, total, message="获取数据成功"):
+    def paginated(data, page, per_page, total, message="获取数据成功", extra_meta=None):
         """
         分页响应
 
@@ -67,6 +67,7 @@ class ApiResponse:
             per_page: 每页条数
             total: 总记录数
             message: 成功消息
+            extra_meta: 附加到 meta 中的其他元数据，如结果集句柄
 
         Returns:
             Response: Flask响应对象
@@ -84,6 +85,9 @@ class ApiResponse:
             }
         }
 
+        if extra_meta:
+            meta.update(extra_meta)
+
         return ApiResponse.success(data, message, meta)
 
     @staticmethod
@@ -30,7 +30,11 @@ class SimilarityService:
         self.config = config
 
     def calculate_batch_similarity(
-        self, query_text: str, text_list: list[dict[str, Any]], columns: list[str]
+        self,
+        query_text: str,
+        text_list: list[dict[str, Any]],
+        columns: list[str],
+        limit: int | None = None,
     ) -> list[dict[str, Any]]:
         """
         批量计算一段文本与多段文本的相似度
@@ -39,6 +43,8 @@ class SimilarityService:
             query_text: 查询文本
             text_list: 文本列表
             columns: 要比较的列
+            limit: 只返回相似度最高的前 limit 条（部分选择，不对全部结果排序），
+                None 或非正数表示全部
 
         Returns:
             相似度得分列表
@@ -55,7 +61,9 @@ class SimilarityService:
 
         try:
             # 直接使用 TextSimilarityCalculator 类方法
-            return TextSimilarityCalculator.calculate_similarity(query_text, text_list, columns)
+            return TextSimilarityCalculator.calculate_similarity(
+                query_text, text_list, columns, limit
+            )
         except Exception as e:
             logger.error(f"批量计算相似度时出错: {str(e)}")
             raise ServiceError(f"批量计算相似度失败: {str(e)}")
@@ -92,14 +100,8 @@ class SimilarityService:
             # 转换为字典列表
             results = df.to_dict("records")
 
-            # 计算相似度
-            sorted_results = self.calculate_batch_similarity(search_text, results, columns)
-
-            # 限制结果数量
-            if limit > 0 and len(sorted_results) > limit:
-                sorted_results = sorted_results[:limit]
-
-            return sorted_results
+            # 计算相似度，只选出并排序前 limit 条
+            return self.calculate_batch_similarity(search_text, results, columns, limit)
 
         except ValidationError:
             # 重新抛出验证错误
@@ -73,6 +73,7 @@ const initialState = {
     importDialogVisible: false,
     showResultConfirmDialog: false,
     resultConfirmed: false,
+    pendingSearch: null,  // 等待用户确认后再获取结果行的搜索请求
     importSettings: {
         dataSource: 'case',
         previewData: null,
@@ -1,6 +1,9 @@
 // 关键词高亮相关方法
 // 将表格单元格文本中命中的搜索关键词以不同颜色高亮（多关键词多色）。
 // 关键词来源：this.activeSearchKeywords（computed，收集自所有搜索层级的 keywords）。
+// 搜索请求带 highlight 时，服务端为每行返回命中位置（_highlights：
+// {列名: [起点, 终点, 关键字序号, ...]}），直接按给定区间包裹，不再逐关键字扫描；
+// 行中没有命中位置（如相似度搜索结果）时才在前端扫描。
 const HIGHLIGHT_COLOR_COUNT = 8;
 
 const highlightMethods = {
@@ -20,10 +23,21 @@ const highlightMethods = {
      * 渲染单元格：把命中的关键词包进 <mark> 标签，不同关键词分配不同颜色。
      * 非命中部分仍做 HTML 转义，保证安全。
      * @param {*} value 单元格原始值
+     * @param {Object} [row] 所在行；带服务端命中位置（_highlights）时直接使用
+     * @param {string} [col] 列名
      * @returns {string} 可用于 v-html 的 HTML 字符串
      */
-    highlightCell(value) {
+    highlightCell(value, row, col) {
         const text = (value === null || value === undefined) ? '' : String(value);
+        if (row && Object.prototype.hasOwnProperty.call(row, '_highlights')) {
+            const spans = row._highlights && row._highlights[col];
+            if (!spans) return this.escapeHtml(text);
+            // 命中位置超出文本（如文本在前端被改写过）时不再可信，改为前端扫描
+            if (!spans.length || spans[spans.length - 2] <= text.length) {
+                return this.renderSpans(text, spans);
+            }
+        }
+
         const keywords = this.activeSearchKeywords || [];
         if (!keywords.length) return this.escapeHtml(text);
 
@@ -51,14 +65,26 @@ const highlightMethods = {
             lastEnd = m.end;
         }
 
-        // 拼接 HTML：命中部分用带颜色 class 的 <mark> 包裹，其余部分转义
+        const flat = [];
+        segments.forEach(m => flat.push(m.start, m.end, m.kwIndex));
+        return this.renderSpans(text, flat);
+    },
+
+    /**
+     * 按命中区间拼接 HTML：命中部分用带颜色 class 的 <mark> 包裹，其余部分转义。
+     * @param {string} text 单元格文本
+     * @param {number[]} spans 按起点升序、互不重叠的 [起点, 终点, 关键字序号, ...]
+     * @returns {string} 可用于 v-html 的 HTML 字符串
+     */
+    renderSpans(text, spans) {
         let html = '';
         let cursor = 0;
-        for (const m of segments) {
-            html += this.escapeHtml(text.slice(cursor, m.start));
-            const colorClass = `kw-hl kw-hl-${m.kwIndex % HIGHLIGHT_COLOR_COUNT}`;
-            html += `<mark class="${colorClass}">${this.escapeHtml(text.slice(m.start, m.end))}</mark>`;
-            cursor = m.end;
+        for (let i = 0; i < spans.length; i += 3) {
+            const [start, end, kwIndex] = [spans[i], spans[i + 1], spans[i + 2]];
+            html += this.escapeHtml(text.slice(cursor, start));
+            const colorClass = `kw-hl kw-hl-${kwIndex % HIGHLIGHT_COLOR_COUNT}`;
+            html += `<mark class="${colorClass}">${this.escapeHtml(text.slice(start, end))}</mark>`;
+            cursor = end;
         }
         html += this.escapeHtml(text.slice(cursor));
         return html;
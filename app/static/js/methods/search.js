@@ -121,36 +121,32 @@ const searchMethods = {
                 data_source: this.defaultSearch.dataSource,
                 search_levels: this.searchLevels,
                 data_types: this.defaultSearch.dataTypes,
-                aircraft_types: this.defaultSearch.aircraftTypes
+                aircraft_types: this.defaultSearch.aircraftTypes,
+                facets: ['数据类型']
             };
 
-            // 发送搜索请求
-            const response = await fetch('/api/search', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json'
-                },
-                body: JSON.stringify(searchData)
-            });
-
-            const result = await response.json();
+            // 先只请求总数和分面统计，结果较多时由用户确认后再获取结果行
+            const result = await this.postSearch({ ...searchData, mode: 'count' });
 
             if (result.status === 'success') {
-                // 更新搜索结果
-                this.searchResults = result.data || [];
                 this.total = result.total || 0;
 
+                // 数据类型统计：使用服务端返回的分面统计
+                if (result.facets && result.facets['数据类型']) {
+                    this.applyTypeFacet(result.facets['数据类型'], this.total);
+                }
+
                 // 如果结果数量超过500，显示确认对话框
                 if (this.total > 500) {
+                    this.searchResults = [];
+                    this.pendingSearch = JSON.parse(JSON.stringify(searchData));
                     this.showResultConfirmDialog = true;
                     this.resultConfirmed = false;
                 } else {
                     this.showResultConfirmDialog = false;
                     this.resultConfirmed = true;
+                    await this.loadSearchRows(searchData);
                 }
-
-                // 计算数据类型统计
-                this.calculateTypeStatistics();
             } else {
                 // 处理错误
                 this.$message.error(result.message || '搜索失败');
@@ -184,6 +180,26 @@ const searchMethods = {
         this.typeStatistics = stats;
     },
 
+    // 使用服务端分面统计作为数据类型统计（空值计为「未知」）
+    applyTypeFacet(counts, total) {
+        const stats = {};
+        let known = 0;
+        Object.entries(counts).forEach(([type, count]) => {
+            const key = type || '未知';
+            stats[key] = (stats[key] || 0) + count;
+            if (type) {
+                known += count;
+            }
+        });
+
+        const unknown = total - known - (stats['未知'] || 0);
+        if (unknown > 0) {
+            stats['未知'] = (stats['未知'] || 0) + unknown;
+        }
+
+        this.typeStatistics = stats;
+    },
+
     async handleSimilaritySearch() {
         if (!this.contentSearch.text.trim()) {
             this.$message.warning('请输入要搜索的内容');
@@ -462,15 +478,67 @@ const searchMethods = {
         await this.resetForm();
     },
 
+    // 发送搜索请求并解析响应
+    async postSearch(searchData) {
+        const response = await fetch('/api/search', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify(searchData)
+        });
+        return response.json();
+    },
+
+    // 获取搜索结果行（服务端复用计数时缓存的结果），同时请求各行的关键字命中位置
+    // （_highlights），由 highlightCell 直接按区间渲染
+    async loadSearchRows(searchData) {
+        const result = await this.postSearch({ ...searchData, highlight: true });
+
+        if (result.status === 'success') {
+            this.searchResults = result.data || [];
+            this.total = result.total || 0;
+
+            if (result.facets && result.facets['数据类型']) {
+                this.applyTypeFacet(result.facets['数据类型'], this.total);
+            } else {
+                this.calculateTypeStatistics();
+            }
+        } else {
+            this.$message.error(result.message || '搜索失败');
+            this.searchResults = [];
+            this.total = 0;
+        }
+    },
+
     // 添加处理结果确认的方法
-    handleResultConfirm() {
+    async handleResultConfirm() {
         this.resultConfirmed = true;
         this.showResultConfirmDialog = false;
+
+        if (!this.pendingSearch) {
+            return;
+        }
+        const searchData = this.pendingSearch;
+        this.pendingSearch = null;
+
+        try {
+            this.loading = true;
+            await this.loadSearchRows(searchData);
+        } catch (error) {
+            console.error('获取搜索结果出错:', error);
+            this.$message.error('获取搜索结果出错: ' + error.message);
+            this.searchResults = [];
+            this.total = 0;
+        } finally {
+            this.loading = false;
+        }
     },
 
     handleResultCancel() {
         this.searchResults = [];
         this.total = 0;
+        this.pendingSearch = null;
         this.showResultConfirmDialog = false;
         this.resultConfirmed = false;
     }
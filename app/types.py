@@ -4,10 +4,14 @@
 """
 
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import Flask
 from pandas import DataFrame
 
+from app.core.search.query_cache import QueryCache
+from app.core.search.refinement import RefinementStore
+from app.core.search.result_store import ResultSetStore
 from app.services import (
     CaseService,
     EngineeringService,
@@ -17,6 +21,7 @@ from app.services import (
     WordService,
 )
 from app.services.temp_file_manager import TempFileManager
+from app.utils.compression import PrecompressedAssets
 
 
 class CaseFlask(Flask):
@@ -27,6 +32,11 @@ class CaseFlask(Flask):
     # 服务管理器
     temp_manager: TempFileManager
     word_manager: WordService
+    search_results: ResultSetStore
+    query_cache: QueryCache
+    search_refinements: RefinementStore
+    vendor_assets: PrecompressedAssets
+    federated_executor: ThreadPoolExecutor
 
     # 数据服务
     case_service: CaseService
@@ -0,0 +1,196 @@
+"""
+HTTP 响应压缩
+
+搜索、相似度接口返回的结果多为高度重复的中文文本，压缩率通常在 5~10 倍。
+这里按请求的 Accept-Encoding 协商压缩算法：gzip 总是可用，brotli（br）与
+zstd 在安装了对应的可选依赖（brotli、zstandard）时启用，同等权重下按
+br > zstd > gzip 的顺序优先。
+
+- 普通响应整体压缩一次；
+- 流式响应逐块压缩，每块之后做一次同步刷新，客户端可以边收边解压；
+- 第三方静态资源（static/vendor）在首次被请求时按每种算法预压缩一次，并带强
+  ETag；压缩结果在进程内按文件缓存（文件修改后重新压缩），之后的请求和再次
+  创建的应用只做协商和条件请求判断，不再重复压缩。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mimetypes
+import os
+import zlib
+from collections.abc import Iterable, Iterator
+
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 为可选依赖
+    brotli = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard 为可选依赖
+    zstandard = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# 动态压缩使用较快的级别；预压缩只做一次，使用最高级别
+_LEVELS = {"br": 5, "zstd": 3, "gzip": 6}
+_MAX_LEVELS = {"br": 11, "zstd": 19, "gzip": 9}
+
+# 进程内共享的预压缩资源，键为 (文件绝对路径, 压缩算法)。并发的首次请求可能
+# 重复压缩同一文件，结果相同，后写入的覆盖先写入的即可，因此不加锁
+_asset_cache: dict[tuple[str, tuple[str, ...]], PrecompressedAsset] = {}
+
+
+def available_encodings() -> list[str]:
+    """按服务端优先顺序返回当前可用的压缩算法。"""
+    encodings = []
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate(accept_encoding: str | None, encodings: Iterable[str] | None = None) -> str | None:
+    """按 Accept-Encoding 选择压缩算法。
+
+    取客户端权重（q 值）最高的算法，权重相同时按服务端优先顺序；客户端不接受
+    任何可用算法时返回 None（不压缩）。
+
+    Args:
+        accept_encoding: 请求头 Accept-Encoding 的值
+        encodings: 可选的算法（按服务端优先顺序），None 表示全部可用算法
+    """
+    if not accept_encoding:
+        return None
+    encodings = list(encodings) if encodings is not None else available_encodings()
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    """用指定算法压缩整段数据。"""
+    level = _LEVELS[encoding] if level is None else level
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31：gzip 格式
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """逐块压缩流式响应，每块之后同步刷新，保证已生成的内容能及时送达客户端。"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=_LEVELS["br"])
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    elif encoding == "zstd":
+        stream = zstandard.ZstdCompressor(level=_LEVELS["zstd"]).compressobj()
+        for chunk in chunks:
+            data = stream.compress(chunk) + stream.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            if data:
+                yield data
+        yield stream.flush()
+    else:
+        compressor = zlib.compressobj(_LEVELS["gzip"], zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class PrecompressedAsset:
+    """单个静态资源的原文、各算法压缩结果与强 ETag"""
+
+    def __init__(self, path: str, encodings: Iterable[str]) -> None:
+        stat = os.stat(path)
+        # 文件的修改时间与大小，用于判断缓存的压缩结果是否过期
+        self.stamp = (stat.st_mtime_ns, stat.st_size)
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.etag = hashlib.sha256(self.data).hexdigest()[:32]
+        # 只保留确实变小的压缩结果
+        self.variants = {}
+        for encoding in encodings:
+            compressed = compress(self.data, encoding, _MAX_LEVELS[encoding])
+            if len(compressed) < len(self.data):
+                self.variants[encoding] = compressed
+
+    def variant(self, accept_encoding: str | None) -> tuple[str | None, bytes, str]:
+        """按 Accept-Encoding 选择返回的版本。
+
+        Returns:
+            (压缩算法或 None, 响应内容, 该版本的 ETag)
+        """
+        encoding = negotiate(accept_encoding, self.variants)
+        if encoding is None:
+            return None, self.data, self.etag
+        return encoding, self.variants[encoding], f"{self.etag}-{encoding}"
+
+
+class PrecompressedAssets:
+    """按需预压缩的静态资源目录：每个文件在首次请求时压缩，结果在进程内缓存"""
+
+    def __init__(self, directory: str, encodings: Iterable[str] | None = None) -> None:
+        """
+        创建静态资源目录（不在此时读取或压缩文件）
+
+        Args:
+            directory: 静态资源目录
+            encodings: 预压缩使用的算法，None 表示全部可用算法
+        """
+        self.directory = os.path.abspath(directory)
+        self.encodings = tuple(encodings) if encodings is not None else tuple(available_encodings())
+
+    def get(self, filename: str) -> PrecompressedAsset | None:
+        """按相对路径获取预压缩资源，不存在（或路径越出目录）时返回 None。
+
+        文件自上次压缩后修改过（修改时间或大小变化）时重新压缩。
+        """
+        path = safe_join(self.directory, filename)
+        if path is None or not os.path.isfile(path):
+            return None
+        key = (path, self.encodings)
+        asset = _asset_cache.get(key)
+        try:
+            stat = os.stat(path)
+            if asset is None or asset.stamp != (stat.st_mtime_ns, stat.st_size):
+                asset = PrecompressedAsset(path, self.encodings)
+                _asset_cache[key] = asset
+                logger.info(f"已预压缩静态资源 {filename}，算法: {', '.join(self.encodings)}")
+        except OSError as e:
+            logger.warning(f"预压缩静态资源 {path} 失败: {str(e)}")
+            return None
+        return asset
@@ -0,0 +1,170 @@
+"""
+快速 JSON 序列化
+
+搜索、相似度等接口一次可能返回上万行结果。原先的做法是先 df.replace({np.nan: None})
+复制整个结果数据框，再 to_dict("records") 逐格构造字典，然后循环补「序号」，最后交给
+jsonify 用标准库逐个对象编码。结果集较大时，这几步占了响应时间的大头。
+
+这里按列处理结果数据框：
+- 每列一次性转换为 Python 列表，并把缺失值（NaN/NaT/None/pd.NA）置为 None；
+- 「序号」、行标识等附加字段作为额外的列生成；
+- 编码优先使用 orjson（可选依赖，未安装时退回标准库 json），直接输出 UTF-8 JSON
+  字节串，NaN 编码为 null。其他类型（日期等）的编码方式与 jsonify 一致。
+
+支持两种结果格式：
+- records（默认）：[{列名: 值, ...}, ...]
+- columnar：{"columns": [列名, ...], "rows": [[值, ...], ...]}，不重复列名，体积更小
+
+流式响应使用 NDJSON：第一行是头信息（总数、列名等），之后每行一条结果，
+结果由生成器按块产生，首行很快送达，内存占用与结果总数无关。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from flask import current_app, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# 结果格式
+RECORDS = "records"
+COLUMNAR = "columnar"
+RESULT_FORMATS = (RECORDS, COLUMNAR)
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def parse_result_format(value: Any) -> str:
+    """解析结果格式参数（None 表示 records）。
+
+    Raises:
+        ValueError: 不支持的结果格式
+    """
+    if value is None or value == "":
+        return RECORDS
+    if value not in RESULT_FORMATS:
+        raise ValueError(f"无效的结果格式: {value}，可选值: {', '.join(RESULT_FORMATS)}")
+    return value
+
+
+def column_values(series: pd.Series) -> list:
+    """把一列转换为 Python 列表，缺失值为 None。"""
+    values = series.to_numpy(dtype=object, copy=True)
+    missing = pd.isna(values)
+    if missing.any():
+        values[missing] = None
+    return values.tolist()
+
+
+def frame_payload(
+    frame: pd.DataFrame,
+    result_format: str = RECORDS,
+    extra_columns: Mapping[str, Iterable[Any]] | None = None,
+) -> list[dict] | dict[str, list]:
+    """按列把结果数据框转换为可直接编码的结果。
+
+    Args:
+        frame: 结果数据框
+        result_format: 结果格式，records 或 columnar
+        extra_columns: 追加在末尾的附加列（如「序号」），与数据框同名的列被覆盖
+
+    Returns:
+        records 格式为字典列表；columnar 格式为 {"columns": [...], "rows": [[...], ...]}
+    """
+    extra_columns = extra_columns or {}
+    names = [name for name in frame.columns if name not in extra_columns]
+    columns: list[Iterable[Any]] = [
+        column_values(frame.iloc[:, i])
+        for i, name in enumerate(frame.columns)
+        if name not in extra_columns
+    ]
+    names += list(extra_columns)
+    columns += list(extra_columns.values())
+
+    rows: Iterable[tuple] = zip(*columns, strict=True) if columns else [()] * len(frame)
+    if result_format == COLUMNAR:
+        return {"columns": names, "rows": [list(row) for row in rows]}
+    return [dict(zip(names, row, strict=True)) for row in rows]
+
+
+def records_payload(records: list[dict], result_format: str = RECORDS) -> list[dict] | dict:
+    """把字典列表转换为指定的结果格式（columnar 的列按各记录中首次出现的顺序）。"""
+    if result_format != COLUMNAR:
+        return records
+    names = list(dict.fromkeys(name for record in records for name in record))
+    return {"columns": names, "rows": [[record.get(name) for name in names] for record in records]}
+
+
+def _default(value: Any) -> Any:
+    """编码 JSON 原生类型以外的值：numpy 标量转为 Python 值，其余与 jsonify 一致。"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return DefaultJSONProvider.default(value)
+
+
+def _replace_nan(value: Any) -> Any:
+    """把 NaN/Infinity 替换为 None（标准库 json 会输出非法的 NaN 字面量）。"""
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, dict):
+        return {key: _replace_nan(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_nan(item) for item in value]
+    return value
+
+
+def dumps(obj: Any) -> bytes:
+    """把对象编码为 UTF-8 JSON 字节串（NaN/Infinity 编码为 null）。"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(
+        _replace_nan(obj), ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def json_response(payload: Any, status: int = 200):
+    """用快速编码构造 JSON 响应，替代 jsonify。"""
+    return current_app.response_class(dumps(payload), status=status, mimetype="application/json")
+
+
+def ndjson_lines(header: Any, chunks: Iterable[list]) -> Iterator[bytes]:
+    """生成 NDJSON：先输出头信息一行，再逐块输出结果（每条一行）。
+
+    生成结果块时出错会输出一行 {"status": "error", "message": ...} 后结束。
+    """
+    yield dumps(header) + b"\n"
+    try:
+        for rows in chunks:
+            if rows:
+                yield b"".join(dumps(row) + b"\n" for row in rows)
+    except Exception as e:
+        logger.error(f"流式输出结果时出错: {str(e)}")
+        yield dumps({"status": "error", "message": str(e)}) + b"\n"
+
+
+def ndjson_response(header: Any, chunks: Iterable[list]):
+    """构造 NDJSON 流式响应。"""
+    return current_app.response_class(
+        stream_with_context(ndjson_lines(header, chunks)), mimetype=NDJSON_MIMETYPE
+    )
@@ -0,0 +1,47 @@
+"""
+Top-K 部分选择
+
+只返回前若干条结果（相似度搜索的 limit、分页的第一页、联合搜索的 top）时，
+不必对全部候选排序：先用 argpartition 按主排序键 O(n) 选出前 k 名（连同与
+第 k 名并列的行），再只对这些候选做稳定排序。
+
+排序键均按升序比较（降序请传入取负后的键），相同键的行按下标升序，与
+np.lexsort / 稳定排序对全部候选排序后取前 k 条的结果一致。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def top_k(keys: np.ndarray | Sequence[np.ndarray], k: int | None = None) -> np.ndarray:
+    """按排序键选出前 k 名的下标（已排好序）。
+
+    Args:
+        keys: 数值排序键，或按优先级排列的多个排序键（第一个为主键）；
+            不能包含 NaN，缺失值请由调用方映射为最大值
+        k: 选取的数量，None 表示全部（退化为完整的稳定排序）
+
+    Returns:
+        前 k 名的下标数组，按排序键升序、并列时按下标升序
+    """
+    if isinstance(keys, np.ndarray):
+        keys = [keys]
+    keys = [np.asarray(key) for key in keys]
+    size = len(keys[0])
+
+    if k is not None and k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k is None or k >= size:
+        candidates = np.arange(size)
+    else:
+        primary = keys[0]
+        threshold = primary[np.argpartition(primary, k - 1)[k - 1]]
+        # 与第 k 名主键相同的行都作为候选，保证并列时仍按次要键与下标取舍
+        candidates = np.flatnonzero(primary <= threshold)
+
+    # np.lexsort 以最后一个键为主键且是稳定排序：候选按下标升序传入，并列时保持下标顺序
+    order = np.lexsort([key[candidates] for key in reversed(keys)])
+    return candidates[order][:k]
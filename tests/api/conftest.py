@@ -0,0 +1,43 @@
+"""
+API 测试共享夹具
+
+提供 /api/search 测试共用的示例数据与请求方法
+"""
+
+from collections.abc import Callable
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def faults_df() -> Callable[..., pd.DataFrame]:
+    """故障报告示例数据工厂：按行数生成日期、问题描述（发动机故障与液压泄漏交替）和机型列"""
+
+    def make(rows: int = 25) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "日期": [f"2024-01-{i + 1:02d}" for i in range(rows)],
+                "问题描述": [
+                    f"发动机故障{i}" if i % 2 == 0 else f"液压泄漏{i}" for i in range(rows)
+                ],
+                "机型": ["ARJ21"] * rows,
+            }
+        )
+
+    return make
+
+
+@pytest.fixture
+def search(client) -> Callable[..., object]:
+    """在 faults 数据源的问题描述列中搜索「发动机」，关键字参数覆盖或追加请求字段"""
+
+    def post(**extra):
+        body = {
+            "data_source": "faults",
+            "search_levels": [{"keywords": "发动机", "column_name": ["问题描述"]}],
+            **extra,
+        }
+        return client.post("/api/search", json=body)
+
+    return post
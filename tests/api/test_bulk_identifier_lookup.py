@@ -0,0 +1,110 @@
+"""/api/search/identifiers 批量标识符查找的测试。"""
+
+import io
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+
+def _data_sources():
+    return {
+        "faults": pd.DataFrame(
+            {
+                "问题描述": ["更换泵", "更换阀门", "更换作动筒"],
+                "拆卸部件件号": ["AB-123", "CD-456", "无"],
+                "装上部件件号": ["AB123", "无", "ab 123"],
+                "飞机序列号": ["00123", "10001", "00123"],
+            }
+        ),
+        "case": pd.DataFrame(
+            {
+                "问题描述": ["泵渗漏", "APU 故障"],
+                "机号/MSN": ["10001", "B-652G"],
+            }
+        ),
+    }
+
+
+def _lookup(client, flask_app, frames=None, **body):
+    frames = frames if frames is not None else _data_sources()
+    body.setdefault("sources", list(frames))
+    with patch.object(flask_app, "load_data_source", side_effect=frames.get):
+        return client.post("/api/search/identifiers", json=body)
+
+
+@pytest.mark.api
+class TestBulkIdentifierLookup:
+    def test_per_key_counts_and_row_ids(self, client, flask_app):
+        data = _lookup(client, flask_app, values=["ab-123", "10001", "ZZ-1"]).get_json()
+
+        assert data["status"] == "success"
+        assert (data["total"], data["matched"]) == (3, 2)
+        first, second, third = data["data"]
+        # 同一行在多列命中只计一次
+        assert first["sources"]["faults"]["columns"] == {"拆卸部件件号": 1, "装上部件件号": 2}
+        assert first["sources"]["faults"]["total"] == 2
+        assert first["total"] == 2
+        assert set(second["sources"]) == {"faults", "case"}
+        assert third == {"key": "ZZ-1", "total": 0, "sources": {}}
+
+    def test_msn_column_uses_import_rule(self, client, flask_app):
+        data = _lookup(client, flask_app, values=["123"], columns=["飞机序列号"]).get_json()
+
+        assert data["data"][0]["sources"]["faults"]["columns"] == {"飞机序列号": 2}
+        assert data["sources"]["case"] == {"status": "success", "columns": []}
+
+    def test_row_ids_fetch_records(self, client, flask_app):
+        frames = _data_sources()
+        data = _lookup(client, flask_app, frames, values="B652G").get_json()
+        row_id = data["data"][0]["sources"]["case"]["row_ids"][0]
+        with patch.object(flask_app, "load_data_source", side_effect=frames.get):
+            detail = client.get(f"/api/search/rows/case/{row_id}").get_json()
+
+        assert detail["data"]["问题描述"] == "APU 故障"
+
+    def test_stream(self, client, flask_app):
+        response = _lookup(client, flask_app, values=["AB123", "CD456"], stream=True)
+
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert response.mimetype == "application/x-ndjson"
+        assert lines[0]["matched"] == 2
+        assert [line["key"] for line in lines[1:]] == ["AB123", "CD456"]
+
+    def test_csv_upload(self, client, flask_app):
+        csv = "序号,件号\n1,AB-123\n2,CD 456\n3,AB-123\n".encode()
+        frames = _data_sources()
+        with patch.object(flask_app, "load_data_source", side_effect=frames.get):
+            response = client.post(
+                "/api/search/identifiers",
+                data={"file": (io.BytesIO(csv), "keys.csv"), "column": "件号", "sources": "faults"},
+                content_type="multipart/form-data",
+            )
+
+        data = response.get_json()
+        assert [item["key"] for item in data["data"]] == ["AB-123", "CD 456"]
+        assert data["matched"] == 2
+
+    def test_missing_source_reported(self, client, flask_app):
+        frames = {**_data_sources(), "r_and_i_record": None}
+        data = _lookup(client, flask_app, frames, values=["AB123"]).get_json()
+
+        assert data["sources"]["r_and_i_record"]["status"] == "error"
+        assert data["matched"] == 1
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"values": []},
+            {"values": ["a"], "columns": ["问题描述"]},
+            {"values": ["a"], "sources": ["x"]},
+        ],
+    )
+    def test_invalid_request_rejected(self, client, flask_app, body):
+        assert _lookup(client, flask_app, **body).status_code == 400
+
+    def test_key_limit(self, client, flask_app):
+        flask_app.config["SEARCH_BULK_MAX_KEYS"] = 2
+
+        assert _lookup(client, flask_app, values=["a", "b", "c"]).status_code == 400
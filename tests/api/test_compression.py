@@ -0,0 +1,99 @@
+"""响应压缩与预压缩静态资源的接口测试。"""
+
+import gzip
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+
+def _faults_df(rows: int = 200) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "问题描述": [f"发动机故障，更换燃油泵{i}" for i in range(rows)],
+            "机型": ["ARJ21"] * rows,
+        }
+    )
+
+
+def _search(client, headers=None):
+    body = {
+        "data_source": "faults",
+        "search_levels": [{"keywords": "发动机", "column_name": ["问题描述"]}],
+    }
+    return client.post("/api/search", json=body, headers=headers or {})
+
+
+@pytest.mark.api
+class TestResponseCompression:
+    def test_gzip_when_accepted(self, client, flask_app):
+        with patch.object(flask_app, "load_data_source", return_value=_faults_df()):
+            plain = _search(client)
+            compressed = _search(client, {"Accept-Encoding": "gzip"})
+
+        assert plain.headers.get("Content-Encoding") is None
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["Vary"]
+        assert len(compressed.data) < len(plain.data) / 5
+        assert gzip.decompress(compressed.data) == plain.data
+
+    def test_stream_compressed_incrementally(self, client, flask_app):
+        flask_app.config["SEARCH_STREAM_CHUNK_ROWS"] = 50
+        with patch.object(flask_app, "load_data_source", return_value=_faults_df()):
+            plain = client.post(
+                "/api/search",
+                json={"data_source": "faults", "search_levels": [], "stream": True},
+            )
+            compressed = client.post(
+                "/api/search",
+                json={"data_source": "faults", "search_levels": [], "stream": True},
+                headers={"Accept-Encoding": "gzip"},
+            )
+
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in compressed.headers
+        assert gzip.decompress(compressed.data) == plain.data
+
+    def test_small_responses_not_compressed(self, client):
+        response = client.get("/api/search/cache_stats", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers.get("Content-Encoding") is None
+
+    def test_disabled_by_config(self, client, flask_app):
+        flask_app.config["COMPRESS_ENABLED"] = False
+        with patch.object(flask_app, "load_data_source", return_value=_faults_df()):
+            response = _search(client, {"Accept-Encoding": "gzip"})
+
+        assert response.headers.get("Content-Encoding") is None
+
+
+@pytest.mark.api
+class TestVendorAssets:
+    def test_precompressed_with_strong_etag(self, client, flask_app):
+        asset = flask_app.vendor_assets.get("vue.min.js")
+        assert asset is not None
+
+        response = client.get("/static/vendor/vue.min.js", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["ETag"] == f'"{asset.etag}-gzip"'
+        assert "max-age=31536000" in response.headers["Cache-Control"]
+        assert gzip.decompress(response.data) == asset.data
+
+    def test_not_modified(self, client):
+        first = client.get("/static/vendor/vue.min.js", headers={"Accept-Encoding": "gzip"})
+
+        response = client.get(
+            "/static/vendor/vue.min.js",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]},
+        )
+
+        assert response.status_code == 304
+
+    def test_identity_and_missing(self, client):
+        response = client.get("/static/vendor/vue.min.js")
+
+        assert response.headers.get("Content-Encoding") is None
+        assert response.data.startswith(b"/*")
+        assert client.get("/static/vendor/missing.js").status_code == 404
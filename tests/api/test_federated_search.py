@@ -0,0 +1,118 @@
+"""/api/search/federated 跨数据源联合搜索的测试。"""
+
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.core.search.index import SearchIndex
+
+
+def _data_sources():
+    return {
+        "case": pd.DataFrame(
+            {
+                "申请时间": ["2024-03-01", "2024-01-01", "2024-05-01"],
+                "问题描述": ["发动机喘振", "发动机滑油", "液压泄漏"],
+                "机型": ["ARJ21", "C919", "ARJ21"],
+                "ATA": ["72-00-00", "79-00-00", "29-11-00"],
+            }
+        ),
+        "faults": pd.DataFrame(
+            {
+                "日期": ["2024-02-01", "2024-04-01"],
+                "问题描述": ["发动机告警", "APU 故障"],
+                "机型": ["C919", "ARJ21"],
+            }
+        ),
+    }
+
+
+def _federated(client, flask_app, sources=None, **body):
+    frames = sources if sources is not None else _data_sources()
+    with patch.object(flask_app, "load_data_source", side_effect=frames.get):
+        return client.post("/api/search/federated", json={"sources": list(frames), **body})
+
+
+@pytest.mark.api
+class TestFederatedSearch:
+    def test_per_source_totals_and_merged_rows(self, client, flask_app):
+        response = _federated(client, flask_app, query="发动机")
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data["total"] == 3
+        assert data["sources"] == {
+            "case": {"status": "success", "total": 2},
+            "faults": {"status": "success", "total": 1},
+        }
+        # 合并后按日期倒序
+        assert [(row["source"], row["date"]) for row in data["data"]] == [
+            ("case", "2024-03-01"),
+            ("faults", "2024-02-01"),
+            ("case", "2024-01-01"),
+        ]
+        assert set(data["data"][0]) == {"source", "date", "description", "_row_id"}
+
+    def test_top_limits_rows_per_source(self, client, flask_app):
+        data = _federated(client, flask_app, query="发动机", top=1).get_json()
+
+        assert [row["description"] for row in data["data"]] == ["发动机喘振", "发动机告警"]
+        assert data["sources"]["case"]["total"] == 2
+
+    def test_facets_skip_missing_columns(self, client, flask_app):
+        data = _federated(client, flask_app, query="发动机", facets=["机型", "ATA章节"]).get_json()
+
+        assert data["sources"]["case"]["facets"] == {
+            "机型": {"ARJ21": 1, "C919": 1},
+            "ATA章节": {"72": 1, "79": 1},
+        }
+        assert data["sources"]["faults"]["facets"] == {"机型": {"C919": 1}}
+
+    def test_source_errors_do_not_fail_request(self, client, flask_app):
+        frames = {**_data_sources(), "manual": None}
+        data = _federated(client, flask_app, frames, query="ATA:72*").get_json()
+
+        assert data["sources"]["case"] == {"status": "success", "total": 1}
+        # faults 没有 ATA 列，manual 数据文件不存在
+        assert data["sources"]["faults"]["status"] == "error"
+        assert data["sources"]["manual"]["status"] == "error"
+        assert data["total"] == 1
+
+    def test_row_id_fetches_full_record(self, client, flask_app):
+        frames = _data_sources()
+        data = _federated(client, flask_app, frames, query="apu").get_json()
+        row = data["data"][0]
+        with patch.object(flask_app, "load_data_source", side_effect=frames.get):
+            detail = client.get(f"/api/search/rows/{row['source']}/{row['_row_id']}")
+
+        assert detail.get_json()["data"]["问题描述"] == "APU 故障"
+
+    @pytest.mark.parametrize(
+        "body",
+        [{}, {"query": "(发动机"}, {"query": "发动机", "top": -1}],
+    )
+    def test_invalid_request_rejected(self, client, flask_app, body):
+        assert _federated(client, flask_app, **body).status_code == 400
+
+    def test_unknown_source_rejected(self, client, flask_app):
+        response = _federated(client, flask_app, {"unknown": None}, query="发动机")
+
+        assert response.status_code == 400
+
+    def test_cold_sources_build_indexes_concurrently(self, client, flask_app):
+        # 两个数据源的索引构建必须同时进行才能都通过屏障，串行构建会超时
+        barrier = threading.Barrier(2, timeout=5)
+        original_init = SearchIndex.__init__
+
+        def init(self, *args, **kwargs):
+            barrier.wait()
+            original_init(self, *args, **kwargs)
+
+        with patch.object(SearchIndex, "__init__", init):
+            data = _federated(client, flask_app, query="发动机").get_json()
+
+        assert not barrier.broken
+        assert data["sources"]["case"] == {"status": "success", "total": 2}
+        assert data["sources"]["faults"] == {"status": "success", "total": 1}
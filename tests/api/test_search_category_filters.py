@@ -0,0 +1,42 @@
+"""/api/search 机型、数据类型筛选的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchCategoryFilters:
+    def _df(self, faults_df):
+        df = faults_df(10)
+        df["机型"] = ["ARJ21", "C919"] * 5
+        df["数据类型"] = ["故障", "故障", "手册", "手册", "故障"] * 2
+        return df
+
+    def test_data_types_honored(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search(search_levels=[], data_types=["手册"]).get_json()
+
+        assert data["total"] == 4
+        assert {row["数据类型"] for row in data["data"]} == {"手册"}
+
+    def test_aircraft_and_data_types_intersect(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search(search_levels=[], aircraft_types=["C919"], data_types=["故障"]).get_json()
+
+        assert data["total"] == 3
+        assert {(row["机型"], row["数据类型"]) for row in data["data"]} == {("C919", "故障")}
+
+    def test_data_types_part_of_cache_key(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            manuals = search(search_levels=[], data_types=["手册"]).get_json()
+            faults = search(search_levels=[], data_types=["故障"]).get_json()
+
+        assert manuals["total"] == 4
+        assert faults["total"] == 6
+
+    def test_data_types_ignored_without_column(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search(data_types=["手册"]).get_json()
+
+        assert data["total"] == 13
@@ -0,0 +1,74 @@
+"""/api/search 列投影与行详情接口的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchColumnProjection:
+    def _df(self, faults_df):
+        df = faults_df(10)
+        df["原文文本"] = ["很长的原文" * 10] * 10
+        return df
+
+    def test_explicit_columns(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search(columns=["问题描述", "机型"]).get_json()
+
+        assert data["total"] == 5
+        assert set(data["data"][0]) == {"问题描述", "机型", "序号", "_row_id"}
+
+    def test_visible_columns(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search(columns=True).get_json()
+
+        # faults 可见列中数据源存在的列
+        assert set(data["data"][0]) == {"日期", "问题描述", "序号", "_row_id"}
+
+    def test_without_columns_returns_full_records(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search().get_json()
+
+        assert "原文文本" in data["data"][0]
+        assert "_row_id" not in data["data"][0]
+
+    def test_invalid_column_rejected(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            response = search(columns=["不存在的列"])
+
+        assert response.status_code == 400
+
+    def test_pages_keep_projection(self, client, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            first = search(columns="问题描述", page_size=2).get_json()
+            result_id = first["meta"]["result_id"]
+            second = client.get(f"/api/search/results/{result_id}?page=2&page_size=2").get_json()
+
+        assert set(second["data"][0]) == {"问题描述", "序号", "_row_id"}
+
+    def test_row_detail_returns_full_record(self, client, flask_app, faults_df, search):
+        df = self._df(faults_df)
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            data = search(columns=["问题描述"]).get_json()
+            row = data["data"][1]
+            detail = client.get(f"/api/search/rows/faults/{row['_row_id']}").get_json()
+
+        assert detail["status"] == "success"
+        assert detail["data"]["问题描述"] == row["问题描述"]
+        assert detail["data"]["原文文本"] == df["原文文本"].iloc[0]
+        assert detail["data"]["_row_id"] == row["_row_id"]
+
+    def test_row_detail_stale_version(self, client, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            row_id = search(columns=["问题描述"]).get_json()["data"][0]["_row_id"]
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            response = client.get(f"/api/search/rows/faults/{row_id}")
+
+        assert response.status_code == 410
+
+    def test_row_detail_invalid(self, client, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            assert client.get("/api/search/rows/faults/abc").status_code == 400
+            assert client.get("/api/search/rows/faults/999").status_code == 404
+            assert client.get("/api/search/rows/unknown/1").status_code == 400
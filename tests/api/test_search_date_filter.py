@@ -0,0 +1,52 @@
+"""/api/search 日期范围筛选的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchDateFilter:
+    def test_date_range(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search(search_levels=[], date_from="2024-01-05", date_to="2024-01-09").get_json()
+
+        assert data["total"] == 5
+        assert sorted(row["日期"] for row in data["data"]) == [
+            f"2024-01-{d:02d}" for d in range(5, 10)
+        ]
+
+    def test_date_range_combined_with_levels(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search(date_from="2024-01-20").get_json()
+
+        # 20 日及以后、问题描述含「发动机」（偶数行）的记录
+        assert data["total"] == 3
+
+    def test_month_precision_date_to(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search(search_levels=[], date_to="2024-01").get_json()
+
+        assert data["total"] == 25
+
+    def test_invalid_date_returns_400(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            response = search(date_from="昨天")
+            reversed_range = search(date_from="2024-02", date_to="2024-01")
+
+        assert response.status_code == 400
+        assert reversed_range.status_code == 400
+
+    def test_invalid_date_column_returns_400(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            response = search(date_from="2024-01-01", date_column="问题描述")
+
+        assert response.status_code == 400
+
+    def test_date_filter_is_part_of_cache_key(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            everything = search().get_json()
+            filtered = search(date_from="2024-01-20").get_json()
+
+        assert everything["total"] == 13
+        assert filtered["total"] == 3
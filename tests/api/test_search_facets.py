@@ -0,0 +1,57 @@
+"""/api/search 分面统计的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchFacets:
+    def _df(self, faults_df):
+        df = faults_df(10)
+        df["机型"] = ["ARJ21", "C919"] * 5
+        df["数据类型"] = ["故障", "故障", "手册", "手册", "故障"] * 2
+        df["ATA"] = ["21-51", "32-11", "21-00", "", "32"] * 2
+        return df
+
+    def test_default_facets(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search(facets=True).get_json()
+
+        assert data["total"] == 5
+        assert data["facets"]["机型"] == {"ARJ21": 5}
+        assert data["facets"]["数据类型"] == {"故障": 3, "手册": 2}
+        assert data["facets"]["ATA章节"] == {"21": 2, "32": 2}
+        assert "运营人" not in data["facets"]
+
+    def test_explicit_facets_in_paginated_meta(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search(facets="数据类型", page_size=2).get_json()
+
+        assert data["meta"]["facets"] == {"数据类型": {"故障": 3, "手册": 2}}
+
+    def test_facets_cover_filtered_rows(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search(search_levels=[], data_types=["手册"], facets=["机型"]).get_json()
+
+        assert data["facets"] == {"机型": {"C919": 2, "ARJ21": 2}}
+
+    def test_missing_facet_column_skipped(self, flask_app, faults_df, search):
+        df = self._df(faults_df).drop(columns=["数据类型"])
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            response = search(facets=["数据类型", "机型"])
+
+        assert response.status_code == 200
+        assert response.get_json()["facets"] == {"机型": {"ARJ21": 5}}
+
+    def test_invalid_facets_rejected(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            response = search(facets=5)
+
+        assert response.status_code == 400
+
+    def test_without_facets_unchanged(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=self._df(faults_df)):
+            data = search().get_json()
+
+        assert "facets" not in data
@@ -0,0 +1,60 @@
+"""/api/search 结果高亮（关键字命中位置）的测试。"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchHighlight:
+    _LEVELS = [
+        {"keywords": "发动机,故障", "column_name": ["问题描述"]},
+        {"keywords": "3", "column_name": ["问题描述"], "negative_filtering": True},
+        {"keywords": "2024-1", "column_name": ["日期"]},
+    ]
+
+    def test_rows_carry_match_spans(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df(6)):
+            data = search(search_levels=self._LEVELS, highlight=True).get_json()
+
+        # 反向过滤的关键字不高亮；日期列的年月关键字按补零后的子串匹配
+        assert data["highlight"] == {"keywords": ["发动机", "故障", "2024-1"]}
+        row = data["data"][0]
+        assert row["问题描述"] == "发动机故障0"
+        assert row["_highlights"] == {"问题描述": [0, 3, 0, 3, 5, 1], "日期": [0, 7, 2]}
+
+    def test_pages_and_stream_keep_highlights(self, client, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            first = search(page_size=5, highlight=True).get_json()
+            result_id = first["meta"]["result_id"]
+            page = client.get(f"/api/search/results/{result_id}?page=2&page_size=5").get_json()
+            response = search(stream=True, highlight=True)
+
+        assert first["meta"]["highlight"] == {"keywords": ["发动机"]}
+        assert page["data"][0]["_highlights"] == {"问题描述": [0, 3, 0]}
+        header, first_row = (json.loads(line) for line in response.data.splitlines()[:2])
+        assert header["columns"][-1] == "_highlights"
+        assert first_row["_highlights"] == {"问题描述": [0, 3, 0]}
+
+    def test_without_highlight_unchanged(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search().get_json()
+
+        assert "highlight" not in data
+        assert "_highlights" not in data["data"][0]
+
+    def test_anonymize_drops_stale_highlights(self, client):
+        rows = [
+            {
+                "问题描述": "张三报告发动机故障",
+                "机型": "ARJ21",
+                "_highlights": {"问题描述": [4, 7, 0], "机型": [0, 3, 1]},
+            }
+        ]
+        with patch(
+            "app.services.AnonymizationService.anonymize_text", return_value="**报告发动机故障"
+        ):
+            response = client.post("/api/anonymize", json={"results": rows, "fields": ["问题描述"]})
+
+        assert response.get_json()["data"][0]["_highlights"] == {"机型": [0, 3, 1]}
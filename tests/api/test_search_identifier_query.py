@@ -0,0 +1,34 @@
+"""/api/search 标识符字段精确查询的测试。"""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+
+@pytest.mark.api
+class TestSearchIdentifierQuery:
+    def _df(self):
+        return pd.DataFrame(
+            {
+                "日期": ["2024-01-01", "2024-01-02", "2024-01-03"],
+                "问题描述": ["更换泵", "更换阀门", "更换作动筒"],
+                "拆卸部件件号": ["AB-123", "AB1234", "ab 123"],
+                "飞机序列号": ["00123", "10001", "00124"],
+            }
+        )
+
+    def _total(self, client, flask_app, query):
+        with patch.object(flask_app, "load_data_source", return_value=self._df()):
+            response = client.post(
+                "/api/search", json={"data_source": "faults", "search_levels": [], "query": query}
+            )
+        return response.get_json()["total"]
+
+    def test_identifier_fields_match_exactly(self, client, flask_app):
+        assert self._total(client, flask_app, "拆卸部件件号:ab123") == 2
+        assert self._total(client, flask_app, "飞机序列号:123") == 1
+
+    def test_identifier_prefix(self, client, flask_app):
+        assert self._total(client, flask_app, "拆卸部件件号:AB-12*") == 3
+        assert self._total(client, flask_app, "飞机序列号:0012*") == 2
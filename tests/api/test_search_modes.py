@@ -0,0 +1,60 @@
+"""/api/search 计数与估计模式的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchModes:
+    def test_count_mode(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search(mode="count", facets=["机型"]).get_json()
+
+        assert data == {
+            "status": "success",
+            "total": 13,
+            "estimated": False,
+            "facets": {"机型": {"ARJ21": 13}},
+        }
+
+    def test_count_then_rows_hits_query_cache(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            search(mode="count")
+            data = search(debug=True).get_json()
+
+        assert data["total"] == 13
+        assert data["debug"]["query_cache"] == "hit"
+
+    def test_estimate_mode(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search(mode="estimate").get_json()
+
+        assert data == {"status": "success", "total": 13, "estimated": True}
+
+    def test_estimate_is_upper_bound(self, flask_app, faults_df, search):
+        levels = [
+            {"keywords": "发动机", "column_name": ["问题描述"]},
+            {"keywords": "故障1", "column_name": ["问题描述"], "negative_filtering": True},
+            {"keywords": "2024-01", "column_name": ["日期"]},
+        ]
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            estimate = search(mode="estimate", search_levels=levels).get_json()
+            exact = search(mode="count", search_levels=levels).get_json()
+
+        # 反向过滤层级不参与估计，估计值是精确总数的上界
+        assert exact["total"] == 8
+        assert estimate["total"] == 13
+        assert estimate["estimated"] is True
+
+    def test_estimate_uses_cached_exact_total(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            search()
+            data = search(mode="estimate").get_json()
+
+        assert data["total"] == 13
+        assert data["estimated"] is False
+
+    def test_invalid_mode_rejected(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            assert search(mode="all").status_code == 400
@@ -0,0 +1,85 @@
+"""/api/search 分页模式与结果集句柄的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchPagination:
+    def test_without_page_size_returns_all_rows(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search().get_json()
+
+        assert data["total"] == 13
+        assert len(data["data"]) == 13
+
+    def test_first_page_and_handle(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search(page_size=5).get_json()
+
+        assert data["status"] == "success"
+        assert len(data["data"]) == 5
+        assert [row["序号"] for row in data["data"]] == [1, 2, 3, 4, 5]
+        pagination = data["meta"]["pagination"]
+        assert pagination["total"] == 13
+        assert pagination["total_pages"] == 3
+        assert pagination["has_next"] is True
+        assert data["meta"]["result_id"]
+
+    def test_fetch_next_page_by_handle(self, client, flask_app, faults_df, search):
+        df = faults_df()
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            first = search(page_size=5).get_json()
+            result_id = first["meta"]["result_id"]
+            response = client.get(f"/api/search/results/{result_id}?page=3&page_size=5")
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert [row["序号"] for row in data["data"]] == [11, 12, 13]
+        assert data["meta"]["pagination"]["has_next"] is False
+
+    def test_pages_cover_full_result_in_order(self, client, flask_app, faults_df, search):
+        df = faults_df()
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            full = search().get_json()["data"]
+            result_id = search(page_size=4).get_json()["meta"]["result_id"]
+            paged = []
+            for page in range(1, 5):
+                resp = client.get(f"/api/search/results/{result_id}?page={page}&page_size=4")
+                paged.extend(resp.get_json()["data"])
+
+        assert paged == full
+
+    def test_sort_by_column(self, client, flask_app, faults_df, search):
+        df = faults_df()
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            result_id = search(page_size=5).get_json()["meta"]["result_id"]
+            response = client.get(
+                f"/api/search/results/{result_id}?page_size=3&sort_by=日期&sort_order=desc"
+            )
+
+        dates = [row["日期"] for row in response.get_json()["data"]]
+        assert dates == ["2024-01-25", "2024-01-23", "2024-01-21"]
+
+    def test_unknown_handle_returns_404(self, client, search):
+        response = client.get("/api/search/results/not-a-handle")
+
+        assert response.status_code == 404
+
+    def test_handle_expires_when_data_reloaded(self, client, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            result_id = search(page_size=5).get_json()["meta"]["result_id"]
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            response = client.get(f"/api/search/results/{result_id}?page=2")
+
+        assert response.status_code == 410
+
+    @pytest.mark.parametrize(
+        "params", [{"page_size": 0}, {"page_size": "x"}, {"page": 0, "page_size": 5}]
+    )
+    def test_invalid_paging_rejected(self, flask_app, params, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            response = search(**params)
+
+        assert response.status_code == 400
@@ -0,0 +1,47 @@
+"""/api/search 多层级执行计划的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchPlanner:
+    def test_most_selective_level_runs_first(self, flask_app, faults_df, search):
+        df = faults_df()
+        levels = [
+            {"keywords": "故障", "column_name": ["问题描述"]},
+            {"keywords": "发动机故障12", "column_name": ["问题描述"]},
+        ]
+
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            data = search(search_levels=levels, debug=True).get_json()
+
+        plan = data["debug"]["plan"]
+        assert data["debug"]["query_cache"] == "miss"
+        assert [step["level"] for step in plan] == [1, 0]
+        assert plan[0]["estimate"] <= plan[1]["estimate"]
+        assert data["total"] == 1
+
+    def test_empty_result_skips_remaining_levels(self, flask_app, faults_df, search):
+        df = faults_df()
+        levels = [
+            {"keywords": "故障", "column_name": ["问题描述"]},
+            {"keywords": "不存在的件号", "column_name": ["问题描述"]},
+        ]
+
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            data = search(search_levels=levels, debug=True).get_json()
+
+        plan = data["debug"]["plan"]
+        assert data["total"] == 0
+        assert plan[0]["level"] == 1
+        assert plan[1]["skipped"] is True
+
+    def test_debug_field_only_when_requested(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            data = search().get_json()
+            paged = search(page_size=5, debug=True).get_json()
+
+        assert "debug" not in data
+        assert paged["meta"]["debug"]["query_cache"] == "hit"
@@ -0,0 +1,55 @@
+"""/api/search 查询缓存的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchQueryCache:
+    def test_repeated_search_hits_cache_with_same_rows(self, client, flask_app, faults_df, search):
+        df = faults_df()
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            before = flask_app.query_cache.stats()["hits"]
+            first = search().get_json()
+            second = client.post(
+                "/api/search",
+                json={
+                    "data_source": "faults",
+                    "search_levels": [{"keywords": " 发动机 ", "column_name": ["问题描述"]}],
+                },
+            ).get_json()
+
+        assert second["data"] == first["data"]
+        assert flask_app.query_cache.stats()["hits"] == before + 1
+
+    def test_cache_stats_endpoint(self, client, search):
+        data = client.get("/api/search/cache_stats").get_json()
+
+        assert data["status"] == "success"
+        assert {"hits", "misses"} <= set(data["query_cache"])
+        assert {"hits", "misses"} <= set(data["result_cache"])
+
+    def test_reset_data_source_discards_cached_queries(self, client, flask_app, faults_df, search):
+        df = faults_df()
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            search()
+
+        client.post("/api/reset_data_source/faults")
+
+        assert flask_app.query_cache.discard_source("faults") == 0
+
+    @pytest.mark.parametrize(
+        "level",
+        [
+            {"keywords": "发动机", "column_name": {"列": "问题描述"}},
+            {"keywords": "发动机", "column_name": [["问题描述"]]},
+            {"keywords": {"发动机": 1}, "column_name": ["问题描述"]},
+        ],
+    )
+    def test_unhashable_level_rejected_before_cache_key(self, flask_app, level, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            response = search(search_levels=[level])
+
+        assert response.status_code == 400
+        assert response.get_json()["status"] == "error"
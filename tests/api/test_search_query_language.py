@@ -0,0 +1,90 @@
+"""/api/search 查询语言的测试。"""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+
+@pytest.mark.api
+class TestSearchQuery:
+    def _df(self):
+        return pd.DataFrame(
+            {
+                "日期": ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"],
+                "问题描述": [
+                    "发动机 喘振",
+                    "发动机故障",
+                    "液压泄漏",
+                    "发动机 喘振 泄漏",
+                    "APU 故障",
+                ],
+                "机型": ["ARJ21", "C919", "ARJ21", "C919", "ARJ21"],
+                "ATA": ["21-51-00", "72-00-00", "29-11-00", "21-30-00", "49-10-00"],
+            }
+        )
+
+    def _query(self, client, flask_app, query, df=None, **extra):
+        with patch.object(
+            flask_app, "load_data_source", return_value=self._df() if df is None else df
+        ):
+            return client.post(
+                "/api/search",
+                json={"data_source": "faults", "search_levels": [], "query": query, **extra},
+            )
+
+    def _descriptions(self, response):
+        assert response.status_code == 200
+        return sorted(row["问题描述"] for row in response.get_json()["data"])
+
+    def test_boolean_query(self, client, flask_app):
+        query = '问题描述:"发动机 喘振" AND (机型:ARJ21 OR 机型:C919) AND NOT 泄漏'
+
+        assert self._descriptions(self._query(client, flask_app, query)) == ["发动机 喘振"]
+
+    def test_ata_prefix(self, client, flask_app):
+        response = self._query(client, flask_app, "ATA:21* OR apu")
+
+        assert self._descriptions(response) == ["APU 故障", "发动机 喘振", "发动机 喘振 泄漏"]
+
+    def test_ata_hierarchy_and_range(self, client, flask_app):
+        assert self._query(client, flask_app, "ATA:21").get_json()["total"] == 2
+        assert self._query(client, flask_app, "ATA:21-5x").get_json()["total"] == 1
+        assert self._query(client, flask_app, "ATA:29..49").get_json()["total"] == 2
+
+    def test_unfielded_terms_use_query_columns(self, client, flask_app):
+        response = self._query(client, flask_app, "arj21", query_columns=["问题描述"])
+
+        assert response.get_json()["total"] == 0
+
+    def test_combined_with_levels(self, client, flask_app):
+        response = self._query(
+            client,
+            flask_app,
+            "机型:C919",
+            search_levels=[{"keywords": "发动机", "column_name": ["问题描述"]}],
+        )
+
+        assert self._descriptions(response) == ["发动机 喘振 泄漏", "发动机故障"]
+
+    def test_query_in_cache_key(self, client, flask_app):
+        df = self._df()
+        first = self._query(client, flask_app, "机型:C919", df, debug=True).get_json()
+        second = self._query(client, flask_app, "机型:ARJ21", df, debug=True).get_json()
+        again = self._query(client, flask_app, "(机型:ARJ21)", df, debug=True).get_json()
+
+        assert (first["total"], second["total"]) == (2, 3)
+        assert second["debug"]["query_cache"] == "miss"
+        assert again["debug"]["query_cache"] == "hit"
+
+    def test_estimate_mode_evaluates_query(self, client, flask_app):
+        data = self._query(client, flask_app, "NOT 发动机", mode="estimate").get_json()
+
+        assert data["total"] == 2
+
+    @pytest.mark.parametrize("query", ["(发动机", "型号:ARJ21"])
+    def test_invalid_query_rejected(self, client, flask_app, query):
+        response = self._query(client, flask_app, query)
+
+        assert response.status_code == 400
+        assert response.get_json()["status"] == "error"
@@ -0,0 +1,45 @@
+"""/api/search 会话内逐层细化搜索的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchRefinement:
+    def test_added_level_is_evaluated_on_previous_result(self, flask_app, faults_df, search):
+        from app.api import data_source_routes
+
+        df = faults_df()
+        first = [{"keywords": "故障", "column_name": ["问题描述"]}]
+        second = first + [{"keywords": "1", "column_name": ["问题描述"]}]
+
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            search(search_levels=first)
+            with patch.object(
+                data_source_routes, "search_mask", wraps=data_source_routes.search_mask
+            ) as spy:
+                data = search(search_levels=second).get_json()
+
+        # 只计算了新增的层级，且只在上一层的 13 行结果上计算
+        assert spy.call_count == 1
+        assert len(spy.call_args.kwargs["rows"]) == 13
+        assert data["total"] == len(
+            [i for i in range(25) if i % 2 == 0 and "1" in f"发动机故障{i}"]
+        )
+
+    def test_refined_result_matches_fresh_search(self, flask_app, faults_df, search):
+        df = faults_df()
+        levels = [
+            {"keywords": "故障", "column_name": ["问题描述"]},
+            {"keywords": "1", "column_name": ["问题描述"], "negative_filtering": True},
+        ]
+
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            search(search_levels=levels[:1])
+            refined = search(search_levels=levels).get_json()
+            flask_app.query_cache._cache.clear()
+            flask_app.search_refinements._cache.clear()
+            fresh = search(search_levels=levels).get_json()
+
+        assert refined["data"] == fresh["data"]
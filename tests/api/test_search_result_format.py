@@ -0,0 +1,35 @@
+"""/api/search 结果格式（records / columnar）的测试。"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchResultFormat:
+    def test_columnar_format(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df(10)):
+            records = search().get_json()
+            columnar = search(format="columnar").get_json()
+
+        data = columnar["data"]
+        assert columnar["total"] == records["total"]
+        assert data["columns"] == ["日期", "问题描述", "机型", "序号"]
+        assert [dict(zip(data["columns"], row, strict=True)) for row in data["rows"]] == records[
+            "data"
+        ]
+
+    def test_columnar_pages(self, client, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df(10)):
+            first = search(page_size=2, format="columnar").get_json()
+            result_id = first["meta"]["result_id"]
+            second = client.get(
+                f"/api/search/results/{result_id}?page=2&page_size=2&format=columnar"
+            ).get_json()
+
+        assert [row[-1] for row in first["data"]["rows"]] == [1, 2]
+        assert [row[-1] for row in second["data"]["rows"]] == [3, 4]
+
+    def test_invalid_format_rejected(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df(10)):
+            assert search(format="xml").status_code == 400
@@ -0,0 +1,60 @@
+"""/api/search NDJSON 流式输出的测试。"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.api
+class TestSearchStream:
+    @staticmethod
+    def _lines(response):
+        return [json.loads(line) for line in response.data.splitlines()]
+
+    def test_stream_matches_full_response(self, flask_app, faults_df, search):
+        flask_app.config["SEARCH_STREAM_CHUNK_ROWS"] = 4
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            full = search().get_json()
+            response = search(stream=True, facets=["机型"])
+
+        assert response.mimetype == "application/x-ndjson"
+        header, *rows = self._lines(response)
+        assert header["total"] == full["total"] == 13
+        assert header["columns"] == ["日期", "问题描述", "机型", "序号"]
+        assert header["facets"] == {"机型": {"ARJ21": 13}}
+        assert rows == full["data"]
+
+    def test_stream_columnar_with_projection(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            response = search(stream=True, format="columnar", columns=["问题描述"])
+
+        header, *rows = self._lines(response)
+        assert header["columns"] == ["问题描述", "序号", "_row_id"]
+        assert rows[0][:2] == ["发动机故障0", 1]
+        assert len(rows) == 13
+
+    def test_stream_columnar_header_with_source_serial_column(self, flask_app, faults_df, search):
+        df = faults_df()
+        df.insert(0, "序号", range(100, 100 + len(df)))
+        with patch.object(flask_app, "load_data_source", return_value=df):
+            response = search(stream=True, format="columnar")
+
+        header, *rows = self._lines(response)
+        assert header["columns"] == ["日期", "问题描述", "机型", "序号"]
+        assert rows[0] == ["2024-01-01", "发动机故障0", "ARJ21", 1]
+
+    def test_stream_empty_result(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            response = search(
+                stream=True,
+                search_levels=[{"keywords": "不存在", "column_name": ["问题描述"]}],
+            )
+
+        assert self._lines(response) == [
+            {"status": "success", "total": 0, "columns": ["日期", "问题描述", "机型", "序号"]}
+        ]
+
+    def test_stream_with_paging_rejected(self, flask_app, faults_df, search):
+        with patch.object(flask_app, "load_data_source", return_value=faults_df()):
+            assert search(stream=True, page_size=5).status_code == 400
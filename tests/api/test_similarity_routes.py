@@ -384,6 +384,31 @@ class TestSimilarityRoutes:
 
             assert response.status_code == 200
 
+    def test_similarity_search_stream(self, client, sample_similarity_data):
+        """测试 NDJSON 流式输出"""
+        with patch("app.api.similarity_routes.similarity_service") as mock_service:
+            mock_service.search_by_similarity.return_value = sample_similarity_data
+
+            response = client.post(
+                "/api/similarity_search",
+                json={
+                    "text": "发动机故障",
+                    "dataSource": "case",
+                    "columns": ["标题"],
+                    "limit": 10,
+                    "stream": True,
+                },
+            )
+
+            assert response.mimetype == "application/x-ndjson"
+            lines = [json.loads(line) for line in response.data.splitlines()]
+            assert lines[0]["total"] == len(sample_similarity_data)
+            assert lines[0]["data_source"] == "case"
+            assert "序号" in lines[0]["columns"]
+            assert [row["序号"] for row in lines[1:]] == list(
+                range(1, len(sample_similarity_data) + 1)
+            )
+
 
 @pytest.mark.parametrize(
     "missing_field",
@@ -0,0 +1,107 @@
+"""Arrow 关键字匹配引擎的单元测试。
+
+覆盖：
+- Arrow 引擎与 pandas 引擎的 search_column 结果完全一致（AND / OR / 反向过滤 / 子集）
+- 多分块并行匹配与单分块结果一致
+- 引擎设置校验与切换引擎后索引重建
+"""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.api.data_source_routes import search_column
+from app.core.search import configure_search_engine, get_search_index, invalidate_search_index
+from app.core.search.arrow_engine import ArrowTextColumns
+from app.core.search.index import SearchIndex
+from app.core.search.search_view import SearchView
+
+_VOCAB = ["发动机", "液压", "泄漏", "ＡＰＵ", "apu", "引气", "故障", "PN-123", "ab", " "]
+
+
+@pytest.fixture
+def df():
+    rng = random.Random(21)
+    rows = 500
+    return pd.DataFrame(
+        {
+            "问题描述": [
+                "".join(rng.choice(_VOCAB) for _ in range(rng.randint(0, 6))) for _ in range(rows)
+            ],
+            "排故措施": [rng.choice(_VOCAB + [None]) for _ in range(rows)],
+            "日期": [f"2024-{rng.randint(1, 12):02d}-01" for _ in range(rows)],
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def _small_chunks():
+    # 小分块，确保测试数据会被拆成多块并行匹配
+    configure_search_engine("arrow", workers=3, chunk_size=64)
+    yield
+    configure_search_engine("pandas")
+
+
+class TestArrowTextColumns:
+    @pytest.mark.parametrize("require_all", [True, False])
+    def test_chunked_match_equals_python_scan(self, df, require_all):
+        view = SearchView(df)
+        arrow = ArrowTextColumns(view, chunk_size=37, max_workers=4)
+        patterns = ["发动机", "apu"]
+        values = view.values("问题描述")
+
+        hits = np.array([[p in v for p in patterns] for v in values])
+        expected = hits.all(axis=1) if require_all else hits.any(axis=1)
+
+        assert np.array_equal(arrow.match("问题描述", patterns, None, require_all), expected)
+
+        rows = np.arange(0, len(df), 3)
+        assert np.array_equal(arrow.match("问题描述", patterns, rows, require_all), expected[rows])
+
+    def test_empty_rows(self, df):
+        arrow = ArrowTextColumns(SearchView(df))
+        assert arrow.match("问题描述", ["a"], np.array([], dtype=np.int64)).tolist() == []
+
+
+class TestArrowSearchColumn:
+    @pytest.mark.parametrize("logic", ["and", "or"])
+    @pytest.mark.parametrize("negative", [False, True])
+    @pytest.mark.parametrize(
+        "keywords", ["ab", "apu,故障", "发动机,泄漏", "2024-3", "ｐｎ－１２３"]
+    )
+    def test_matches_pandas_engine(self, df, logic, negative, keywords):
+        columns = ["问题描述", "排故措施", "日期"]
+        pandas_index = SearchIndex("test", df, 1, engine="pandas")
+        arrow_index = SearchIndex("test", df, 1, engine="arrow")
+        assert arrow_index.arrow is not None
+
+        expected = search_column(df, keywords, columns, logic, negative, pandas_index)
+        result = search_column(df, keywords, columns, logic, negative, arrow_index)
+        assert result.index.tolist() == expected.index.tolist()
+
+        subset = df.iloc[::2]
+        expected = search_column(subset, keywords, columns, logic, negative, pandas_index)
+        result = search_column(subset, keywords, columns, logic, negative, arrow_index)
+        assert result.index.tolist() == expected.index.tolist()
+
+
+class TestEngineSettings:
+    def test_invalid_engine(self):
+        with pytest.raises(ValueError):
+            configure_search_engine("duckdb")
+
+    def test_index_rebuilt_when_engine_changes(self, df):
+        invalidate_search_index("engine_test")
+        arrow_index = get_search_index("engine_test", df)
+        assert arrow_index.engine == "arrow"
+
+        configure_search_engine("pandas")
+        pandas_index = get_search_index("engine_test", df)
+        assert pandas_index.engine == "pandas"
+        assert pandas_index.arrow is None
+        assert pandas_index.version == arrow_index.version + 1
+        invalidate_search_index("engine_test")
@@ -0,0 +1,79 @@
+"""ATA 层级编码规范化与有序索引的单元测试。"""
+
+import pandas as pd
+import pytest
+
+from app.core.search.ata import (
+    AtaIndex,
+    ata_chapter,
+    ata_prefix,
+    normalize_ata,
+)
+from app.core.search.index import SearchIndex
+
+
+class TestNormalizeAta:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("21", "21"),
+            ("21-51", "21-51"),
+            ("2151-00", "21-51-00"),
+            ("215100", "21-51-00"),
+            ("21.0", "21"),
+            (21.0, "21"),
+            (27, "27"),
+            ("ATA 21-51", "21-51"),
+            ("21-5-00", "21-05-00"),
+            ("21 - 51", "21-51"),
+            ("21-51-00-01", None),
+            ("21/22", None),
+            ("21 22", None),
+            ("无", None),
+            ("nan", None),
+            ("215", None),
+            (None, None),
+        ],
+    )
+    def test_normalize(self, value, expected):
+        assert normalize_ata(value) == expected
+
+    def test_chapter(self):
+        series = pd.Series(["21-51-00", "ATA 32", "3210", None, "无", 27])
+
+        assert ata_chapter(series).tolist() == ["21", "32", "32", None, None, "27"]
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [("21", "21"), ("ATA 21", "21"), ("21-5x", "21-5"), ("2151*", "21-51"), ("21xx", "21")],
+    )
+    def test_query_prefix(self, text, expected):
+        assert ata_prefix(text) == expected
+
+
+class TestAtaIndex:
+    def _index(self):
+        return AtaIndex(
+            pd.Series(["21-51-00", "2151", "21.0", "22-10", "24", "25-11", "无", None, "21-61"])
+        )
+
+    def test_chapter_prefix(self):
+        assert self._index().query("ATA 21").tolist() == [0, 1, 2, 8]
+
+    def test_section_wildcard(self):
+        assert self._index().query("21-5x").tolist() == [0, 1]
+
+    def test_range_includes_end_chapter(self):
+        assert self._index().query("21..24").tolist() == [0, 1, 2, 3, 4, 8]
+        assert self._index().query("22~24").tolist() == [3, 4]
+        assert self._index().query("24..22").tolist() == []
+
+    def test_unrecognized_query(self):
+        assert self._index().query("空调") is None
+
+    def test_search_index_chapter_facet_uses_normalized_codes(self):
+        df = pd.DataFrame({"ATA": ["21.0", "2151", "ATA 32", "无"]})
+        index = SearchIndex("case", df, 1)
+
+        assert index.ata("ATA") is index.ata("ATA")
+        assert index.ata_chapters("ATA").counts() == {"21": 2, "32": 1}
@@ -0,0 +1,80 @@
+"""分类位图索引的单元测试。"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.search import category_index
+from app.core.search.ata import ata_chapter
+from app.core.search.category_index import CategoryIndex, unpack_rows
+from app.core.search.index import SearchIndex
+
+
+def _series() -> pd.Series:
+    return pd.Series(["ARJ21", "C919", None, "无", "ARJ21", "C919", "ARJ21", "无", None, "C909"])
+
+
+class TestCategoryIndex:
+    @pytest.mark.parametrize(
+        "values", [["ARJ21"], ["ARJ21", "无"], ["不存在"], [], ["C909", "C919", "ARJ21"]]
+    )
+    def test_rows_match_isin(self, values):
+        series = _series()
+        index = CategoryIndex(series)
+
+        expected = np.flatnonzero(series.isin(values).to_numpy())
+        assert index.rows(values).tolist() == expected.tolist()
+
+    def test_codes_mark_nulls(self):
+        index = CategoryIndex(_series())
+        assert (index.codes[[2, 8]] == -1).all()
+        assert len(index.categories) == 4
+
+    def test_high_cardinality_falls_back_to_codes(self, monkeypatch):
+        monkeypatch.setattr(category_index, "MAX_BITMAP_CATEGORIES", 2)
+        series = _series()
+        index = CategoryIndex(series)
+
+        assert index.bitmaps is None
+        assert index.rows(["C919", "无"]).tolist() == [1, 3, 5, 7]
+
+    def test_bitmaps_combine_with_and(self):
+        df = pd.DataFrame(
+            {
+                "机型": ["ARJ21", "C919", "ARJ21", "ARJ21"],
+                "数据类型": ["故障", "故障", "手册", "故障"],
+            }
+        )
+        index = SearchIndex("faults", df, 1)
+
+        bits = index.category("机型").bitmap(["ARJ21"]) & index.category("数据类型").bitmap(
+            ["故障"]
+        )
+        assert unpack_rows(bits, len(df)).tolist() == [0, 3]
+
+    def test_category_for_missing_column(self):
+        index = SearchIndex("faults", pd.DataFrame({"机型": ["ARJ21"]}), 1)
+        assert "机型" in index.categories
+        assert index.category("运营人") is None
+
+
+class TestCategoryCounts:
+    def test_counts_match_value_counts(self):
+        series = _series()
+        index = CategoryIndex(series)
+
+        assert index.counts() == series.value_counts().to_dict()
+        assert list(index.counts()) == ["ARJ21", "C919", "无", "C909"]
+
+    def test_counts_on_subset(self):
+        index = CategoryIndex(_series())
+
+        assert index.counts(np.array([0, 1, 2, 5])) == {"C919": 2, "ARJ21": 1}
+        assert index.counts(np.array([], dtype=np.int64)) == {}
+
+    def test_ata_chapter(self):
+        series = pd.Series(["21-51-00", "ATA 32", "3210", None, "无", 27])
+
+        assert ata_chapter(series).tolist() == ["21", "32", "32", None, None, "27"]
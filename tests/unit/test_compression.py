@@ -0,0 +1,110 @@
+"""HTTP 响应压缩工具的单元测试。"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import zlib
+
+import pytest
+
+from app.utils import compression
+from app.utils.compression import (
+    PrecompressedAssets,
+    compress,
+    compress_stream,
+    negotiate,
+)
+
+
+class TestNegotiate:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            (None, None),
+            ("", None),
+            ("gzip", "gzip"),
+            ("deflate, gzip;q=0.5", "gzip"),
+            ("gzip;q=0", None),
+            ("identity", None),
+            ("*", "br"),
+            ("br;q=0.5, zstd;q=0.8", "zstd"),
+            ("gzip, br", "br"),
+        ],
+    )
+    def test_negotiate(self, header, expected):
+        assert negotiate(header, ["br", "zstd", "gzip"]) == expected
+
+    def test_only_available_encodings(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        monkeypatch.setattr(compression, "zstandard", None)
+
+        assert negotiate("br, zstd, gzip;q=0.1") == "gzip"
+
+
+class TestCompress:
+    def test_gzip_round_trip(self):
+        data = "发动机故障，更换燃油泵。".encode() * 200
+
+        compressed = compress(data, "gzip")
+
+        assert len(compressed) < len(data) / 5
+        assert gzip.decompress(compressed) == data
+
+    def test_stream_flushes_each_chunk(self):
+        chunks = [f'{{"问题描述": "液压泄漏{i}"}}\n'.encode() for i in range(5)]
+        decompressor = zlib.decompressobj(31)
+
+        received = b""
+        stream = compress_stream(iter(chunks), "gzip")
+        for chunk in chunks:
+            # 每个输入块压缩后立即可以完整解压，不必等整个流结束
+            received += decompressor.decompress(next(stream))
+            assert received.endswith(chunk)
+        for rest in stream:
+            received += decompressor.decompress(rest)
+
+        assert received == b"".join(chunks)
+
+
+class TestPrecompressedAssets:
+    def test_variants_and_etags(self, tmp_path):
+        (tmp_path / "lib.js").write_bytes(b"function f(){return 1}\n" * 100)
+        (tmp_path / "empty.css").write_bytes(b"")
+
+        assets = PrecompressedAssets(str(tmp_path), ["gzip"])
+        asset = assets.get("lib.js")
+
+        encoding, body, etag = asset.variant("gzip, deflate")
+        assert encoding == "gzip"
+        assert gzip.decompress(body) == asset.data
+        assert etag == f"{asset.etag}-gzip"
+        assert asset.variant(None) == (None, asset.data, asset.etag)
+        assert asset.mimetype in ("text/javascript", "application/javascript")
+
+        # 压缩后不变小的文件不保留压缩版本
+        assert assets.get("empty.css").variant("gzip")[0] is None
+        assert assets.get("missing.js") is None
+
+    def test_missing_directory(self, tmp_path):
+        assert PrecompressedAssets(str(tmp_path / "none")).get("lib.js") is None
+
+    def test_path_outside_directory(self, tmp_path):
+        (tmp_path / "secret.txt").write_bytes(b"secret")
+        (tmp_path / "vendor").mkdir()
+
+        assert PrecompressedAssets(str(tmp_path / "vendor")).get("../secret.txt") is None
+
+    def test_compressed_once_per_process_until_modified(self, tmp_path):
+        path = tmp_path / "lib.js"
+        path.write_bytes(b"function f(){return 1}\n" * 100)
+
+        asset = PrecompressedAssets(str(tmp_path), ["gzip"]).get("lib.js")
+        # 再次创建的目录对象（如另一个应用实例）复用已压缩的结果
+        assert PrecompressedAssets(str(tmp_path), ["gzip"]).get("lib.js") is asset
+
+        path.write_bytes(b"function g(){return 2}\n" * 100)
+        os.utime(path, ns=(asset.stamp[0] + 10**9, asset.stamp[0] + 10**9))
+        refreshed = PrecompressedAssets(str(tmp_path), ["gzip"]).get("lib.js")
+        assert refreshed is not asset
+        assert refreshed.data.startswith(b"function g")
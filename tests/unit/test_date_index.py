@@ -0,0 +1,97 @@
+"""日期列索引的单元测试。"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.api.data_source_routes import search_column
+from app.core.search import DateIndex, is_date_column
+from app.core.search.date_index import date_bound, year_month
+from app.core.search.index import SearchIndex
+from app.core.search.search_view import normalize_series
+
+
+def _dates() -> pd.Series:
+    return pd.Series(
+        [
+            "2024-03-15",
+            "2024/3/2 10:00",
+            None,
+            "",
+            "约 2024-03 左右",
+            "2023-12-01",
+            "2024-04-01",
+        ]
+    )
+
+
+class TestHelpers:
+    @pytest.mark.parametrize(
+        "column,expected",
+        [("日期", True), ("申请时间", True), ("故障发生日期", True), ("问题描述", False)],
+    )
+    def test_is_date_column(self, column, expected):
+        assert is_date_column(column) is expected
+
+    def test_year_month(self):
+        assert year_month("2024-3") == (2024, 3)
+        assert year_month("2024-03") == (2024, 3)
+        assert year_month("2024-13") is None
+        assert year_month("2024-03-01") is None
+
+    def test_date_bound_uses_precision(self):
+        assert date_bound("2024-03") == np.datetime64("2024-03-01T00:00:00")
+        assert date_bound("2024-03", end=True) > np.datetime64("2024-03-31T23:59:59")
+        assert date_bound("2024-03-15", end=True) < np.datetime64("2024-03-16")
+
+    def test_date_bound_invalid(self):
+        with pytest.raises(ValueError):
+            date_bound("not a date")
+
+
+class TestDateIndex:
+    def test_mixed_formats_parsed(self):
+        index = DateIndex(_dates())
+        assert index.values[1] == np.datetime64("2024-03-02T10:00:00")
+        assert np.isnat(index.values[[2, 3, 4]]).all()
+
+    def test_range_rows(self):
+        index = DateIndex(_dates())
+        rows = index.range_rows(date_bound("2024-03"), date_bound("2024-04-01", end=True))
+        assert rows.tolist() == [0, 1, 6]
+        assert index.range_rows(end=date_bound("2023-12", end=True)).tolist() == [5]
+        assert index.range_rows().tolist() == [0, 1, 5, 6]
+
+    def test_month_rows_include_unparsed_text(self):
+        series = _dates()
+        index = DateIndex(series, normalize_series(series))
+        assert index.month_rows(2024, 3).tolist() == [0, 1, 4]
+
+    def test_datetime_dtype_column(self):
+        series = pd.Series(pd.to_datetime(["2024-01-02", None, "2023-05-06"]))
+        index = DateIndex(series)
+        assert index.month_rows(2024, 1).tolist() == [0]
+
+
+class TestYearMonthKeyword:
+    @pytest.mark.parametrize("logic", ["and", "or"])
+    def test_indexed_matches_unindexed_for_iso_dates(self, logic):
+        df = pd.DataFrame(
+            {"日期": [f"2024-{m:02d}-{d:02d}" for m in range(1, 13) for d in (1, 15)] + [None]}
+        )
+        index = SearchIndex("faults", df, 1)
+
+        for keywords in ["2024-3", "2024-3,2024-04", "2024-3,2024-03-15"]:
+            expected = search_column(df, keywords, "日期", logic)
+            actual = search_column(df, keywords, "日期", logic, search_index=index)
+            assert actual.index.tolist() == expected.index.tolist()
+
+    def test_indexed_matches_other_date_formats(self):
+        df = pd.DataFrame({"日期": ["2024/3/2", "2024-03-15", "2024-04-01"]})
+        index = SearchIndex("faults", df, 1)
+
+        result = search_column(df, "2024-3", "日期", search_index=index)
+
+        assert result.index.tolist() == [0, 1]
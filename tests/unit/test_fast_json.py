@@ -0,0 +1,139 @@
+"""快速 JSON 序列化的单元测试。"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask, jsonify
+
+from app.utils import fast_json
+from app.utils.fast_json import (
+    COLUMNAR,
+    dumps,
+    frame_payload,
+    json_response,
+    ndjson_lines,
+    parse_result_format,
+    records_payload,
+)
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "问题描述": ["发动机故障", None, "液压泄漏"],
+            "数值": [1.5, np.nan, 3.0],
+            "次数": pd.array([1, None, 3], dtype="Int64"),
+            "日期": pd.to_datetime(["2024-01-01", None, "2024-03-01"]),
+        }
+    )
+
+
+def _legacy_records(frame: pd.DataFrame) -> list[dict]:
+    records = frame.replace({np.nan: None}).to_dict("records")
+    for index, item in enumerate(records, 1):
+        item["序号"] = index
+    return records
+
+
+class TestFramePayload:
+    def test_records_match_legacy_jsonify(self):
+        frame = _frame()
+        app = Flask(__name__)
+
+        with app.app_context():
+            expected = json.loads(jsonify(_legacy_records(frame)).get_data())
+            payload = frame_payload(frame, extra_columns={"序号": range(1, 4)})
+
+            assert json.loads(dumps(payload)) == expected
+
+    def test_missing_values_become_none(self):
+        records = frame_payload(_frame())
+
+        assert records[1] == {"问题描述": None, "数值": None, "次数": None, "日期": None}
+
+    def test_columnar(self):
+        payload = frame_payload(_frame()[["问题描述", "数值"]], COLUMNAR, {"序号": [1, 2, 3]})
+
+        assert payload == {
+            "columns": ["问题描述", "数值", "序号"],
+            "rows": [["发动机故障", 1.5, 1], [None, None, 2], ["液压泄漏", 3.0, 3]],
+        }
+
+    def test_extra_column_overrides_frame_column(self):
+        frame = pd.DataFrame({"序号": [9, 9], "标题": ["A", "B"]})
+
+        records = frame_payload(frame, extra_columns={"序号": [1, 2]})
+
+        assert records == [{"标题": "A", "序号": 1}, {"标题": "B", "序号": 2}]
+
+    def test_empty_frame(self):
+        assert frame_payload(_frame().iloc[[]]) == []
+        assert frame_payload(_frame().iloc[:, []]) == [{}, {}, {}]
+
+
+class TestEncoding:
+    def test_records_payload_columnar(self):
+        records = [{"a": 1, "b": 2}, {"b": 3, "c": 4}]
+
+        assert records_payload(records) is records
+        assert records_payload(records, COLUMNAR) == {
+            "columns": ["a", "b", "c"],
+            "rows": [[1, 2, None], [None, 3, 4]],
+        }
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_nan_numpy_and_datetime(self, monkeypatch, use_orjson):
+        if not use_orjson:
+            monkeypatch.setattr(fast_json, "orjson", None)
+        value = {"nan": float("nan"), "np": np.int64(3), "when": datetime(2024, 1, 1), "中文": "是"}
+
+        decoded = json.loads(dumps(value))
+
+        assert decoded == {
+            "nan": None,
+            "np": 3,
+            "when": "Mon, 01 Jan 2024 00:00:00 GMT",
+            "中文": "是",
+        }
+
+    def test_json_response(self):
+        app = Flask(__name__)
+
+        with app.app_context():
+            response = json_response({"status": "error"}, 400)
+
+        assert response.status_code == 400
+        assert response.mimetype == "application/json"
+        assert response.get_json() == {"status": "error"}
+
+    def test_parse_result_format(self):
+        assert parse_result_format(None) == "records"
+        assert parse_result_format("columnar") == "columnar"
+        with pytest.raises(ValueError):
+            parse_result_format("csv")
+
+
+class TestNdjson:
+    def test_header_then_rows(self):
+        lines = b"".join(ndjson_lines({"total": 3}, iter([[{"a": 1}, {"a": 2}], [], [{"a": 3}]])))
+
+        assert [json.loads(line) for line in lines.splitlines()] == [
+            {"total": 3},
+            {"a": 1},
+            {"a": 2},
+            {"a": 3},
+        ]
+
+    def test_error_line_on_failure(self):
+        def chunks():
+            yield [{"a": 1}]
+            raise RuntimeError("读取失败")
+
+        lines = [json.loads(line) for line in b"".join(ndjson_lines({}, chunks())).splitlines()]
+
+        assert lines[-1] == {"status": "error", "message": "读取失败"}
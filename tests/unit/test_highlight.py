@@ -0,0 +1,60 @@
+"""结果高亮（关键字命中位置）的单元测试。"""
+
+import numpy as np
+import pandas as pd
+
+from app.core.search.highlight import Highlighter
+
+
+def _highlighter(patterns, keywords=("发动机", "apu")):
+    return Highlighter(list(keywords), patterns)
+
+
+class TestHighlighterCell:
+    def test_spans_are_encoded_flat(self):
+        highlighter = _highlighter({"问题描述": [("发动机", 0), ("apu", 1)]})
+
+        assert highlighter.cell("问题描述", "APU 与发动机") == [0, 3, 1, 5, 8, 0]
+        assert highlighter.cell("问题描述", "液压") is None
+        assert highlighter.cell("问题描述", None) is None
+        assert highlighter.cell("排故措施", "发动机") is None
+
+    def test_offsets_refer_to_original_text(self):
+        highlighter = _highlighter({"问题描述": [("apu", 1), ("kg", 0)]}, ["kg", "apu"])
+
+        # 全角字母规范化前后一一对应
+        assert highlighter.cell("问题描述", "ＡＰＵ故障") == [0, 3, 1]
+        # 「㎏」规范化为两个字符，命中范围换算为原文中的这一个字符
+        assert highlighter.cell("问题描述", "重5㎏") == [2, 3, 0]
+        # 基本平面以外的字符在 JavaScript 字符串中占两个码元
+        assert highlighter.cell("问题描述", "😀apu") == [2, 5, 1]
+
+    def test_offsets_with_expanding_and_composing_characters(self):
+        highlighter = _highlighter({"问题描述": [("ガ", 0), ("kg", 1)]}, ["ガ", "kg"])
+
+        # 「ｶﾞ」合成为一个字符、「㎏」展开为两个字符，总长度不变但不能逐字符对应
+        assert highlighter.cell("问题描述", "ｶﾞ㎏") == [0, 2, 0, 2, 3, 1]
+
+
+class TestHighlighterRows:
+    def test_rows_follow_row_ids_and_columns(self):
+        df = pd.DataFrame(
+            {
+                "问题描述": ["发动机", "液压", "APU 故障"],
+                "排故措施": ["更换发动机", None, "检查"],
+            }
+        )
+        highlighter = _highlighter(
+            {"问题描述": [("发动机", 0), ("apu", 1)], "排故措施": [("发动机", 0)]}
+        )
+
+        rows = highlighter.rows(df, np.array([2, 1, 0]))
+
+        assert rows == [
+            {"问题描述": [0, 3, 1]},
+            None,
+            {"问题描述": [0, 3, 0], "排故措施": [2, 5, 0]},
+        ]
+        assert highlighter.rows(df, np.array([0]), columns=["排故措施"]) == [
+            {"排故措施": [2, 5, 0]}
+        ]
@@ -0,0 +1,70 @@
+"""标识符哈希索引的单元测试。"""
+
+import numpy as np
+import pandas as pd
+
+from app.core.search.identifier_index import IdentifierIndex, normalize_identifier
+from app.core.search.index import SearchIndex
+
+
+class TestNormalizeIdentifier:
+    def test_folds_case_dashes_and_spaces(self):
+        assert normalize_identifier(" ab-12 3 ") == normalize_identifier("AB123") == "ab123"
+
+    def test_full_width(self):
+        assert normalize_identifier("ＡＢ－１２３") == "ab123"
+
+    def test_empty_values(self):
+        for value in (None, np.nan, "", "无", "  "):
+            assert normalize_identifier(value) == ""
+
+    def test_msn_matches_import_rule(self):
+        assert normalize_identifier("MSN 123", msn=True) == "00123"
+        assert normalize_identifier("10001", msn=True) == "10001"
+        assert normalize_identifier("12", msn=True, pad=False) == "12"
+        # 件号中的数字不能当作序列号
+        assert normalize_identifier("AB-123", msn=True) == ""
+
+
+class TestIdentifierIndex:
+    def _index(self):
+        return IdentifierIndex(pd.Series(["AB-123", "ab 123", None, "无", "AB1234", "X9", "ab123"]))
+
+    def test_exact_lookup(self):
+        index = self._index()
+
+        assert index.lookup("Ab123").tolist() == [0, 1, 6]
+        # 精确匹配，不会命中包含该编号的 AB1234
+        assert index.lookup("B123").tolist() == []
+        assert index.lookup("无").tolist() == []
+
+    def test_prefix_lookup(self):
+        index = self._index()
+
+        assert index.prefix("ab12").tolist() == [0, 1, 4, 6]
+        assert index.prefix("ab1234").tolist() == [4]
+        assert index.prefix("zz").tolist() == []
+
+    def test_lookup_many(self):
+        counts, codes = self._index().lookup_many(["ab123", "zz", "x-9"])
+
+        assert counts.tolist() == [3, 0, 1]
+        assert [rows.tolist() for rows in self._index().rows_of_codes(codes)] == [
+            [0, 1, 6],
+            [],
+            [5],
+        ]
+
+    def test_msn_prefix_without_padding(self):
+        index = IdentifierIndex(pd.Series(["123", "00124", "10001"]), msn=True)
+
+        assert index.lookup("123").tolist() == [0]
+        assert index.prefix("0012").tolist() == [0, 1]
+
+    def test_search_index_builds_identifier_columns_only(self):
+        df = pd.DataFrame({"机号": ["B-652G", "B-001A"], "问题描述": ["a", "b"]})
+        index = SearchIndex("faults", df, 1)
+
+        assert index.identifier("机号").lookup("b652g").tolist() == [0]
+        assert index.identifier("机号") is index.identifier("机号")
+        assert index.identifier("问题描述") is None
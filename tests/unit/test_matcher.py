@@ -0,0 +1,137 @@
+"""多关键字匹配器的单元测试。
+
+覆盖：
+- Aho-Corasick 自动机与逐个子串判断结果一致（重叠、前缀、重复、空关键字）
+- 关键字较多（启用自动机）时 search_column 与逐关键字判断的结果一致
+- 命中位置：自动机与逐个子串查找一致，重叠时保留起点靠前、较长的命中
+"""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.api.data_source_routes import search_column
+from app.core.search import KeywordMatcher
+from app.core.search.index import SearchIndex
+from app.core.search.matcher import AHO_CORASICK_MIN_KEYWORDS, AhoCorasick
+
+_ALPHABET = "ab发动机c"
+
+
+def _naive(keywords, text):
+    return {i for i, k in enumerate(keywords) if k in text}
+
+
+class TestAhoCorasick:
+    def test_overlapping_and_nested_keywords(self):
+        keywords = ["he", "she", "his", "hers", "e", "she"]
+        automaton = AhoCorasick(keywords)
+        for text in ["ushers", "his", "xyz", "", "hehe"]:
+            assert automaton.find(text) == _naive(keywords, text)
+
+    def test_empty_keyword_always_matches(self):
+        automaton = AhoCorasick(["", "abc"])
+        assert automaton.find("") == {0}
+        assert automaton.find("xabcx") == {0, 1}
+
+    def test_first_only_stops_at_any_hit(self):
+        automaton = AhoCorasick(["发动机", "故障"])
+        assert len(automaton.find("发动机故障", first_only=True)) == 1
+        assert automaton.find("液压", first_only=True) == set()
+
+    def test_random_matches_naive(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            keywords = [
+                "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(1, 3)))
+                for _ in range(rng.randint(1, 6))
+            ]
+            text = "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 12)))
+            assert AhoCorasick(keywords).find(text) == _naive(keywords, text)
+
+
+class TestKeywordMatcherSpans:
+    def test_overlaps_keep_leftmost_longest(self):
+        matcher = KeywordMatcher(["发动机", "发动机故障", "故障", "障碍"])
+
+        assert matcher.spans("xx发动机故障碍") == [(2, 7, 1)]
+        assert matcher.spans("故障 发动机") == [(0, 2, 2), (3, 6, 0)]
+        assert matcher.spans("液压") == []
+
+    def test_automaton_matches_substring_strategy(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            keywords = [
+                "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(1, 3)))
+                for _ in range(rng.randint(1, 6))
+            ]
+            text = "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 12)))
+            assert KeywordMatcher(keywords, automaton_threshold=1).spans(text) == KeywordMatcher(
+                keywords
+            ).spans(text)
+
+
+class TestKeywordMatcher:
+    @pytest.mark.parametrize("require_all", [True, False])
+    def test_automaton_matches_substring_strategy(self, require_all):
+        rng = random.Random(5)
+        values = ["".join(rng.choice(_ALPHABET) for _ in range(8)) for _ in range(200)]
+        keywords = ["ab", "发动", "机c", "ba", "cc"]
+
+        plain = KeywordMatcher(keywords, automaton_threshold=len(keywords) + 1)
+        automaton = KeywordMatcher(keywords, automaton_threshold=1)
+
+        assert np.array_equal(plain.scan(values), automaton.scan(values))
+        assert np.array_equal(
+            plain.match(values, require_all), automaton.match(values, require_all)
+        )
+
+    def test_no_keywords(self):
+        matcher = KeywordMatcher([])
+        values = ["a", "b"]
+        assert matcher.match(values, require_all=True).tolist() == [True, True]
+        assert matcher.match(values, require_all=False).tolist() == [False, False]
+
+
+class TestSearchColumnManyKeywords:
+    @pytest.fixture
+    def df(self):
+        rng = random.Random(11)
+        words = ["发动机", "液压", "泄漏", "apu", "引气", "故障", "ab", "-"]
+        return pd.DataFrame(
+            {
+                "问题描述": [
+                    "".join(rng.choice(words) for _ in range(rng.randint(0, 6))) for _ in range(300)
+                ],
+                "排故措施": [rng.choice(words + [None]) for _ in range(300)],
+            }
+        )
+
+    @pytest.mark.parametrize("logic", ["and", "or"])
+    @pytest.mark.parametrize("negative", [False, True])
+    def test_automaton_path_matches_single_keyword_semantics(self, df, logic, negative):
+        keywords = ["发动机", "故障", "apu", "ab", "液压"]
+        keywords = (keywords * AHO_CORASICK_MIN_KEYWORDS)[:AHO_CORASICK_MIN_KEYWORDS]
+        columns = ["问题描述", "排故措施"]
+
+        # 逐关键字的参考结果
+        masks = []
+        for col in columns:
+            values = df[col].fillna("").astype(str).str.lower()
+            hits = [values.str.contains(k, regex=False) for k in keywords]
+            masks.append(
+                np.logical_and.reduce(hits) if logic == "and" else np.logical_or.reduce(hits)
+            )
+        expected = np.logical_or.reduce(masks)
+        expected = ~expected if negative else expected
+
+        index = SearchIndex("test", df, 1)
+        for search_index in (None, index):
+            result = search_column(
+                df, keywords, columns, logic, negative, search_index=search_index
+            )
+            assert result.index.tolist() == df.index[expected].tolist()
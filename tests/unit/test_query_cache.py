@@ -0,0 +1,89 @@
+"""搜索查询缓存的单元测试。"""
+
+import numpy as np
+import pytest
+
+from app.core.search.query_cache import QueryCache, canonical_levels
+
+
+def _level(keywords, column_name=None, logic="and", negative=False):
+    return {
+        "keywords": keywords,
+        "column_name": column_name or ["问题描述"],
+        "logic": logic,
+        "negative_filtering": negative,
+    }
+
+
+class TestCanonicalLevels:
+    def test_keyword_order_case_and_separators_ignored(self):
+        a = canonical_levels([_level("APU, 发动机", logic="or")])
+        b = canonical_levels([_level("发动机，apu", logic="or")])
+
+        assert a == b
+
+    def test_whitespace_is_not_a_separator(self):
+        # 「发动机 故障」是一个关键字，与「发动机,故障」语义不同
+        a = canonical_levels([_level("发动机 故障")])
+        b = canonical_levels([_level("发动机,故障")])
+
+        assert a != b
+
+    def test_single_keyword_ignores_logic(self):
+        assert canonical_levels([_level("发动机", logic="or")]) == canonical_levels(
+            [_level("发动机", logic="and")]
+        )
+
+    def test_column_order_ignored(self):
+        a = canonical_levels([_level("发动机", ["问题描述", "排故措施"])])
+        b = canonical_levels([_level("发动机", ["排故措施", "问题描述"])])
+
+        assert a == b
+
+    def test_empty_levels_dropped_and_order_kept(self):
+        levels = [_level("液压"), _level("   "), _level("泄漏", negative=True)]
+
+        result = canonical_levels(levels)
+
+        assert [level[0] for level in result] == [("液压",), ("泄漏",)]
+
+    def test_negative_flag_distinguishes(self):
+        assert canonical_levels([_level("液压")]) != canonical_levels(
+            [_level("液压", negative=True)]
+        )
+
+
+class TestQueryCache:
+    def test_hit_and_miss_counters(self):
+        cache = QueryCache(maxsize=4)
+        key = cache.key("case", 1, [_level("液压")], ["ARJ21"])
+
+        assert cache.get(key) is None
+        cache.put(key, np.array([3, 1, 2]))
+        assert cache.get(key).tolist() == [3, 1, 2]
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_version_is_part_of_key(self):
+        cache = QueryCache()
+        cache.put(cache.key("case", 1, [_level("液压")]), np.array([1]))
+
+        assert cache.get(cache.key("case", 2, [_level("液压")])) is None
+
+    def test_cached_rows_are_read_only(self):
+        cache = QueryCache()
+        key = cache.key("case", 1, [_level("液压")])
+        cache.put(key, np.array([1, 2]))
+
+        with pytest.raises(ValueError):
+            cache.get(key)[0] = 5
+
+    def test_discard_source(self):
+        cache = QueryCache()
+        cache.put(cache.key("case", 1, [_level("液压")]), np.array([1]))
+        cache.put(cache.key("faults", 1, [_level("液压")]), np.array([2]))
+
+        assert cache.discard_source("case") == 1
+        assert cache.get(cache.key("faults", 1, [_level("液压")])) is not None
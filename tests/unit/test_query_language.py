@@ -0,0 +1,108 @@
+"""布尔查询语言的单元测试。"""
+
+import numpy as np
+import pytest
+
+from app.core.search.query_language import (
+    And,
+    Not,
+    Or,
+    Term,
+    evaluate,
+    parse_query,
+    query_fields,
+)
+
+
+class TestParseQuery:
+    def test_implicit_and_and_precedence(self):
+        node = parse_query("a b OR c")
+
+        assert isinstance(node, Or)
+        assert node.canonical() == '(("a" AND "b") OR "c")'
+
+    def test_not_binds_tighter_than_and(self):
+        node = parse_query("a AND NOT b")
+
+        assert isinstance(node, And)
+        assert isinstance(node.children[1], Not)
+
+    def test_parentheses(self):
+        assert parse_query("(a OR b) c").canonical() == '(("a" OR "b") AND "c")'
+
+    def test_field_phrase_and_prefix(self):
+        node = parse_query('问题描述:"发动机 喘振" ATA:21*')
+
+        first, second = node.children
+        assert (first.field, first.text, first.prefix) == ("问题描述", "发动机 喘振", False)
+        assert (second.field, second.text, second.prefix) == ("ATA", "21", True)
+
+    def test_full_width_punctuation(self):
+        assert parse_query("（机型：ARJ21 OR “发动机 故障”）").canonical() == (
+            parse_query('(机型:ARJ21 OR "发动机 故障")').canonical()
+        )
+
+    def test_terms_are_normalized(self):
+        node = parse_query("ＡＰＵ")
+
+        assert isinstance(node, Term)
+        assert node.text == "apu"
+
+    def test_lowercase_operators_are_terms(self):
+        assert parse_query("a or b").canonical() == '("a" AND "or" AND "b")'
+
+    def test_query_fields(self):
+        assert query_fields(parse_query("机型:ARJ21 OR NOT (a ATA:21*)")) == {"机型", "ATA", None}
+
+    @pytest.mark.parametrize("query", ["", "(a", "a OR", '"a', "AND a", "机型:", "a )"])
+    def test_syntax_errors(self, query):
+        with pytest.raises(ValueError):
+            parse_query(query)
+
+
+class TestEvaluate:
+    # 每个词命中的行号
+    POSTINGS = {"a": [0, 1, 2, 3], "b": [2, 3, 4], "c": [5], "d": []}
+
+    def _match(self, calls=None):
+        def match_term(term, rows):
+            if calls is not None:
+                calls.append(term.text)
+            return np.intersect1d(rows, self.POSTINGS[term.text])
+
+        return match_term
+
+    def _eval(self, query, calls=None, estimate=None):
+        rows = np.arange(8)
+        return evaluate(parse_query(query), rows, self._match(calls), estimate).tolist()
+
+    def test_set_algebra(self):
+        assert self._eval("a b") == [2, 3]
+        assert self._eval("a OR c") == [0, 1, 2, 3, 5]
+        assert self._eval("a NOT b") == [0, 1]
+        assert self._eval("NOT (a OR b)") == [5, 6, 7]
+
+    def test_and_short_circuits_on_empty(self):
+        calls = []
+
+        assert self._eval("d a b", calls) == []
+        assert calls == ["d"]
+
+    def test_and_evaluates_smallest_first(self):
+        calls = []
+        sizes = {"a": 4, "b": 3, "c": 1, "d": 0}
+
+        assert self._eval("a b c", calls, lambda term: sizes[term.text]) == []
+        # c、b 之后结果已为空，a 不再求值
+        assert calls == ["c", "b"]
+
+    def test_or_only_checks_unmatched_rows(self):
+        seen = []
+
+        def match_term(term, rows):
+            seen.append(rows.tolist())
+            return np.intersect1d(rows, self.POSTINGS[term.text])
+
+        evaluate(parse_query("a OR b"), np.arange(6), match_term)
+
+        assert seen == [[0, 1, 2, 3, 4, 5], [4, 5]]
@@ -0,0 +1,121 @@
+"""搜索层级增量细化存储与执行计划的单元测试。"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.core.search.refinement import RefinementStore, run_levels
+
+
+class _Recorder:
+    """记录层级实际计算次数：第 i 层保留行号能被 i + 2 整除的行"""
+
+    def __init__(self):
+        self.calls: list[int] = []
+
+    def base_rows(self):
+        self.calls.append(-1)
+        return np.arange(100)
+
+    def apply_level(self, i, row_ids):
+        self.calls.append(i)
+        return row_ids[row_ids % (i + 2) == 0]
+
+
+def _refine(store, recorder, levels, base=("faults", 1, ()), plan=None):
+    result = store.refine("s1", base, levels, recorder.base_rows, recorder.apply_level, plan)
+    return result.row_ids, result.reused
+
+
+class TestRefinementStore:
+    def test_append_level_only_computes_new_level(self):
+        store, recorder = RefinementStore(), _Recorder()
+        _refine(store, recorder, ["a"])
+        recorder.calls.clear()
+
+        row_ids, reused = _refine(store, recorder, ["a", "b"])
+
+        assert reused == 1
+        assert recorder.calls == [1]
+        assert row_ids.tolist() == [i for i in range(100) if i % 2 == 0 and i % 3 == 0]
+
+    def test_edit_last_level_reuses_previous_levels(self):
+        store, recorder = RefinementStore(), _Recorder()
+        _refine(store, recorder, ["a", "b", "c"])
+        recorder.calls.clear()
+
+        _, reused = _refine(store, recorder, ["a", "b", "x"])
+        assert reused == 2
+        assert recorder.calls == [2]
+
+    def test_remove_last_level_computes_nothing(self):
+        store, recorder = RefinementStore(), _Recorder()
+        _refine(store, recorder, ["a", "b"])
+        recorder.calls.clear()
+
+        row_ids, reused = _refine(store, recorder, ["a"])
+        assert reused == 1
+        assert recorder.calls == []
+        assert row_ids.tolist() == list(range(0, 100, 2))
+
+    def test_different_base_starts_over(self):
+        store, recorder = RefinementStore(), _Recorder()
+        _refine(store, recorder, ["a"])
+        recorder.calls.clear()
+
+        _, reused = _refine(store, recorder, ["a"], base=("faults", 2, ()))
+        assert reused == -1
+        assert recorder.calls == [-1, 0]
+
+    def test_sessions_are_independent(self):
+        store, recorder = RefinementStore(), _Recorder()
+        store.refine("s1", "base", ["a"], recorder.base_rows, recorder.apply_level)
+        result = store.refine("s2", "base", ["a"], recorder.base_rows, recorder.apply_level)
+        assert result.reused == -1
+
+    def test_discard_source(self):
+        store, recorder = RefinementStore(), _Recorder()
+        _refine(store, recorder, ["a"])
+        assert store.discard_source("case") == 0
+        assert store.discard_source("faults") == 1
+        _, reused = _refine(store, recorder, ["a"])
+        assert reused == -1
+
+    def test_reordered_levels_reuse_chain(self):
+        store, recorder = RefinementStore(), _Recorder()
+        _refine(store, recorder, ["a", "b"])
+        recorder.calls.clear()
+
+        # 层级顺序不影响结果，链上的两层都可复用
+        _, reused = _refine(store, recorder, ["b", "a", "c"])
+        assert reused == 2
+        assert recorder.calls == [2]
+
+    def test_plan_orders_remaining_levels(self):
+        store, recorder = RefinementStore(), _Recorder()
+        result = store.refine(
+            "s1",
+            "base",
+            ["a", "b", "c"],
+            recorder.base_rows,
+            recorder.apply_level,
+            plan=lambda remaining: sorted(remaining, reverse=True),
+        )
+        assert recorder.calls == [-1, 2, 1, 0]
+        assert [step["level"] for step in result.steps] == [2, 1, 0]
+        assert result.row_ids.tolist() == list(range(0, 100, 12))
+
+
+class TestRunLevels:
+    def test_stops_when_rows_empty(self):
+        calls = []
+
+        def apply_level(i, row_ids):
+            calls.append(i)
+            return row_ids[:0] if i == 1 else row_ids
+
+        nodes, steps = run_levels(np.arange(10), [1, 0, 2], apply_level)
+
+        assert calls == [1]
+        assert [len(ids) for ids in nodes] == [0, 0, 0]
+        assert [step["skipped"] for step in steps] == [False, True, True]
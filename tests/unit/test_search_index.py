@@ -0,0 +1,285 @@
+"""搜索索引的单元测试。
+
+覆盖：
+- NgramIndex 候选集是精确子串匹配的超集（CJK bigram / 拉丁 trigram）
+- 短关键字无法收敛时返回 None
+- search_column 使用索引与不使用索引的结果完全一致（AND / OR / 反向过滤 / 子集 / 日期列）
+- search_mask 按行位置判断与物化子集数据框的结果一致
+- 估计模式的候选行是精确结果的超集
+- 搜索视图的规范化规则（空值、全角转半角、小写），有无索引时一致
+- 数据框对象变化时索引自动重建、版本号递增
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.api.data_source_routes import _estimate_search, _run_search, search_column, search_mask
+from app.core.search import (
+    NgramIndex,
+    SearchView,
+    get_search_index,
+    invalidate_search_index,
+    normalize_text,
+)
+from app.core.search.index import SearchIndex
+
+_VOCAB = ["发动机", "液压", "泄漏", "APU", "apu", "引气", "故障", "PN-123", "abc", "ab", " ", "-"]
+
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(_VOCAB) for _ in range(rng.randint(0, 6)))
+
+
+def _sample_df(rows: int = 300, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+    return pd.DataFrame(
+        {
+            "问题描述": [_random_text(rng) for _ in range(rows)],
+            "排故措施": [_random_text(rng) if rng.random() > 0.2 else None for _ in range(rows)],
+            "日期": [
+                f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" for _ in range(rows)
+            ],
+            "机型": [rng.choice(["ARJ21", "C919", "无"]) for _ in range(rows)],
+        }
+    )
+
+
+class TestNgramIndex:
+    def test_candidates_superset_of_exact_matches(self):
+        values = ["发动机故障", "液压泄漏", "apu引气故障", "pn-123 更换", ""]
+        index = NgramIndex.build(values)
+
+        for keyword in ["发动机", "故障", "apu", "pn-123", "引气故障"]:
+            candidates = index.candidates(keyword)
+            expected = {i for i, v in enumerate(values) if keyword in v}
+            assert candidates is not None
+            assert expected <= set(candidates.tolist())
+
+    def test_missing_gram_returns_empty(self):
+        index = NgramIndex.build(["发动机故障", "液压泄漏"])
+
+        candidates = index.candidates("起落架")
+
+        assert candidates is not None
+        assert len(candidates) == 0
+
+    def test_short_keyword_cannot_narrow(self):
+        index = NgramIndex.build(["abc", "发动机"])
+
+        # 单个汉字、两个拉丁字符均不含完整 gram
+        assert index.candidates("发") is None
+        assert index.candidates("ab") is None
+
+    def test_gram_does_not_cross_row_boundary(self):
+        index = NgramIndex.build(["ab", "c"])
+
+        candidates = index.candidates("abc")
+
+        assert candidates is not None
+        assert len(candidates) == 0
+
+
+class TestSearchView:
+    def test_normalize_text(self):
+        assert normalize_text("ＡＰＵ故障") == "apu故障"
+        assert normalize_text(None) == ""
+        assert normalize_text(float("nan")) == ""
+        assert normalize_text(21.0) == "21.0"
+
+    def test_view_materializes_text_columns_only(self):
+        df = pd.DataFrame({"问题描述": ["ＰＮ－１２３", None], "数量": [1, 2]})
+
+        view = SearchView(df)
+
+        assert "问题描述" in view
+        assert "数量" not in view
+        assert view.values("问题描述").tolist() == ["pn-123", ""]
+
+
+class TestSearchColumnWithIndex:
+    @pytest.mark.parametrize("logic", ["and", "or"])
+    @pytest.mark.parametrize("negative", [False, True])
+    @pytest.mark.parametrize(
+        "keywords",
+        ["发动机", "APU,故障", "液压，泄漏", "ab", "pn-123", "不存在的词", "发"],
+    )
+    def test_matches_unindexed_search(self, logic, negative, keywords):
+        df = _sample_df()
+        index = SearchIndex("faults", df, 1)
+        columns = ["问题描述", "排故措施"]
+
+        expected = search_column(df, keywords, columns, logic, negative)
+        actual = search_column(df, keywords, columns, logic, negative, index)
+
+        assert actual.index.tolist() == expected.index.tolist()
+
+    @pytest.mark.parametrize("logic", ["and", "or"])
+    def test_subset_frame_matches_unindexed_search(self, logic):
+        df = _sample_df()
+        index = SearchIndex("faults", df, 1)
+        subset = df[df["机型"] == "ARJ21"]
+
+        expected = search_column(subset, "故障,液压", "问题描述", logic)
+        actual = search_column(subset, "故障,液压", "问题描述", logic, search_index=index)
+
+        assert actual.index.tolist() == expected.index.tolist()
+
+    @pytest.mark.parametrize("logic", ["and", "or"])
+    @pytest.mark.parametrize("negative", [False, True])
+    @pytest.mark.parametrize("indexed", [False, True])
+    def test_row_positions_match_subset_frame(self, logic, negative, indexed):
+        df = _sample_df()
+        index = SearchIndex("faults", df, 1) if indexed else None
+        rows = np.flatnonzero((df["机型"] == "C919").to_numpy())
+        columns = ["问题描述", "排故措施", "日期"]
+
+        expected = search_column(df.iloc[rows], "故障,apu", columns, logic, negative)
+        mask = search_mask(df, "故障,apu", columns, logic, negative, index, rows=rows)
+
+        assert df.index[rows[mask]].tolist() == expected.index.tolist()
+
+    @pytest.mark.parametrize("keywords", ["2024-3", "2024-03", "2024-1,2024-12"])
+    def test_date_column_year_month_keyword(self, keywords):
+        df = _sample_df()
+        index = SearchIndex("faults", df, 1)
+
+        expected = search_column(df, keywords, "日期", "or")
+        actual = search_column(df, keywords, "日期", "or", search_index=index)
+
+        assert len(expected) > 0
+        assert actual.index.tolist() == expected.index.tolist()
+
+    @pytest.mark.parametrize("keywords", ["ＡＰＵ", "apu", "ｐｎ－１２３"])
+    def test_full_width_keywords_match_half_width_text(self, keywords):
+        df = pd.DataFrame({"问题描述": ["APU 故障", "ＡＰＵ引气", "PN-123 更换", "液压"]})
+        index = SearchIndex("case", df, 1)
+
+        expected = search_column(df, keywords, "问题描述")
+        actual = search_column(df, keywords, "问题描述", search_index=index)
+
+        assert len(expected) > 0
+        assert actual.index.tolist() == expected.index.tolist()
+
+    def test_unrelated_frame_falls_back_to_scan(self):
+        df = _sample_df()
+        index = SearchIndex("faults", df, 1)
+        other = pd.DataFrame({"问题描述": ["发动机故障"]}, index=[10_000])
+
+        result = search_column(other, "发动机", "问题描述", search_index=index)
+
+        assert result.index.tolist() == [10_000]
+
+
+class TestEstimateSearch:
+    @pytest.mark.parametrize("logic", ["and", "or"])
+    @pytest.mark.parametrize(
+        "keywords", ["发动机", "APU,故障", "液压，泄漏", "ab", "发", "2024-3,故障"]
+    )
+    def test_estimate_is_superset_of_exact(self, logic, keywords):
+        df = _sample_df()
+        index = SearchIndex("faults", df, 1)
+        levels = [
+            {"keywords": keywords, "column_name": ["问题描述", "日期"], "logic": logic},
+            {"keywords": "泄漏", "column_name": ["排故措施"], "negative_filtering": True},
+        ]
+
+        exact, _ = _run_search(df, levels, ["ARJ21"], index)
+        estimate = _estimate_search(df, levels, ["ARJ21"], index)
+
+        assert set(exact.tolist()) <= set(estimate.tolist())
+        assert set(estimate.tolist()) <= set(np.flatnonzero(df["机型"] == "ARJ21").tolist())
+
+    def test_keyword_candidates(self):
+        df = _sample_df()
+        index = SearchIndex("faults", df, 1)
+
+        both = index.keyword_candidates("问题描述", ["发动机", "液压"], True)
+        either = index.keyword_candidates("问题描述", ["发动机", "液压"], False)
+
+        assert set(both.tolist()) <= set(either.tolist())
+        assert index.keyword_candidates("问题描述", ["发", "液压"], False) is None
+        assert index.keyword_candidates("问题描述", ["发", "液压"], True) is not None
+
+
+class TestSearchIndexRegistry:
+    def test_rebuilds_when_frame_changes(self):
+        df = _sample_df(rows=20)
+        first = get_search_index("test_registry", df)
+
+        assert get_search_index("test_registry", df) is first
+
+        replaced = _sample_df(rows=20, seed=8)
+        second = get_search_index("test_registry", replaced)
+
+        assert second is not first
+        assert second.version == first.version + 1
+        invalidate_search_index("test_registry")
+
+    def test_build_does_not_block_other_sources(self):
+        cached = _sample_df(rows=20)
+        first = get_search_index("test_registry_a", cached)
+        started, release = threading.Event(), threading.Event()
+        original_init = SearchIndex.__init__
+
+        def slow_init(self, source, df, version, *args, **kwargs):
+            started.set()
+            release.wait(5)
+            original_init(self, source, df, version, *args, **kwargs)
+
+        lookups = []
+        with patch.object(SearchIndex, "__init__", slow_init):
+            builder = threading.Thread(
+                target=get_search_index, args=("test_registry_b", _sample_df(rows=20))
+            )
+            builder.start()
+            assert started.wait(5)
+            # 另一个数据源的构建进行中，已构建索引的查找不被阻塞
+            lookup = threading.Thread(
+                target=lambda: lookups.append(get_search_index("test_registry_a", cached))
+            )
+            lookup.start()
+            lookup.join(2)
+            blocked = lookup.is_alive()
+            release.set()
+            builder.join(5)
+            lookup.join(5)
+
+        assert not blocked
+        assert lookups == [first]
+        invalidate_search_index("test_registry_a")
+        invalidate_search_index("test_registry_b")
+
+    def test_concurrent_requests_build_once(self):
+        df = _sample_df(rows=20)
+        original_init = SearchIndex.__init__
+        builds = []
+
+        def counting_init(self, *args, **kwargs):
+            builds.append(args[0])
+            original_init(self, *args, **kwargs)
+
+        with (
+            patch.object(SearchIndex, "__init__", counting_init),
+            ThreadPoolExecutor(max_workers=4) as executor,
+        ):
+            indexes = list(executor.map(lambda _: get_search_index("test_registry", df), range(4)))
+
+        assert builds == ["test_registry"]
+        assert all(index is indexes[0] for index in indexes)
+        invalidate_search_index("test_registry")
+
+    def test_positions_of_subset(self):
+        df = _sample_df(rows=20)
+        index = SearchIndex("faults", df, 1)
+
+        positions = index.positions_of(df.iloc[[3, 5, 7]])
+
+        assert np.array_equal(positions, [3, 5, 7])
@@ -6,13 +6,26 @@
 - 所有日期列无效的记录排到最后
 - 临时排序列不泄漏到结果
 - 非配置数据源 / 缺列时不改变顺序
+
+覆盖预计算的默认排序排列（SortPermutation / _default_sorted_rows）：
+- 与 _apply_default_sort 的顺序一致
+- 日期相同的行保持原始行序
+- 小结果集按名次排序、大结果集保序过滤，两种方式结果一致
+- 前 k 个结果的部分选择与完整排序取前 k 个一致
 """
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
-from app.api.data_source_routes import SORT_DATE_PRIORITY, _apply_default_sort
+from app.api.data_source_routes import (
+    SORT_DATE_PRIORITY,
+    _apply_default_sort,
+    _default_sorted_rows,
+)
+from app.core.search.index import SearchIndex
+from app.core.search.sort_order import SortPermutation
 
 
 def _sample_case_df() -> pd.DataFrame:
@@ -94,3 +107,59 @@ class TestApplyDefaultSort:
 class TestSortDatePriorityConfig:
     def test_case_priority_is_application_time_then_fault_date(self):
         assert SORT_DATE_PRIORITY["case"] == ["申请时间", "故障发生日期"]
+
+
+class TestPrecomputedSortPermutation:
+    def test_matches_apply_default_sort(self):
+        df = _sample_case_df()
+        index = SearchIndex("case", df, 1)
+
+        row_ids = _default_sorted_rows(df, "case", np.arange(len(df)), index)
+
+        expected = _apply_default_sort(df, "case")["标题"].tolist()
+        assert df["标题"].iloc[row_ids].tolist() == expected
+
+    def test_subset_keeps_default_order(self):
+        df = _sample_case_df()
+        index = SearchIndex("case", df, 1)
+
+        row_ids = _default_sorted_rows(df, "case", np.array([1, 3, 4]), index)
+
+        assert df["标题"].iloc[row_ids].tolist() == ["E", "B", "D"]
+
+    def test_permutation_cached_per_index(self):
+        index = SearchIndex("case", _sample_case_df(), 1)
+        priority = SORT_DATE_PRIORITY["case"]
+
+        assert index.sort_order(priority) is index.sort_order(priority)
+        assert index.sort_order(["不存在的列"]) is None
+
+    def test_ties_keep_row_order(self):
+        dates = np.array(["2024-01-01", "NaT", "2024-01-01", "2024-02-01"], dtype="datetime64[ns]")
+        permutation = SortPermutation([dates])
+
+        assert permutation.order.tolist() == [3, 0, 2, 1]
+
+    def test_small_and_large_results_agree(self):
+        rng = np.random.default_rng(0)
+        days = rng.integers(0, 30, size=1000).astype("timedelta64[D]")
+        dates = np.datetime64("2024-01-01", "ns") + days
+        dates[rng.random(1000) < 0.1] = np.datetime64("NaT")
+        permutation = SortPermutation([dates])
+
+        for size in (5, 900):
+            row_ids = np.sort(rng.choice(1000, size=size, replace=False))
+            expected = row_ids[np.argsort(permutation.rank[row_ids])]
+            assert permutation.sort(row_ids).tolist() == expected.tolist()
+
+    def test_top_matches_full_sort(self):
+        rng = np.random.default_rng(1)
+        dates = np.datetime64("2024-01-01", "ns") + rng.integers(0, 5, size=200).astype(
+            "timedelta64[D]"
+        )
+        dates[rng.random(200) < 0.2] = np.datetime64("NaT")
+        permutation = SortPermutation([dates])
+        row_ids = np.sort(rng.choice(200, size=120, replace=False))
+
+        for k in (1, 7, 120, 500):
+            assert permutation.top(row_ids, k).tolist() == permutation.sort(row_ids)[:k].tolist()
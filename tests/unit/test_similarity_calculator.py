@@ -247,6 +247,23 @@ class TestTextSimilarityCalculator:
         similarity = float(result[0]["相似度"].rstrip("%"))
         # 相似度应该相对较低（但不一定是0，因为可能有共同字符）
 
+    def test_limit_returns_top_results_in_full_order(self):
+        """测试 limit 只返回完整排序的前 limit 条（相似度相同按时间升序、再按原始顺序）"""
+        data = [
+            {"标题": "液压", "日期": "2024-01-01"},
+            {"标题": "发动机", "日期": "2024-03-01"},
+            {"标题": "发动机", "日期": ""},
+            {"标题": "发动机", "日期": "2024-02-01"},
+            {"标题": "发动机 发动机 故障", "日期": "2024-05-01"},
+        ]
+
+        full = TextSimilarityCalculator.calculate_similarity("发动机", data, ["标题"])
+        top = TextSimilarityCalculator.calculate_similarity("发动机", data, ["标题"], limit=3)
+
+        assert top == full[:3]
+        tied = [row["日期"] for row in full if row["标题"] == "发动机"]
+        assert tied == ["2024-02-01", "2024-03-01", None]
+
     # ==================== 内部字段测试 ====================
 
     def test_internal_fields_removed(self, sample_similarity_data):
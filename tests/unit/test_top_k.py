@@ -0,0 +1,49 @@
+"""Top-K 部分选择的单元测试。"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.search.result_store import ResultSet
+from app.utils.top_k import top_k
+
+
+class TestTopK:
+    @pytest.mark.parametrize("k", [1, 3, 10, 50, 100, 150])
+    def test_matches_stable_full_sort(self, k):
+        rng = np.random.default_rng(k)
+        primary = rng.integers(0, 5, size=100).astype(float)
+        secondary = rng.integers(0, 3, size=100)
+
+        expected = np.lexsort([secondary, primary])[:k]
+
+        assert top_k([primary, secondary], k).tolist() == expected.tolist()
+
+    def test_ties_keep_index_order(self):
+        keys = np.array([2, 1, 1, 0, 1])
+
+        assert top_k(keys, 3).tolist() == [3, 1, 2]
+
+    def test_none_sorts_all_and_non_positive_is_empty(self):
+        keys = np.array([3.0, -1.0, 2.0])
+
+        assert top_k(keys).tolist() == [1, 2, 0]
+        assert top_k(keys, 0).tolist() == []
+        assert top_k(np.array([]), 5).tolist() == []
+
+
+class TestResultSetPartialPage:
+    @pytest.mark.parametrize("ascending", [True, False])
+    def test_first_pages_match_full_sort(self, ascending):
+        rng = np.random.default_rng(0)
+        values = pd.Series(rng.choice(["A", "B", "C", None], size=200), dtype=object)
+        df = pd.DataFrame({"件号": values})
+        row_ids = rng.permutation(200)[:150]
+
+        partial = ResultSet("r", "case", 1, row_ids)
+        pages = [partial.page(df, page, 10, "件号", ascending) for page in (1, 2, 3)]
+
+        full = ResultSet("f", "case", 1, row_ids).ordered(df, "件号", ascending)
+        assert np.concatenate(pages).tolist() == full[:30].tolist()
+        # 部分选择不缓存排序结果
+        assert not partial._sorted